@@ -0,0 +1,105 @@
+"""
+Benchmark betikleri için ortak zamanlama ve raporlama yardımcıları.
+"""
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from logger import logger
+
+# Benchmark sırasında her çağrıdaki INFO logları ölçümü bozmasın
+logger.setLevel(logging.WARNING)
+
+
+def measure(fn, repeat=5, warmup=1):
+    """
+    fn'i warmup kez ısıtıp repeat kez çalıştırır; süreleri saniye cinsinden özetler.
+    """
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return {
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "mean_s": statistics.fmean(timings),
+        "repeat": repeat,
+    }
+
+
+def peak_memory(fn):
+    """
+    fn'in bir çalışması sırasında tracemalloc ile görülen en yüksek ek bellek (bayt).
+    Süre ölçümünü bozmamak için measure'dan ayrı çalıştırılır.
+    """
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn()
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+
+def environment():
+    """
+    Sonuçların karşılaştırılabilmesi için çalışma ortamı bilgisi.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def compare(rows, baseline_path, tolerance=0.2, min_delta_s=0.001):
+    """
+    median_s'i baseline'daki aynı adlı ölçümden tolerance oranından (ve en az
+    min_delta_s saniyeden) fazla artan satırları döndürür: [(case, eski_s, yeni_s)].
+    Mutlak eşik, milisaniye altı ölçümlerdeki gürültünün gerileme sayılmasını önler.
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {row["case"]: row for row in json.load(f)["results"]}
+    regressions = []
+    for row in rows:
+        old = baseline.get(row["case"])
+        if old and row["median_s"] > old["median_s"] * (1 + tolerance) and row["median_s"] - old["median_s"] >= min_delta_s:
+            regressions.append((row["case"], old["median_s"], row["median_s"]))
+    return regressions
+
+
+def report(name, rows, output=None):
+    """
+    Sonuçları tablo olarak yazdırır; output verilirse ortam bilgisiyle birlikte JSON olarak da kaydeder.
+    """
+    print(f"\n== {name} ==")
+    for row in rows:
+        label = row["case"]
+        peak = f"   peak {row['peak_kib']:10.1f} KiB" if "peak_kib" in row else ""
+        print(f"{label:<48} median {row['median_s'] * 1000:10.2f} ms   min {row['min_s'] * 1000:10.2f} ms{peak}")
+
+    if output:
+        if os.path.dirname(output):
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump({"benchmark": name, "environment": environment(), "results": rows}, f, ensure_ascii=False, indent=2)
+        print(f"Sonuçlar kaydedildi: {output}")
@@ -0,0 +1,136 @@
+"""
+Konu analizlerinin eski sözlük döngüsü ile logic.columnar_analytics kolon
+yolunu 1k / 10k / 100k cevaplanmış soru üzerinde karşılaştırır. Her boyutta
+çıktıların birebir aynı olduğu doğrulanır.
+
+Ölçülen yollar:
+- test JSON'larından (analyze_topics_with_weights / analyze_test_performance)
+- user_topic_stats'tan tek sorguyla yüklenen kolonlardan (JSON çözülmeden)
+- kohort: kullanıcı başına analiz (eski döngü kullanıcı başına bir kez çalışır)
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.bench_analytics --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import random
+import tempfile
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from benchmarks._harness import measure, report
+from data.db_manager import DBManager
+from logic.columnar_analytics import analyze_columns, analyze_columns_by_user, recommend_columns
+from logic.performance_analyzer import analyze_test_performance, build_recommendations
+from logic.topic_analyzer import analyze_topic_stats, analyze_topics_with_weights
+from utils import json_codec
+
+# Aynı başarı oranına yuvarlanan konular ve eşik değerleri de denensin diye çok sayıda konu
+TOPICS = [f"Konu {i:02d}" for i in range(40)]
+QUESTIONS_PER_TEST = 20
+
+
+def build_records(answers, users=1, seed=42):
+    """
+    users kullanıcıya dağılmış, toplam answers soruluk (user, test_json, timestamp) kayıtları.
+    """
+    rng = random.Random(seed)
+    skill = {topic: rng.random() for topic in TOPICS}
+    start = datetime(2025, 1, 1)
+    records = []
+    for i in range(max(1, answers // QUESTIONS_PER_TEST)):
+        questions = []
+        for _ in range(QUESTIONS_PER_TEST):
+            topic = rng.choice(TOPICS)
+            correct_answer = rng.choice("ABCD")
+            questions.append({
+                "question": "Örnek soru",
+                "options": ["A) a", "B) b", "C) c", "D) d"],
+                "correct_answer": correct_answer,
+                "explanation": "",
+                "topic": topic,
+                "difficulty": rng.choice(["easy", "medium", "hard"]),
+                "user_answer": correct_answer if rng.random() < skill[topic] else rng.choice("ABCD"),
+            })
+        user = f"ogrenci{i % users}"
+        records.append((user, json_codec.dumps(questions), (start + timedelta(minutes=i)).isoformat()))
+    return records
+
+
+def legacy_topic_stats(test_jsons):
+    topic_stats = defaultdict(lambda: {"correct": 0, "wrong": 0})
+    for test_json in test_jsons:
+        for q in json_codec.loads(test_json):
+            topic = q.get("topic", "GENEL")
+            if q["user_answer"] == q["correct_answer"]:
+                topic_stats[topic]["correct"] += 1
+            else:
+                topic_stats[topic]["wrong"] += 1
+    return topic_stats
+
+
+def build_database(path, records):
+    db = DBManager(path)
+    for user, test_json, _ in records:
+        correct = sum(q["user_answer"] == q["correct_answer"] for q in json_codec.loads(test_json))
+        db.save_test_result(user, test_json, correct, QUESTIONS_PER_TEST - correct)
+    return db
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--users", type=int, default=50, help="Kohort ölçümündeki kullanıcı sayısı")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="JSON sonuç dosyası")
+    args = parser.parse_args(argv)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            records = build_records(size, users=args.users)
+            test_jsons = [test_json for _, test_json, _ in records]
+            weight_records = [(0, user, test_json, 0, 0, ts) for user, test_json, ts in records]
+            perf_records = [(0, test_json, 0, 0, ts) for _, test_json, ts in records]
+            label = f"{size:,} cevap"
+
+            # Kolon yolu eski döngüyle birebir aynı sonucu vermeli
+            assert analyze_topics_with_weights(weight_records) == analyze_topic_stats(legacy_topic_stats(test_jsons))
+            assert analyze_test_performance(perf_records) == build_recommendations(legacy_topic_stats(test_jsons))
+
+            for name, fn in (
+                ("eski döngü, ağırlıklar", lambda: analyze_topic_stats(legacy_topic_stats(test_jsons))),
+                ("kolon, ağırlıklar", lambda: analyze_topics_with_weights(weight_records)),
+                ("eski döngü, öneriler", lambda: build_recommendations(legacy_topic_stats(test_jsons))),
+                ("kolon, öneriler", lambda: analyze_test_performance(perf_records)),
+            ):
+                rows.append({"case": f"{name}, {label}", "answers": size, **measure(fn, repeat=args.repeat)})
+
+            db = build_database(os.path.join(tmp, f"analytics_{size}.db"), records)
+            by_user = defaultdict(list)
+            for user, test_json, _ in records:
+                by_user[user].append(test_json)
+
+            def legacy_cohort():
+                return {user: analyze_topic_stats(legacy_topic_stats(jsons)) for user, jsons in by_user.items()}
+
+            def columnar_cohort():
+                return analyze_columns_by_user(db.get_answer_columns(list(by_user)))
+
+            assert columnar_cohort() == legacy_cohort()
+            first_user = next(iter(by_user))
+            assert analyze_columns(db.get_answer_columns([first_user])) == analyze_topic_stats(legacy_topic_stats(by_user[first_user]))
+            assert recommend_columns(db.get_answer_columns([first_user])) == build_recommendations(legacy_topic_stats(by_user[first_user]))
+
+            for name, fn in (
+                ("user_topic_stats -> kolonlar", lambda: db.get_answer_columns(list(by_user))),
+                (f"eski döngü, kohort ({len(by_user)} kullanıcı)", legacy_cohort),
+                (f"kolon, kohort ({len(by_user)} kullanıcı)", columnar_cohort),
+            ):
+                rows.append({"case": f"{name}, {label}", "answers": size, **measure(fn, repeat=args.repeat)})
+
+    report("analytics", rows, args.output)
+
+
+if __name__ == "__main__":
+    main()
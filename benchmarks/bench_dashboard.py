@@ -0,0 +1,122 @@
+"""
+Dashboard verisinin eski (üç ayrı tarama + üç kez JSON çözme) yolu ile
+DBManager.get_dashboard_summary tek geçiş yolunu karşılaştırır.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.bench_dashboard --results 10000
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+
+from benchmarks._harness import measure, report
+from data.codec import decode_blob
+from data.db_manager import DBManager
+
+TOPICS = ["Simple Past Tense", "Present Perfect", "Fonksiyonlar", "Türev", "Fotosentez", "Newton Yasaları"]
+
+
+def build_database(path, user, results, seed=42):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    rows = []
+    for i in range(results):
+        questions = []
+        for _ in range(rng.randint(5, 20)):
+            correct_answer = rng.choice("ABCD")
+            questions.append({
+                "question": "Örnek soru metni " + "x" * rng.randint(20, 80),
+                "options": ["A) a", "B) b", "C) c", "D) d"],
+                "correct_answer": correct_answer,
+                "explanation": "Kısa açıklama " + "y" * rng.randint(20, 80),
+                "topic": rng.choice(TOPICS),
+                "difficulty": rng.choice(["easy", "medium", "hard"]),
+                "user_answer": correct_answer if rng.random() < 0.6 else rng.choice("ABCD"),
+            })
+        correct = sum(q["user_answer"] == q["correct_answer"] for q in questions)
+        timestamp = (start + timedelta(hours=i)).isoformat()
+        rows.append((user, json.dumps(questions), correct, len(questions) - correct, timestamp))
+
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE test_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user TEXT, test_json TEXT, correct INTEGER, wrong INTEGER, timestamp TEXT
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO test_results (user, test_json, correct, wrong, timestamp) VALUES (?, ?, ?, ?, ?)", rows
+    )
+    conn.commit()
+    conn.close()
+    # İlk açılışta answers ve user_topic_stats tabloları geçmişten doldurulur
+    return DBManager(path)
+
+
+def legacy_dashboard(db, user):
+    """
+    Dashboard'un önceki hâli: get_all_test_results + iki ayrı blob taraması.
+    """
+    def scan():
+        return db.conn.execute("SELECT id, user, test_json, correct, wrong, timestamp FROM test_results WHERE user = ?", (user,)).fetchall()
+
+    records = scan()
+    dates = [rec[5][:10] for rec in records]
+    corrects = [rec[3] for rec in records]
+    wrongs = [rec[4] for rec in records]
+    actual_minutes = [min(60, 15 * (c + w)) for c, w in zip(corrects, wrongs)]
+
+    difficulty_counts = {d: {"doğru": 0, "yanlış": 0} for d in ("easy", "medium", "hard")}
+    for _, _, test_json, _, _, _ in scan():
+        for q in json.loads(decode_blob(test_json)):
+            difficulty = q.get("difficulty", "medium")
+            if difficulty not in difficulty_counts:
+                continue
+            if q.get("user_answer") is None or q.get("correct_answer") is None:
+                continue
+            difficulty_counts[difficulty]["doğru" if q["user_answer"] == q["correct_answer"] else "yanlış"] += 1
+
+    topic_minutes = {}
+    for _, _, test_json, _, _, _ in scan():
+        for q in json.loads(decode_blob(test_json)):
+            topic = q.get("topic", "Bilinmeyen")
+            topic_minutes[topic] = topic_minutes.get(topic, 0) + 2
+
+    return dates, actual_minutes, difficulty_counts, topic_minutes, sum(corrects), sum(wrongs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--results", type=int, default=10000, help="Kullanıcının test sonucu sayısı")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="JSON sonuç dosyası")
+    args = parser.parse_args(argv)
+
+    user = "bench_user"
+    with tempfile.TemporaryDirectory() as tmp:
+        db = build_database(os.path.join(tmp, "bench.db"), user, args.results)
+
+        legacy = legacy_dashboard(db, user)
+        summary = db.get_dashboard_summary(user)
+        assert legacy == (
+            summary["dates"], summary["actual_minutes"], summary["difficulty_stats"],
+            summary["topic_data"], summary["correct"], summary["wrong"]
+        ), "Tek geçiş sonucu eski yol ile aynı değil"
+
+        rows = [
+            {"case": f"eski yol (3 tarama + JSON), {args.results} sonuç",
+             **measure(lambda: legacy_dashboard(db, user), repeat=args.repeat)},
+            {"case": f"get_dashboard_summary, {args.results} sonuç",
+             **measure(lambda: db.get_dashboard_summary(user), repeat=args.repeat)},
+        ]
+        rows[1]["speedup"] = rows[0]["median_s"] / rows[1]["median_s"]
+        report("dashboard", rows, args.output)
+        print(f"Hızlanma: {rows[1]['speedup']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
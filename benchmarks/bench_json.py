@@ -0,0 +1,85 @@
+"""
+Kurulu JSON arka uçlarını (orjson / msgspec / stdlib) gerçekçi yüklerle karşılaştırır:
+40 soruluk cevaplanmış test ve 30 günlük çalışma planı.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.bench_json --repeat 20 --inner 100
+"""
+import argparse
+import random
+
+from benchmarks._harness import measure, report
+from utils import json_codec
+
+TOPICS = ["Simple Past Tense", "Present Perfect", "Fonksiyonlar", "Türev", "Fotosentez", "Newton Yasaları"]
+
+
+def build_test_payload(questions=40, seed=42):
+    rng = random.Random(seed)
+    payload = []
+    for i in range(questions):
+        correct_answer = rng.choice("ABCD")
+        payload.append({
+            "question": f"{i + 1}. Aşağıdaki cümlelerden hangisi dil bilgisi açısından doğrudur? "
+                        + "Öğrencinin çözmesi gereken örnek soru gövdesi. " * rng.randint(1, 3),
+            "options": [f"{letter}) Şık metni {letter} – çğıöşü " + "z" * rng.randint(10, 40) for letter in "ABCD"],
+            "correct_answer": correct_answer,
+            "explanation": "Doğru cevabın gerekçesi ve diğer şıkların neden yanlış olduğu. " * rng.randint(1, 4),
+            "topic": rng.choice(TOPICS),
+            "difficulty": rng.choice(["easy", "medium", "hard"]),
+            "user_answer": correct_answer if rng.random() < 0.6 else rng.choice("ABCD"),
+        })
+    return payload
+
+
+def build_plan_payload(days=30, seed=42):
+    rng = random.Random(seed)
+    return {
+        "tum_konular": [{"konu": topic, "alt_konular": [f"{topic} alt konu {j}" for j in range(4)]} for topic in TOPICS],
+        "baglantilar": [{"from": a, "to": b} for a, b in zip(TOPICS, TOPICS[1:])],
+        "calisma_plani": [
+            {
+                "gun": day + 1,
+                "tarih": f"2025-01-{day % 28 + 1:02d}",
+                "konu": rng.choice(TOPICS),
+                "alt_konu": "Alt konu başlığı",
+                "etkinlik": rng.choice(["video", "okuma", "quiz", "tekrar", "soru çözümü"]),
+                "gorev": "Konu anlatımını oku, örnekleri çöz ve özet çıkar. " * 2,
+                "tekrar": rng.random() < 0.3,
+                "soru_coz": rng.random() < 0.5,
+            }
+            for day in range(days)
+        ],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--inner", type=int, default=100, help="Her ölçümde art arda yapılan çağrı sayısı")
+    parser.add_argument("--output", help="JSON sonuç dosyası")
+    args = parser.parse_args(argv)
+
+    payloads = {"test (40 soru)": build_test_payload(), "plan (30 gün)": build_plan_payload()}
+    backends = json_codec.available_backends()
+    print(f"Arka uçlar: {', '.join(backends)} (varsayılan: {json_codec.BACKEND.name})")
+
+    rows = []
+    for payload_name, payload in payloads.items():
+        reference = json_codec.available_backends()["stdlib"].dumps(payload)
+        print(f"{payload_name}: {len(reference.encode('utf-8')):,} bayt")
+        for name, backend in backends.items():
+            text = backend.dumps(payload)
+            # Tüm arka uçlar aynı veriyi üretmeli ve birbirlerinin çıktısını okuyabilmeli
+            assert backend.loads(text) == payload and backend.loads(reference) == payload
+
+            timing = measure(lambda: [backend.loads(text) for _ in range(args.inner)], repeat=args.repeat)
+            rows.append({"case": f"{name} loads x{args.inner}, {payload_name}", "backend": name, "op": "loads", **timing})
+            timing = measure(lambda: [backend.dumps(payload) for _ in range(args.inner)], repeat=args.repeat)
+            rows.append({"case": f"{name} dumps x{args.inner}, {payload_name}", "backend": name, "op": "dumps", **timing})
+
+    report("json", rows, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Sözlük tabanlı sorular/plan günleri ile logic.models tiplerini karşılaştırır:
+bellek (tracemalloc), copy.deepcopy süresi ve JSON'dan doğrulayarak çözme maliyeti.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.bench_models --questions 40 --days 365
+"""
+import argparse
+import copy
+import tracemalloc
+
+from benchmarks._harness import measure, report
+from benchmarks.bench_json import build_plan_payload, build_test_payload
+from logic.models import AnsweredQuestion, PlanDay
+from utils import json_codec
+
+
+def allocated_bytes(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return after - before
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=40)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="JSON sonuç dosyası")
+    args = parser.parse_args(argv)
+
+    test_text = json_codec.dumps(build_test_payload(args.questions))
+    plan_text = json_codec.dumps(build_plan_payload(args.days)["calisma_plani"])
+    cases = {
+        f"test ({args.questions} soru)": (test_text, list[AnsweredQuestion]),
+        f"plan ({args.days} gün)": (plan_text, list[PlanDay]),
+    }
+
+    rows = []
+    for name, (text, model_type) in cases.items():
+        dicts = json_codec.loads(text)
+        models = json_codec.loads(text, type=model_type)
+        # Modele çevirip geri yazmak veriyi değiştirmemeli
+        assert json_codec.loads(json_codec.dumps(models)) == dicts
+
+        dict_bytes = allocated_bytes(lambda: json_codec.loads(text))
+        model_bytes = allocated_bytes(lambda: json_codec.loads(text, type=model_type))
+        print(f"{name}: bellek dict {dict_bytes:,} bayt, model {model_bytes:,} bayt ({model_bytes / dict_bytes:.2f}x)")
+
+        for label, fn, extra in (
+            ("dict deepcopy", lambda: copy.deepcopy(dicts), {}),
+            ("model deepcopy", lambda: copy.deepcopy(models), {}),
+            ("dict loads", lambda: json_codec.loads(text), {"bytes": dict_bytes}),
+            ("model loads + doğrulama", lambda: json_codec.loads(text, type=model_type), {"bytes": model_bytes}),
+            ("model dumps", lambda: json_codec.dumps(models), {}),
+        ):
+            rows.append({"case": f"{label}, {name}", **measure(fn, repeat=args.repeat), **extra})
+
+    report("models", rows, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Planlayıcı ve soru üretici akışlarını sahte Gemini arka ucuyla uçtan uca ölçer
+(ağ ve API anahtarı gerekmez). Arka uç gecikmesi, parça boyutu ve hata oranı
+verilebildiğinden uygulama tarafı ek yükü, ilk soru/gün gecikmesi, istek sayısı
+ve zamanlayıcının yeniden denemeleri gerçek servis olmadan görülebilir.
+
+--replay ile logic.gemini_backends.RecordingBackend'in kaydettiği gerçek yanıtlar
+geri oynatılır (kaydı olmayan istekler şemadan üretilir).
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.bench_pipeline --latency 0.5 --chunk-delay 0.02
+    python -m benchmarks.bench_pipeline --error-rate 0.1 --output reports/bench_pipeline.json
+    python -m benchmarks.bench_pipeline --replay data/gemini_recordings.jsonl
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks._harness import measure, report
+from data.db_manager import DBManager
+from logic import gemini_api, question_generator
+from logic.gemini_backends import FakeBackend, ReplayBackend
+from logic.planner import generate_learning_path_json, iter_study_plan_days
+
+ANALYSIS = [
+    {"topic": f"Konu {i}", "success_rate": 30 + i * 5, "difficulty": "medium", "weight": round((10 - i) / 45, 3)}
+    for i in range(10)
+]
+
+
+def time_to_first(iterator):
+    """
+    (ilk öğe süresi, toplam süre, öğe sayısı) döndürür.
+    """
+    start = time.perf_counter()
+    first = None
+    count = 0
+    for _ in iterator:
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+    return first, time.perf_counter() - start, count
+
+
+def _case(name, fn, backend, repeat):
+    calls_before = backend.calls
+    result = measure(fn, repeat=repeat, warmup=0)
+    result["case"] = name
+    result["backend_calls_per_run"] = (backend.calls - calls_before) / repeat
+    return result
+
+
+def _streaming_case(name, make_iterator, backend, repeat):
+    calls_before = backend.calls
+    firsts, totals, counts = [], [], []
+    for _ in range(repeat):
+        first, total, count = time_to_first(make_iterator())
+        firsts.append(first or total)
+        totals.append(total)
+        counts.append(count)
+    return {
+        "case": name,
+        "min_s": min(totals),
+        "median_s": sorted(totals)[len(totals) // 2],
+        "first_item_median_s": sorted(firsts)[len(firsts) // 2],
+        "items": min(counts),
+        "repeat": repeat,
+        "backend_calls_per_run": (backend.calls - calls_before) / repeat,
+    }
+
+
+def run(backend, repeat, questions, plan_days):
+    rows = []
+
+    rows.append(_streaming_case(
+        f"iter_questions_for_topic ({questions} soru)",
+        lambda: question_generator.iter_questions_for_topic("Konu 0", "medium", questions),
+        backend, repeat,
+    ))
+    for strategy in question_generator.QUESTION_STRATEGIES:
+        rows.append(_case(
+            f"generate_questions_from_analysis ({strategy}, {questions})",
+            lambda strategy=strategy: question_generator.generate_questions_from_analysis(
+                ANALYSIS, questions, strategy=strategy
+            ),
+            backend, repeat,
+        ))
+
+    rows.append(_case(
+        "generate_learning_path_json",
+        lambda: generate_learning_path_json("Fizik", "orta"),
+        backend, repeat,
+    ))
+    backend.array_length = plan_days
+    rows.append(_streaming_case(
+        f"iter_study_plan_days ({plan_days} gün)",
+        lambda: iter_study_plan_days(["Fizik"], [], 60, "2025-01-01", plan_days),
+        backend, repeat,
+    ))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Planlayıcı ve soru üretici uçtan uca ölçümü (sahte Gemini)")
+    parser.add_argument("--latency", type=float, default=0.2, help="İlk parçaya kadar geçen süre (sn)")
+    parser.add_argument("--chunk-delay", type=float, default=0.01, help="Parçalar arası süre (sn)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="Parça başına karakter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429/503 döndüren istek oranı")
+    parser.add_argument("--replay", help="Geri oynatılacak JSONL kayıt dosyası")
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--plan-days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args(argv)
+
+    settings = dict(
+        first_chunk_latency=args.latency, chunk_delay=args.chunk_delay, chunk_size=args.chunk_size,
+        error_rate=args.error_rate, seed=args.seed,
+    )
+    backend = ReplayBackend(args.replay, **settings) if args.replay else FakeBackend(**settings)
+    previous = gemini_api.set_backend(backend)
+    gemini_api.disable_response_cache()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Üretilen sorular gerçek soru bankasına değil geçici veritabanına yazılır
+        question_generator._bank_db = DBManager(os.path.join(tmp, "bench.db"))
+        try:
+            rows = run(backend, args.repeat, args.questions, args.plan_days)
+        finally:
+            gemini_api.set_backend(previous)
+            question_generator._bank_db = None
+
+    report(f"pipeline (gecikme {args.latency} sn, hata %{args.error_rate * 100:.0f})", rows, args.output)
+    for row in rows:
+        first = f"   ilk öğe {row['first_item_median_s'] * 1000:8.1f} ms" if "first_item_median_s" in row else ""
+        print(f"{row['case']:<48} {row['backend_calls_per_run']:5.1f} istek/çalışma{first}")
+    print(f"Arka uç: {backend.stats()}")
+    print(f"Zamanlayıcı: {gemini_api.scheduler.stats()}")
+
+
+if __name__ == "__main__":
+    main()
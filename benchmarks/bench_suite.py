@@ -0,0 +1,137 @@
+"""
+Analiz, depolama, PDF ve grafik yollarının mikro benchmark takımı.
+
+Her veri boyutu (N kullanıcı × M test, testte 5–40 soru, K konu) için
+benchmarks.synthetic ile geçici bir veritabanı doldurulur ve şunlar ölçülür:
+- analyze_topics_with_weights, analyze_test_performance (bir kullanıcının M testi)
+- DBManager.get_difficulty_breakdown, get_topic_minutes_estimate
+- save_test_result, save_test, save_plan (dolu veritabanına ek yazma)
+- chart_utils grafik kurucuları (Streamlit'in yaptığı gibi to_json dahil)
+Boyuttan bağımsız olarak PDFExporter.export_plan_to_pdf 14 ve 365 günlük planla ölçülür.
+
+Her satırda süreler ve tracemalloc tepe belleği (peak_kib) bulunur. --output ile
+ortam bilgisi (commit, Python, platform) içeren JSON yazılır; --baseline ile önceki
+bir JSON'a göre median_s'i --tolerance'tan fazla artan ölçümler raporlanır ve
+betik 1 ile çıkar.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.bench_suite --sizes 10x10 50x20 100x50 --output reports/bench_suite.json
+    python -m benchmarks.bench_suite --baseline reports/bench_suite.json --tolerance 0.25
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+from benchmarks._harness import compare, measure, peak_memory, report
+from benchmarks.synthetic import build_plan, generate_cohort, populate
+from data.db_manager import DBManager
+from logic.performance_analyzer import analyze_test_performance
+from logic.topic_analyzer import analyze_topics_with_weights
+from utils import chart_utils, json_codec
+from utils.pdf_exporter import PDFExporter
+
+WRITE_BATCH = 20
+
+
+def parse_size(text):
+    users, tests = text.lower().split("x")
+    return int(users), int(tests)
+
+
+def _row(name, fn, repeat, **fields):
+    row = {"case": name, **fields, **measure(fn, repeat=repeat)}
+    row["peak_kib"] = round(peak_memory(fn) / 1024, 1)
+    return row
+
+
+def _chart_cases(db, user, tests):
+    breakdown = db.get_difficulty_breakdown(user)
+    topic_minutes = db.get_topic_minutes_estimate(user)
+    dates = [f"2025-01-{day % 28 + 1:02d}" for day in range(tests)]
+    target = [60] * tests
+    actual = [(day * 37) % 90 for day in range(tests)]
+    correct = sum(counts["doğru"] or 0 for counts in breakdown.values())
+    wrong = sum(counts["yanlış"] or 0 for counts in breakdown.values())
+    return (
+        ("plot_daily_progress", lambda: chart_utils.plot_daily_progress(dates, target, actual).to_json()),
+        ("plot_topic_distribution", lambda: chart_utils.plot_topic_distribution(topic_minutes).to_json()),
+        ("plot_answer_stats", lambda: chart_utils.plot_answer_stats(correct, wrong).to_json()),
+        ("plot_difficulty_success", lambda: chart_utils.plot_difficulty_success(breakdown).to_json()),
+    )
+
+
+def run_size(tmp, users, tests, topics, repeat, seed):
+    records = generate_cohort(users, tests, topics, seed=seed)
+    answers = sum(correct + wrong for _, _, correct, wrong, _ in records)
+    label = f"{users}x{tests}"
+    fields = {"size": label, "users": users, "tests": tests, "answers": answers}
+    print(f"{label}: {len(records)} test, {answers:,} cevap yazılıyor...")
+
+    db = DBManager(os.path.join(tmp, f"suite_{label}.db"))
+    populate(db, records)
+    user = records[0][0]
+    weight_records = db.get_all_test_results(user)
+    perf_records = db.get_all_test_results_specific(user)
+
+    extra = generate_cohort(1, WRITE_BATCH, topics, seed=seed + 1)
+    test_json = extra[0][1]
+    plan_json = json_codec.dumps(build_plan(30, topics, seed))
+
+    cases = [
+        ("analyze_topics_with_weights", lambda: analyze_topics_with_weights(weight_records)),
+        ("analyze_test_performance", lambda: analyze_test_performance(perf_records)),
+        ("get_difficulty_breakdown", lambda: db.get_difficulty_breakdown(user)),
+        ("get_topic_minutes_estimate", lambda: db.get_topic_minutes_estimate(user)),
+        (f"save_test_result x{WRITE_BATCH}", lambda: populate(db, extra)),
+        (f"save_test x{WRITE_BATCH}", lambda: [db.save_test(user, test_json) for _ in range(WRITE_BATCH)]),
+        (f"save_plan x{WRITE_BATCH}", lambda: [db.save_plan(user, plan_json) for _ in range(WRITE_BATCH)]),
+        *_chart_cases(db, user, tests),
+    ]
+    return [_row(f"{name}, {label}", fn, repeat, **fields) for name, fn in cases]
+
+
+def run_pdf(days_list, repeat):
+    exporter = PDFExporter()
+    rows = []
+    for days in days_list:
+        plan = build_plan(days)
+        rows.append(_row(f"export_plan_to_pdf, {days} gün", lambda: exporter.export_plan_to_pdf(plan),
+                         repeat, days=days))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analiz, depolama, PDF ve grafik mikro benchmark takımı")
+    parser.add_argument("--sizes", nargs="+", default=["10x10", "50x20", "100x50"],
+                        help="Kullanıcı x test sayısı (ör. 50x20)")
+    parser.add_argument("--topics", type=int, default=20, help="Konu sayısı (K)")
+    parser.add_argument("--pdf-days", type=int, nargs="+", default=[14, 365])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="JSON sonuç dosyası")
+    parser.add_argument("--baseline", help="Karşılaştırılacak önceki JSON sonuç dosyası")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Gerileme sayılacak median artış oranı")
+    args = parser.parse_args(argv)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            users, tests = parse_size(size)
+            rows.extend(run_size(tmp, users, tests, args.topics, args.repeat, args.seed))
+    rows.extend(run_pdf(args.pdf_days, min(args.repeat, 3)))
+
+    report("suite", rows, args.output)
+
+    if args.baseline:
+        regressions = compare(rows, args.baseline, args.tolerance)
+        for case, old, new in regressions:
+            print(f"GERİLEME {case}: {old * 1000:.2f} ms -> {new * 1000:.2f} ms")
+        if regressions:
+            return 1
+        print(f"Gerileme yok (tolerans %{args.tolerance * 100:.0f}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
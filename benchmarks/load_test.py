@@ -0,0 +1,349 @@
+"""
+app.py için çok oturumlu yük testi.
+
+Her sanal öğrenci, Streamlit'in AppTest'i ile gerçek sayfaları başsız olarak gezer:
+uygulamayı açar, plan oluşturur, test üretir, testi çözer, dashboard'a ve geçmişe
+bakar. Oturumlar aynı süreçte iş parçacıklarında yürür; bu, tek bir `streamlit run`
+sürecinin oturumları çalıştırma biçimine yakındır. Gemini çağrıları sahte arka uca
+(logic.gemini_backends.FakeBackend) gider, veritabanı geçici bir dosyadır.
+
+Raporlanan değerler: sayfa başına ve toplam p50/p95/p99 gecikme, saniyedeki sayfa
+çalıştırması, hata sayısı, yazma kilidi beklemeleri (ConnectionManager.stats),
+oturum başına RSS artışı ve session_state boyutu, Gemini arka ucu ve zamanlayıcı
+sayaçları.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.load_test --sessions 20 --concurrency 10 --latency 0.5
+    python -m benchmarks.load_test --sessions 50 --iterations 2 --output reports/load_test.json
+"""
+import argparse
+import json
+import logging
+import os
+import pickle
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks._harness import environment
+from logic import gemini_api
+from logic.gemini_backends import FakeBackend
+
+APP_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, "app.py"))
+PAGES = {
+    "plan": "🏁 Plan Oluştur",
+    "test_generate": "📝 Test Üret",
+    "test_solve": "🧪 Test Çöz",
+    "dashboard": "📈 Dashboard",
+    "history": "📂 Geçmiş",
+}
+
+
+def rss_bytes():
+    """
+    Sürecin şu anki RSS'i; /proc yoksa en yüksek RSS'e düşer.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def summarize(latencies):
+    return {
+        "count": len(latencies),
+        "p50_s": percentile(latencies, 50),
+        "p95_s": percentile(latencies, 95),
+        "p99_s": percentile(latencies, 99),
+        "mean_s": statistics.fmean(latencies) if latencies else None,
+        "max_s": max(latencies) if latencies else None,
+    }
+
+
+def patch_app_test_for_threads():
+    """
+    AppTest tek oturumluk testler için yazılmıştır; eşzamanlı oturumlar için üç düzeltme:
+    - Her çalıştırma süreç genelindeki Runtime tekilini sahte bir örnekle kurup bitince None
+      yapar; bir oturum bitince diğerinin çalışması ortasında tekil kaybolur. Tekil boşken
+      son kurulan sahte örnek döndürülür (bu uygulama ondan yalnızca ortak yöneticileri kullanır).
+    - Her çalıştırma app.py'yi yeni bir ScriptCache ile yeniden derler; Python 3.11'de eşzamanlı
+      ast.parse "AST constructor recursion depth mismatch" verebilir. Gerçek sunucudaki gibi
+      derlenmiş kod tüm oturumlarca paylaşılır.
+    - Her çalıştırma global.appTest ayarını config.get_option'ı geçici olarak değiştirerek açar;
+      iç içe geçen değişiklikler birbirini geri alınca widget biçimlendiricileri kaydedilmez.
+      Ayar en baştan kalıcı olarak açılır, böylece geri almalar hep aynı değere döner.
+    """
+    from streamlit import config
+    from streamlit.runtime.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1.util import build_mock_config_get_option
+
+    original_instance = Runtime.instance.__func__
+    last_runtime = []
+
+    def instance(cls):
+        if cls._instance is not None:
+            last_runtime[:] = [cls._instance]
+            return cls._instance
+        return last_runtime[0] if last_runtime else original_instance(cls)
+
+    original_get_bytecode = ScriptCache.get_bytecode
+    bytecode = {}
+    bytecode_lock = threading.Lock()
+
+    def get_bytecode(self, script_path):
+        with bytecode_lock:
+            if script_path not in bytecode:
+                bytecode[script_path] = original_get_bytecode(self, script_path)
+            return bytecode[script_path]
+
+    Runtime.instance = classmethod(instance)
+    ScriptCache.get_bytecode = get_bytecode
+    config.get_option = build_mock_config_get_option({"global.appTest": True})
+
+
+class Session:
+    """
+    Tek bir sanal öğrencinin AppTest oturumu; her adımın süresini ve hatasını kaydeder.
+    """
+
+    def __init__(self, user, args, results):
+        from streamlit.testing.v1 import AppTest
+
+        self.user = user
+        self.args = args
+        self.results = results
+        self.rng = random.Random(f"{args.seed}-{user}")
+        self.app = AppTest.from_file(APP_PATH, default_timeout=args.timeout)
+
+    def _step(self, name, action, expect=None):
+        """
+        action'ı çalıştırıp süresini kaydeder. Sayfadaki istisnalar hatadır; expect verilirse
+        st.success mesajlarından biri onu içermelidir (st.error sonuç gösterimi için de kullanıldığından
+        tek başına hata sayılmaz).
+        """
+        started = time.perf_counter()
+        error = None
+        try:
+            action()
+            if self.app.exception:
+                error = self.app.exception[0].message
+            elif expect and not any(expect in item.value for item in self.app.success):
+                error = self.app.error[0].value if self.app.error else f"'{expect}' mesajı yok"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        self.results.record(name, time.perf_counter() - started, error)
+        if self.args.think:
+            time.sleep(self.rng.uniform(0, 2 * self.args.think))
+        return error is None
+
+    def _button(self, prefix):
+        return next(b for b in self.app.button if b.label.startswith(prefix))
+
+    def _text_input(self, label_prefix):
+        return next(t for t in self.app.text_input if t.label.startswith(label_prefix))
+
+    def _topic(self):
+        # Herkes aynı konuyu isterse istekler tek uçuşta birleşir ve soru bankasından gelir
+        return f"Yük Konusu {self.rng.randrange(self.args.topics)}"
+
+    def _go(self, page):
+        self.app.sidebar.radio[0].set_value(PAGES[page]).run()
+
+    def open(self):
+        def action():
+            self.app.run()
+            self.app.sidebar.text_input[0].set_value(self.user).run()
+        return self._step("open", action)
+
+    def create_plan(self):
+        def action():
+            self._go("plan")
+            self._text_input("🔍").set_value(self._topic())
+            self.app.number_input[0].set_value(self.args.plan_days)
+            self._button("✅ Plan Oluştur").click().run()
+        return self._step("plan", action, expect="Plan başarıyla")
+
+    def generate_test(self):
+        def action():
+            self._go("test_generate")
+            self._text_input("🧠").set_value(self._topic())
+            self.app.slider[0].set_value(self.args.questions)
+            self._button("🚀 Testi Oluştur").click().run()
+        return self._step("test_generate", action, expect="Test başarıyla")
+
+    def solve_test(self):
+        def action():
+            self._go("test_solve")
+            for radio in self.app.radio:
+                if radio.key and radio.key.startswith("q_"):
+                    radio.set_value(self.rng.choice(radio.options))
+            self._button("📊").click().run()
+        return self._step("test_solve", action, expect="Doğru:")
+
+    def dashboard(self):
+        return self._step("dashboard", lambda: self._go("dashboard"))
+
+    def history(self):
+        return self._step("history", lambda: self._go("history"))
+
+    def session_state_bytes(self):
+        try:
+            return len(pickle.dumps(self.app.session_state.to_dict()))
+        except Exception:
+            return None
+
+    def run(self):
+        if not self.open():
+            return
+        for _ in range(self.args.iterations):
+            self.create_plan()
+            if self.generate_test():
+                self.solve_test()
+            self.dashboard()
+            self.history()
+
+
+class Results:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.error_samples = []
+
+    def record(self, page, latency, error=None):
+        with self._lock:
+            self.latencies[page].append(latency)
+            if error:
+                self.errors[page] += 1
+                if len(self.error_samples) < 10:
+                    self.error_samples.append(f"{page}: {error}")
+
+
+def run_load(args):
+    from data.connection import get_connection_manager
+
+    results = Results()
+    lock_manager = get_connection_manager()
+    lock_manager.reset_stats()
+
+    rss_before = rss_bytes()
+    sessions = []
+    started = time.perf_counter()
+
+    def run_session(index):
+        session = Session(f"yuk_ogrenci_{index:04d}", args, results)
+        sessions.append(session)
+        session.run()
+
+    with ThreadPoolExecutor(max_workers=args.concurrency or args.sessions) as executor:
+        list(executor.map(run_session, range(args.sessions)))
+    elapsed = time.perf_counter() - started
+    rss_after = rss_bytes()
+
+    all_latencies = [latency for values in results.latencies.values() for latency in values]
+    state_sizes = [size for size in (s.session_state_bytes() for s in sessions) if size is not None]
+    return {
+        "sessions": args.sessions,
+        "concurrency": args.concurrency or args.sessions,
+        "iterations": args.iterations,
+        "elapsed_s": round(elapsed, 3),
+        "page_runs": len(all_latencies),
+        "throughput_pages_per_s": round(len(all_latencies) / elapsed, 2),
+        "sessions_per_min": round(args.sessions * args.iterations / elapsed * 60, 2),
+        "errors": sum(results.errors.values()),
+        "error_samples": results.error_samples,
+        "overall": summarize(all_latencies),
+        "pages": {page: {**summarize(values), "errors": results.errors[page]}
+                  for page, values in results.latencies.items()},
+        "db_locks": lock_manager.stats(),
+        "memory": {
+            "rss_delta_mib": round((rss_after - rss_before) / 2 ** 20, 1),
+            "rss_per_session_kib": round((rss_after - rss_before) / 1024 / args.sessions, 1),
+            "session_state_mean_kib": round(statistics.fmean(state_sizes) / 1024, 1) if state_sizes else None,
+        },
+        "gemini_backend": gemini_api.backend.stats(),
+        "gemini_scheduler": gemini_api.scheduler.stats(),
+    }
+
+
+def print_summary(summary):
+    print(f"\n== load test: {summary['sessions']} oturum, eşzamanlı {summary['concurrency']} ==")
+    print(f"Süre {summary['elapsed_s']} sn, {summary['page_runs']} sayfa çalıştırması, "
+          f"{summary['throughput_pages_per_s']} sayfa/sn, {summary['sessions_per_min']} senaryo/dk, "
+          f"{summary['errors']} hata")
+    rows = [("toplam", {**summary["overall"], "errors": summary["errors"]})] + list(summary["pages"].items())
+    for page, stats in rows:
+        if not stats["count"]:
+            continue
+        print(f"{page:<16} n={stats['count']:<5} p50 {stats['p50_s'] * 1000:8.1f} ms   "
+              f"p95 {stats['p95_s'] * 1000:8.1f} ms   p99 {stats['p99_s'] * 1000:8.1f} ms   hata {stats['errors']}")
+    print(f"DB yazma kilidi: {summary['db_locks']}")
+    print(f"Bellek: {summary['memory']}")
+    print(f"Gemini: {summary['gemini_backend']} / {summary['gemini_scheduler']}")
+    for sample in summary["error_samples"]:
+        print(f"  hata örneği → {sample}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="app.py çok oturumlu yük testi (AppTest + sahte Gemini)")
+    parser.add_argument("--sessions", type=int, default=10, help="Sanal öğrenci sayısı")
+    parser.add_argument("--concurrency", type=int, help="Aynı anda yürüyen oturum (varsayılan: hepsi)")
+    parser.add_argument("--iterations", type=int, default=1, help="Oturum başına senaryo tekrarı")
+    parser.add_argument("--think", type=float, default=0.0, help="Adımlar arası ortalama düşünme süresi (sn)")
+    parser.add_argument("--latency", type=float, default=0.5, help="Sahte Gemini ilk parça gecikmesi (sn)")
+    parser.add_argument("--chunk-delay", type=float, default=0.01, help="Sahte Gemini parçalar arası süre (sn)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Sahte Gemini 429/503 oranı")
+    parser.add_argument("--questions", type=int, default=5, help="Üretilen test başına soru")
+    parser.add_argument("--plan-days", type=int, default=7, help="Oluşturulan plan gün sayısı")
+    parser.add_argument("--topics", type=int, default=50, help="Oturumların rastgele seçtiği konu sayısı")
+    parser.add_argument("--timeout", type=float, default=120, help="Tek sayfa çalıştırması için zaman aşımı (sn)")
+    parser.add_argument("--db", help="Veritabanı dosyası (varsayılan: geçici dosya)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="JSON sonuç dosyası")
+    args = parser.parse_args(argv)
+
+    # Streamlit'in AppTest altındaki "bare mode" ve kullanımdan kaldırma uyarıları ölçümü boğmasın
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    patch_app_test_for_threads()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Veritabanı yolu data.connection ilk kez içe aktarılmadan önce belirlenmeli
+        os.environ["EDUWISE_DB_PATH"] = args.db or os.path.join(tmp, "load_test.db")
+        backend = FakeBackend(
+            first_chunk_latency=args.latency, chunk_delay=args.chunk_delay,
+            error_rate=args.error_rate, array_length=args.plan_days, seed=args.seed,
+        )
+        gemini_api.set_backend(backend)
+        gemini_api.disable_response_cache()
+        summary = run_load(args)
+
+    print_summary(summary)
+    if args.output:
+        if os.path.dirname(args.output):
+            os.makedirs(os.path.dirname(args.output), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"benchmark": "load_test", "environment": environment(), "args": vars(args), "summary": summary},
+                      f, ensure_ascii=False, indent=2)
+        print(f"Sonuçlar kaydedildi: {args.output}")
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
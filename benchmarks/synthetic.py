@@ -0,0 +1,84 @@
+"""
+Benchmark'lar için tekrarlanabilir sentetik veri: N kullanıcı × M test,
+her testte 5–40 soru, K konu. Her kullanıcının konu başına sabit bir başarı
+olasılığı vardır; böylece analizler gerçekçi biçimde dağılmış oranlar görür.
+"""
+import random
+from datetime import date, datetime, timedelta
+
+from utils import json_codec
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+def topic_names(count):
+    return [f"Konu {i:02d}" for i in range(count)]
+
+
+def build_test(rng, topics, skill, min_questions=5, max_questions=40):
+    questions = []
+    for _ in range(rng.randint(min_questions, max_questions)):
+        topic = rng.choice(topics)
+        correct_answer = rng.choice("ABCD")
+        questions.append({
+            "question": f"{topic} örnek soru {rng.randint(1, 10 ** 6)}",
+            "options": ["A) a", "B) b", "C) c", "D) d"],
+            "correct_answer": correct_answer,
+            "explanation": "Kısa açıklama " + "y" * rng.randint(20, 80),
+            "topic": topic,
+            "difficulty": rng.choice(DIFFICULTIES),
+            "user_answer": correct_answer if rng.random() < skill[topic] else rng.choice("ABCD"),
+        })
+    return questions
+
+
+def generate_cohort(users, tests_per_user, topic_count=20, min_questions=5, max_questions=40, seed=42):
+    """
+    (user, test_json, correct, wrong, timestamp) kayıtları; test_json uygulamanın
+    test_results'a yazdığı biçimdedir (user_answer alanlı soru listesi).
+    """
+    rng = random.Random(seed)
+    topics = topic_names(topic_count)
+    start = datetime(2025, 1, 1)
+    records = []
+    for u in range(users):
+        user = f"ogrenci{u:04d}"
+        skill = {topic: rng.uniform(0.2, 0.95) for topic in topics}
+        for t in range(tests_per_user):
+            questions = build_test(rng, topics, skill, min_questions, max_questions)
+            correct = sum(q["user_answer"] == q["correct_answer"] for q in questions)
+            timestamp = (start + timedelta(hours=t, minutes=u)).isoformat()
+            records.append((user, json_codec.dumps(questions), correct, len(questions) - correct, timestamp))
+    return records
+
+
+def build_plan(days, topic_count=20, seed=42):
+    """
+    calisma_plani biçiminde days günlük plan sözlüğü.
+    """
+    rng = random.Random(seed)
+    topics = topic_names(topic_count)
+    start = date(2025, 1, 1)
+    return {
+        "calisma_plani": [
+            {
+                "gun": day + 1,
+                "tarih": (start + timedelta(days=day)).isoformat(),
+                "konu": rng.choice(topics),
+                "alt_konu": f"Alt konu {rng.randint(1, 9)}",
+                "etkinlik": "Konu anlatımı ve örnek çözümler " + "x" * rng.randint(10, 60),
+                "gorev": "Günün sorularını çöz " + "z" * rng.randint(10, 60),
+                "tekrar": rng.random() < 0.3,
+                "soru_coz": rng.random() < 0.7,
+            }
+            for day in range(days)
+        ]
+    }
+
+
+def populate(db, records):
+    """
+    Kayıtları DBManager.save_test_result ile yazar (uygulamanın kullandığı yol).
+    """
+    for user, test_json, correct, wrong, _ in records:
+        db.save_test_result(user, test_json, correct, wrong)
@@ -0,0 +1,94 @@
+"""
+plan_json / test_json kolonları için saklama kodlayıcısı.
+
+Yeni kayıtlar kompakt JSON olarak sıkıştırılıp biçim etiketiyle BLOB olarak
+yazılır; etiketsiz TEXT değerler eski (sıkıştırılmamış) kayıtlardır ve olduğu
+gibi döndürülür. Böylece eski ve yeni satırlar aynı tabloda birlikte okunabilir.
+
+Biçim: 2 baytlık etiket + gövde
+    b"\\x00z" -> zlib
+    b"\\x00s" -> zstd (isteğe bağlı `zstandard` paketi gerekir)
+"""
+import os
+import zlib
+
+from logger import get_logger
+from utils import json_codec
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = get_logger(__name__)
+
+ZLIB_TAG = b"\x00z"
+ZSTD_TAG = b"\x00s"
+
+# Bu boyutun altındaki gövdeler sıkıştırmaya değmez; düz metin olarak saklanır
+MIN_COMPRESS_BYTES = 256
+
+
+def _resolve_codec(name):
+    if name == "zstd" and zstandard is None:
+        logger.warning("EDUWISE_BLOB_CODEC=zstd ama zstandard paketi kurulu değil, zlib kullanılacak.")
+        return "zlib"
+    if name not in ("zlib", "zstd", "none"):
+        logger.warning("Bilinmeyen EDUWISE_BLOB_CODEC değeri: %s, zlib kullanılacak.", name)
+        return "zlib"
+    return name
+
+
+BLOB_CODEC = _resolve_codec(os.getenv("EDUWISE_BLOB_CODEC", "zlib"))
+
+
+def compact_json(text):
+    """
+    JSON metnini girintisiz, ASCII kaçışsız biçime getirir. JSON değilse metni olduğu gibi döndürür.
+    """
+    try:
+        return json_codec.dumps(json_codec.loads(text))
+    except (TypeError, ValueError):
+        return text
+
+
+def encode_blob(text, codec=None):
+    """
+    JSON metnini saklanacak değere çevirir: sıkıştırılmış etiketli bytes ya da kısa/kapalı durumda düz str.
+    """
+    if text is None:
+        return None
+    codec = codec or BLOB_CODEC
+    text = compact_json(text)
+    raw = text.encode("utf-8")
+    if codec == "none" or len(raw) < MIN_COMPRESS_BYTES:
+        return text
+    if codec == "zstd":
+        return ZSTD_TAG + zstandard.ZstdCompressor(level=9).compress(raw)
+    return ZLIB_TAG + zlib.compress(raw, 6)
+
+
+def decode_blob(value):
+    """
+    encode_blob ile yazılmış veya eski TEXT biçimindeki değeri JSON metnine çevirir.
+    """
+    if value is None or isinstance(value, str):
+        return value
+    value = bytes(value)
+    tag, body = value[:2], value[2:]
+    if tag == ZLIB_TAG:
+        return zlib.decompress(body).decode("utf-8")
+    if tag == ZSTD_TAG:
+        if zstandard is None:
+            raise RuntimeError("zstd ile sıkıştırılmış kayıt okunamıyor: zstandard paketi kurulu değil.")
+        return zstandard.ZstdDecompressor().decompress(body).decode("utf-8")
+    # Etiketsiz bytes: metin olarak yazılmış eski bir kayıt
+    return value.decode("utf-8")
+
+
+def stored_size(value):
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return len(value)
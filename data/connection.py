@@ -0,0 +1,138 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_DB_PATH = os.getenv("EDUWISE_DB_PATH", "data/app_data.db")
+
+# Her yeni bağlantıda uygulanan ayarlar
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Bundan uzun süren BEGIN IMMEDIATE başka bir yazarı beklemiş sayılır
+CONTENDED_WAIT_S = 0.001
+
+
+class ConnectionManager:
+    """
+    Bir veritabanı dosyası için süreç genelinde tek yönetici.
+    Her iş parçacığı kendi sqlite3 bağlantısını kullanır (WAL sayesinde okumalar
+    yazmaları beklemez); şema kurulumu süreç başına yalnızca bir kez yapılır.
+    ":memory:" veritabanı iş parçacıkları arasında paylaşılan tek bağlantı kullanır.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._conn_lock = threading.Lock()
+        self._schema_ready = False
+        self._shared_conn = None
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    def _open(self):
+        conn = sqlite3.connect(self.db_path, timeout=5.0, check_same_thread=False)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        logger.debug("Yeni DB bağlantısı açıldı: %s (%s)", self.db_path, threading.current_thread().name)
+        return conn
+
+    def connection(self):
+        if self.db_path == ":memory:":
+            with self._conn_lock:
+                if self._shared_conn is None:
+                    self._shared_conn = self._open()
+            return self._shared_conn
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """
+        Bu iş parçacığının bağlantısını kapatır; sonraki connection() yenisini açar.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """
+        BEGIN IMMEDIATE ile yazma kilidini baştan alan işlem bloğu.
+        Hata olursa işlem geri alınır, bağlantı açık işlemde kalmaz.
+        """
+        conn = self.connection()
+        started = time.perf_counter()
+        conn.execute("BEGIN IMMEDIATE")
+        self._record_lock_wait(time.perf_counter() - started)
+        try:
+            yield conn.cursor()
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+
+    def _record_lock_wait(self, waited):
+        with self._stats_lock:
+            self.transactions += 1
+            self.lock_wait_s += waited
+            self.lock_wait_max_s = max(self.lock_wait_max_s, waited)
+            if waited >= CONTENDED_WAIT_S:
+                self.contended += 1
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.transactions = 0
+            self.contended = 0
+            self.lock_wait_s = 0.0
+            self.lock_wait_max_s = 0.0
+
+    def stats(self):
+        """
+        Yazma işlemlerinin BEGIN IMMEDIATE'te yazma kilidini bekleme süreleri.
+        contended: CONTENDED_WAIT_S'den uzun bekleyen işlem sayısı.
+        """
+        with self._stats_lock:
+            return {
+                "transactions": self.transactions,
+                "contended": self.contended,
+                "lock_wait_s": round(self.lock_wait_s, 4),
+                "lock_wait_max_s": round(self.lock_wait_max_s, 4),
+            }
+
+    def ensure_schema(self, init_fn):
+        if self._schema_ready:
+            return
+        with self._schema_lock:
+            if not self._schema_ready:
+                init_fn()
+                self._schema_ready = True
+
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_connection_manager(db_path=DEFAULT_DB_PATH):
+    key = db_path if db_path == ":memory:" else os.path.abspath(db_path)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = ConnectionManager(db_path)
+            _managers[key] = manager
+        return manager
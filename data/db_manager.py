@@ -1,262 +1,849 @@
-import sqlite3
+import functools
+import hashlib
+import time
 from datetime import datetime
-from logic.topic_analyzer import analyze_topics_with_weights
-import json
-from logger import logger  # Logger import edildi
+from logic.topic_analyzer import analyze_topic_stats
+from logic.performance_analyzer import build_recommendations
+from logic.columnar_analytics import AnswerColumns
+from logic.models import Question
+from utils import json_codec, metrics
+from data.codec import decode_blob, encode_blob, stored_size
+from data.connection import DEFAULT_DB_PATH, get_connection_manager
+from data import queries
+from data.migrations import run_migrations, check_query_plans
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# Kodlayıcıdan geçirilerek saklanan JSON gövde kolonları
+BLOB_COLUMNS = (("plans", "plan_json"), ("tests", "test_json"), ("test_results", "test_json"))
+
+# Tüm ISO zaman damgalarından büyük olduğu için ilk sayfada imleç olarak kullanılır
+_FIRST_PAGE_CURSOR = ("\uffff", 0)
+
+
+DB_QUERY_SECONDS = metrics.histogram(
+    "eduwise_db_query_seconds", "DBManager metotlarının süresi", ["method"]
+)
+DB_QUERY_ROWS = metrics.histogram(
+    "eduwise_db_query_rows", "DBManager okuma metotlarının döndürdüğü satır sayısı", ["method"],
+    buckets=metrics.COUNT_BUCKETS
+)
+DB_QUERY_ERRORS = metrics.counter(
+    "eduwise_db_query_errors_total", "Hata ile biten DBManager metotları", ["method"]
+)
+
+
+def _row_count(result):
+    if result is None:
+        return 0
+    if isinstance(result, AnswerColumns):
+        return len(result.topic_codes)
+    if isinstance(result, (list, dict)):
+        return len(result)
+    if isinstance(result, tuple):
+        return 1
+    return None
+
+
+def _track_query(method=None, *, count_rows=None):
+    """
+    Metodun süresini ve döndürdüğü satır sayısını metriklere yazar. Satır sayısı
+    varsayılan olarak yalnızca get_* metotları için tutulur; count_rows=False ile kapatılır.
+    """
+    if method is None:
+        return functools.partial(_track_query, count_rows=count_rows)
+
+    name = method.__name__
+    if count_rows is None:
+        count_rows = name.startswith("get_")
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = method(self, *args, **kwargs)
+        except Exception:
+            DB_QUERY_ERRORS.labels(method=name).inc()
+            raise
+        finally:
+            DB_QUERY_SECONDS.labels(method=name).observe(time.perf_counter() - started)
+        rows = _row_count(result) if count_rows else None
+        if rows is not None:
+            DB_QUERY_ROWS.labels(method=name).observe(rows)
+        return result
+
+    return wrapper
+
+
+def normalize_topic(topic: str) -> str:
+    return " ".join(topic.casefold().split())
+
+
+def _question_hash(topic_norm: str, difficulty: str, question_text: str) -> str:
+    stem = " ".join(question_text.casefold().split())
+    return hashlib.sha1(f"{topic_norm}|{difficulty}|{stem}".encode("utf-8")).hexdigest()
+
+
+def extract_answer_rows(test_json):
+    """
+    Test JSON'undaki her soru için (topic, difficulty, correct) satırı üretir.
+    Cevaplanmamış sorularda correct None olur.
+    """
+    rows = []
+    for q in json_codec.loads(test_json):
+        user_answer = q.get("user_answer")
+        correct_answer = q.get("correct_answer")
+        if user_answer is None or correct_answer is None:
+            correct = None
+        else:
+            correct = 1 if user_answer == correct_answer else 0
+        rows.append((q.get("topic"), q.get("difficulty"), correct))
+    return rows
+
+
+def summarize_plan(plan_json):
+    """
+    Plan JSON'undan geçmiş listesinde gösterilecek (gün sayısı, konu listesi JSON'u) özetini çıkarır.
+    """
+    plan = json_codec.loads(plan_json)
+    topics = [konu.get("konu") for konu in plan.get("tum_konular", []) if isinstance(konu, dict) and konu.get("konu")]
+    return len(plan.get("calisma_plani", [])), json_codec.dumps(topics)
+
+
+def summarize_answer_rows(rows):
+    """
+    answers satırlarından (soru sayısı, ilk görülme sırasıyla konu listesi JSON'u) özetini çıkarır.
+    """
+    topics = list(dict.fromkeys(topic for topic, _, _ in rows if topic))
+    return len(rows), json_codec.dumps(topics)
+
 
 class DBManager:
-    def __init__(self, db_path="data/app_data.db"):
+    def __init__(self, db_path=DEFAULT_DB_PATH):
         try:
-            self.conn = sqlite3.connect(db_path, check_same_thread=False)
-            self.create_tables()
-            logger.info(f"DB bağlantısı kuruldu: {db_path}")
+            self.db_path = db_path
+            self._manager = get_connection_manager(db_path)
+            self._manager.ensure_schema(self.create_tables)
+            logger.debug("DBManager hazır: %s", db_path)
         except Exception as e:
-            logger.error(f"DB bağlantısı sırasında hata: {e}", exc_info=True)
+            logger.error("DB bağlantısı sırasında hata: %s", e, exc_info=True)
             raise
 
+    @property
+    def conn(self):
+        # İş parçacığına özel bağlantı; DBManager örnekleri ucuzdur ve paylaşılabilir
+        return self._manager.connection()
+
+    def transaction(self):
+        return self._manager.transaction()
+
+    def close(self):
+        # Yalnızca bu iş parçacığının bağlantısı kapanır; diğerleri açık kalır
+        self._manager.close()
+
+    def lock_stats(self):
+        return self._manager.stats()
+
     def create_tables(self):
         try:
-            cursor = self.conn.cursor()
+            with self.transaction() as cursor:
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS plans (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        user TEXT,
+                        plan_json TEXT,
+                        created_at TEXT
+                    )
+                """)
 
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS plans (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user TEXT,
-                    plan_json TEXT,
-                    created_at TEXT
-                )
-            """)
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS tests (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        user TEXT,
+                        test_json TEXT,
+                        created_at TEXT
+                    )
+                """)
 
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS tests (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user TEXT,
-                    test_json TEXT,
-                    created_at TEXT
-                )
-            """)
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS test_results (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        user TEXT,
+                        test_json TEXT,
+                        correct INTEGER,
+                        wrong INTEGER,
+                        timestamp TEXT
+                    )
+                """)
 
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS test_results (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user TEXT,
-                    test_json TEXT,
-                    correct INTEGER,
-                    wrong INTEGER,
-                    timestamp TEXT
-                )
-            """)
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS answers (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        user TEXT,
+                        result_id INTEGER,
+                        topic TEXT,
+                        difficulty TEXT,
+                        correct INTEGER,
+                        timestamp TEXT
+                    )
+                """)
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_answers_user_topic ON answers (user, topic)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_answers_result ON answers (result_id)")
+
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS user_topic_stats (
+                        user TEXT,
+                        topic TEXT,
+                        difficulty TEXT,
+                        correct INTEGER,
+                        wrong INTEGER,
+                        PRIMARY KEY (user, topic, difficulty)
+                    )
+                """)
+
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS question_bank (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        topic TEXT,
+                        topic_norm TEXT,
+                        difficulty TEXT,
+                        question_hash TEXT UNIQUE,
+                        question_json TEXT,
+                        created_at TEXT
+                    )
+                """)
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_question_bank_topic
+                    ON question_bank (topic_norm, difficulty)
+                """)
+
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS question_bank_seen (
+                        user TEXT,
+                        question_id INTEGER,
+                        seen_at TEXT,
+                        PRIMARY KEY (user, question_id)
+                    )
+                """)
+
+                run_migrations(cursor)
 
-            self.conn.commit()
             logger.info("Tablolar başarıyla oluşturuldu veya mevcut.")
         except Exception as e:
-            logger.error(f"Tablo oluşturma sırasında hata: {e}", exc_info=True)
+            logger.error("Tablo oluşturma sırasında hata: %s", e, exc_info=True)
             raise
 
+    @staticmethod
+    def _insert_answers(cursor, user, result_id, timestamp, rows):
+        cursor.executemany("""
+            INSERT INTO answers (user, result_id, topic, difficulty, correct, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [(user, result_id, topic, difficulty, correct, timestamp) for topic, difficulty, correct in rows])
+
+    @staticmethod
+    def _count_topic_stats(rows):
+        """
+        (topic, difficulty, correct) satırlarını (topic, difficulty) -> [doğru, yanlış] sayaçlarına toplar.
+        """
+        counts = {}
+        for topic, difficulty, correct in rows:
+            if correct is None:
+                continue
+            key = (topic if topic is not None else "GENEL", difficulty if difficulty is not None else "medium")
+            pair = counts.setdefault(key, [0, 0])
+            pair[0 if correct else 1] += 1
+        return counts
+
+    @staticmethod
+    def _apply_topic_stats(cursor, user, counts, sign=1):
+        cursor.executemany("""
+            INSERT INTO user_topic_stats (user, topic, difficulty, correct, wrong)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (user, topic, difficulty) DO UPDATE SET
+                correct = correct + excluded.correct,
+                wrong = wrong + excluded.wrong
+        """, [(user, topic, difficulty, sign * c, sign * w) for (topic, difficulty), (c, w) in counts.items()])
+        if sign < 0:
+            cursor.execute("DELETE FROM user_topic_stats WHERE user = ? AND correct <= 0 AND wrong <= 0", (user,))
+
+    @_track_query
     def save_plan(self, user, plan_json):
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
-                INSERT INTO plans (user, plan_json, created_at)
-                VALUES (?, ?, ?)
-            """, (user, plan_json, datetime.now().isoformat()))
-            self.conn.commit()
-            logger.info(f"Plan kaydedildi - Kullanıcı: {user}")
+            try:
+                day_count, topics = summarize_plan(plan_json)
+            except Exception as e:
+                logger.warning("Plan özeti çıkarılamadı - Kullanıcı: %s, Hata: %s", user, e)
+                day_count, topics = None, None
+
+            with self.transaction() as cursor:
+                cursor.execute("""
+                    INSERT INTO plans (user, plan_json, created_at, day_count, topics)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (user, encode_blob(plan_json), datetime.now().isoformat(), day_count, topics))
+            logger.info("Plan kaydedildi - Kullanıcı: %s", user)
         except Exception as e:
-            logger.error(f"Plan kaydetme hatası - Kullanıcı: {user}, Hata: {e}", exc_info=True)
+            logger.error("Plan kaydetme hatası - Kullanıcı: %s, Hata: %s", user, e, exc_info=True)
             raise
 
+    @_track_query
     def save_test(self, user, test_json):
+        try:
+            with self.transaction() as cursor:
+                cursor.execute("""
+                    INSERT INTO tests (user, test_json, created_at)
+                    VALUES (?, ?, ?)
+                """, (user, encode_blob(test_json), datetime.now().isoformat()))
+            logger.info("Test kaydedildi - Kullanıcı: %s", user)
+        except Exception as e:
+            logger.error("Test kaydetme hatası - Kullanıcı: %s, Hata: %s", user, e, exc_info=True)
+            raise
+
+    @_track_query
+    def save_test_result(self, user, test_json, correct, wrong):
+        try:
+            try:
+                answer_rows = extract_answer_rows(test_json)
+            except Exception as e:
+                logger.warning("Test cevapları ayrıştırılamadı - Kullanıcı: %s, Hata: %s", user, e)
+                answer_rows = []
+
+            question_count, topics = summarize_answer_rows(answer_rows)
+            timestamp = datetime.now().isoformat()
+            with self.transaction() as cursor:
+                cursor.execute("""
+                    INSERT INTO test_results (user, test_json, correct, wrong, timestamp, question_count, topics)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (user, encode_blob(test_json), correct, wrong, timestamp, question_count, topics))
+                self._insert_answers(cursor, user, cursor.lastrowid, timestamp, answer_rows)
+                self._apply_topic_stats(cursor, user, self._count_topic_stats(answer_rows))
+            logger.info("Test sonucu kaydedildi - Kullanıcı: %s, Doğru: %s, Yanlış: %s", user, correct, wrong)
+        except Exception as e:
+            logger.error("Test sonucu kaydetme hatası - Kullanıcı: %s, Hata: %s", user, e, exc_info=True)
+            raise
+
+    @_track_query
+    def add_questions_to_bank(self, topic, difficulty, questions):
+        try:
+            topic_norm = normalize_topic(topic)
+            now = datetime.now().isoformat()
+            with self.transaction() as cursor:
+                cursor.executemany("""
+                    INSERT OR IGNORE INTO question_bank (topic, topic_norm, difficulty, question_hash, question_json, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, [
+                    (topic, topic_norm, difficulty, _question_hash(topic_norm, difficulty, q.question), json_codec.dumps(q), now)
+                    for q in questions
+                ])
+            logger.info("Soru bankasına eklendi - Konu: %s, Zorluk: %s, Yeni: %s", topic, difficulty, cursor.rowcount)
+            return cursor.rowcount
+        except Exception as e:
+            logger.error("Soru bankasına ekleme hatası - Konu: %s, Hata: %s", topic, e, exc_info=True)
+            raise
+
+    @_track_query
+    def get_unseen_bank_questions(self, user, topic, difficulty, limit):
         try:
             cursor = self.conn.cursor()
             cursor.execute("""
-                INSERT INTO tests (user, test_json, created_at)
-                VALUES (?, ?, ?)
-            """, (user, test_json, datetime.now().isoformat()))
-            self.conn.commit()
-            logger.info(f"Test kaydedildi - Kullanıcı: {user}")
+                SELECT qb.question_json FROM question_bank qb
+                WHERE qb.topic_norm = ? AND qb.difficulty = ?
+                AND NOT EXISTS (
+                    SELECT 1 FROM question_bank_seen s
+                    WHERE s.user = ? AND s.question_id = qb.id
+                )
+                ORDER BY RANDOM() LIMIT ?
+            """, (normalize_topic(topic), difficulty, user, limit))
+            result = [json_codec.loads(row[0], type=Question) for row in cursor.fetchall()]
+            logger.info("Soru bankasından %s görülmemiş soru alındı - Kullanıcı: %s, Konu: %s", len(result), user, topic)
+            return result
         except Exception as e:
-            logger.error(f"Test kaydetme hatası - Kullanıcı: {user}, Hata: {e}", exc_info=True)
+            logger.error("Soru bankası okunurken hata - Kullanıcı: %s, Konu: %s, Hata: %s", user, topic, e, exc_info=True)
             raise
 
-    def save_test_result(self, user, test_json, correct, wrong):
+    @_track_query
+    def get_seen_bank_questions(self, user, topic, limit):
+        """
+        Kullanıcının bu konuda (tüm zorluklarda) en son gördüğü en fazla limit bankadaki soru.
+        """
         try:
             cursor = self.conn.cursor()
             cursor.execute("""
-                INSERT INTO test_results (user, test_json, correct, wrong, timestamp)
-                VALUES (?, ?, ?, ?, ?)
-            """, (user, test_json, correct, wrong, datetime.now().isoformat()))
-            self.conn.commit()
-            logger.info(f"Test sonucu kaydedildi - Kullanıcı: {user}, Doğru: {correct}, Yanlış: {wrong}")
+                SELECT qb.question_json FROM question_bank_seen s
+                JOIN question_bank qb ON qb.id = s.question_id
+                WHERE s.user = ? AND qb.topic_norm = ?
+                ORDER BY s.seen_at DESC LIMIT ?
+            """, (user, normalize_topic(topic), limit))
+            return [json_codec.loads(row[0], type=Question) for row in cursor.fetchall()]
         except Exception as e:
-            logger.error(f"Test sonucu kaydetme hatası - Kullanıcı: {user}, Hata: {e}", exc_info=True)
+            logger.error("Görülen sorular okunurken hata - Kullanıcı: %s, Konu: %s, Hata: %s", user, topic, e, exc_info=True)
             raise
 
+    @_track_query
+    def mark_bank_questions_seen(self, user, topic, difficulty, questions):
+        try:
+            topic_norm = normalize_topic(topic)
+            now = datetime.now().isoformat()
+            with self.transaction() as cursor:
+                cursor.executemany("""
+                    INSERT OR IGNORE INTO question_bank_seen (user, question_id, seen_at)
+                    SELECT ?, id, ? FROM question_bank WHERE question_hash = ?
+                """, [(user, now, _question_hash(topic_norm, difficulty, q.question)) for q in questions])
+            logger.info("Sorular görüldü olarak işaretlendi - Kullanıcı: %s, Konu: %s, Soru: %s",
+                        user, topic, len(questions))
+        except Exception as e:
+            logger.error("Görülen sorular işaretlenirken hata - Kullanıcı: %s, Hata: %s", user, e, exc_info=True)
+            raise
+
+    @_track_query
     def get_latest_plan(self, user):
         try:
             cursor = self.conn.cursor()
-            cursor.execute("""
-                SELECT plan_json, created_at FROM plans
-                WHERE user = ?
-                ORDER BY created_at DESC LIMIT 1
-            """, (user,))
+            cursor.execute(queries.LATEST_PLAN, (user,))
             result = cursor.fetchone()
-            logger.info(f"Son plan alındı - Kullanıcı: {user}")
+            if result:
+                result = (decode_blob(result[0]), result[1])
+            logger.info("Son plan alındı - Kullanıcı: %s", user)
             return result
         except Exception as e:
-            logger.error(f"Son plan alınırken hata - Kullanıcı: {user}, Hata: {e}", exc_info=True)
+            logger.error("Son plan alınırken hata - Kullanıcı: %s, Hata: %s", user, e, exc_info=True)
             raise
 
+    @_track_query
     def get_all_plans(self, user):
         try:
             cursor = self.conn.cursor()
-            cursor.execute("""
-                SELECT id, plan_json, created_at FROM plans
-                WHERE user = ?
-                ORDER BY created_at DESC
-            """, (user,))
-            result = cursor.fetchall()
-            logger.info(f"Tüm planlar alındı - Kullanıcı: {user}")
+            cursor.execute(queries.ALL_PLANS, (user,))
+            result = [(plan_id, decode_blob(plan_json), created_at) for plan_id, plan_json, created_at in cursor.fetchall()]
+            logger.info("Tüm planlar alındı - Kullanıcı: %s", user)
             return result
         except Exception as e:
-            logger.error(f"Tüm planlar alınırken hata - Kullanıcı: {user}, Hata: {e}", exc_info=True)
+            logger.error("Tüm planlar alınırken hata - Kullanıcı: %s, Hata: %s", user, e, exc_info=True)
             raise
 
+    @_track_query
     def get_all_tests_from_tests(self, user):
         try:
             cursor = self.conn.cursor()
-            cursor.execute("""
-                SELECT id, test_json, created_at FROM tests
-                WHERE user = ?
-                ORDER BY created_at DESC
-            """, (user,))
-            result = cursor.fetchall()
-            logger.info(f"Tüm testler alındı - Kullanıcı: {user}")
+            cursor.execute(queries.ALL_TESTS, (user,))
+            result = [(test_id, decode_blob(test_json), created_at) for test_id, test_json, created_at in cursor.fetchall()]
+            logger.info("Tüm testler alındı - Kullanıcı: %s", user)
             return result
         except Exception as e:
-            logger.error(f"Tüm testler alınırken hata - Kullanıcı: {user}, Hata: {e}", exc_info=True)
+            logger.error("Tüm testler alınırken hata - Kullanıcı: %s, Hata: %s", user, e, exc_info=True)
             raise
 
+    @_track_query
     def get_all_test_results(self, user):
         try:
             cursor = self.conn.cursor()
-            cursor.execute("SELECT * FROM test_results WHERE user = ?", (user,))
-            result = cursor.fetchall()
-            logger.info(f"Tüm test sonuçları alındı - Kullanıcı: {user}")
+            cursor.execute(queries.ALL_TEST_RESULTS, (user,))
+            result = [row[:2] + (decode_blob(row[2]),) + row[3:] for row in cursor.fetchall()]
+            logger.info("Tüm test sonuçları alındı - Kullanıcı: %s", user)
             return result
         except Exception as e:
-            logger.error(f"Tüm test sonuçları alınırken hata - Kullanıcı: {user}, Hata: {e}", exc_info=True)
+            logger.error("Tüm test sonuçları alınırken hata - Kullanıcı: %s, Hata: %s", user, e, exc_info=True)
             raise
 
+    @_track_query
     def get_all_test_results_specific(self, user):
         try:
             cursor = self.conn.cursor()
-            cursor.execute("SELECT id, test_json, correct, wrong, timestamp FROM test_results WHERE user = ?", (user,))
-            result = cursor.fetchall()
-            logger.info(f"Özel test sonuçları alındı - Kullanıcı: {user}")
+            cursor.execute(queries.ALL_TEST_RESULTS_SPECIFIC, (user,))
+            result = [(row[0], decode_blob(row[1])) + row[2:] for row in cursor.fetchall()]
+            logger.info("Özel test sonuçları alındı - Kullanıcı: %s", user)
             return result
         except Exception as e:
-            logger.error(f"Özel test sonuçları alınırken hata - Kullanıcı: {user}, Hata: {e}", exc_info=True)
+            logger.error("Özel test sonuçları alınırken hata - Kullanıcı: %s, Hata: %s", user, e, exc_info=True)
             raise
 
-    def delete_plan(self, plan_id):
+    @_track_query
+    def get_plan_summaries(self, user, limit=10, before=None):
+        """
+        Planları en yeniden eskiye, plan_json okunmadan sayfa sayfa döndürür:
+        (id, created_at, day_count, topics). before, önceki sayfanın son
+        satırının (created_at, id) değeridir; None ise ilk sayfa okunur.
+        """
         try:
             cursor = self.conn.cursor()
-            cursor.execute("DELETE FROM plans WHERE id = ?", (plan_id,))
-            self.conn.commit()
-            logger.info(f"Plan silindi - Plan ID: {plan_id}")
+            cursor.execute(queries.PLAN_SUMMARIES, (user, *(before or _FIRST_PAGE_CURSOR), limit))
+            result = [
+                (plan_id, created_at, day_count, json_codec.loads(topics) if topics else [])
+                for plan_id, created_at, day_count, topics in cursor.fetchall()
+            ]
+            logger.info("Plan özetleri alındı - Kullanıcı: %s, Satır: %s", user, len(result))
+            return result
         except Exception as e:
-            logger.error(f"Plan silme hatası - Plan ID: {plan_id}, Hata: {e}", exc_info=True)
+            logger.error("Plan özetleri alınırken hata - Kullanıcı: %s, Hata: %s", user, e, exc_info=True)
             raise
 
-    def delete_test(self, test_id):
+    @_track_query
+    def get_test_result_summaries(self, user, limit=10, before=None):
+        """
+        Test sonuçlarını en yeniden eskiye, test_json okunmadan sayfa sayfa döndürür:
+        (id, timestamp, correct, wrong, question_count, topics). before, önceki
+        sayfanın son satırının (timestamp, id) değeridir.
+        """
         try:
             cursor = self.conn.cursor()
-            cursor.execute("DELETE FROM tests WHERE id = ?", (test_id,))
-            self.conn.commit()
-            logger.info(f"Test silindi - Test ID: {test_id}")
+            cursor.execute(queries.TEST_RESULT_SUMMARIES, (user, *(before or _FIRST_PAGE_CURSOR), limit))
+            result = [
+                (result_id, timestamp, correct, wrong, question_count, json_codec.loads(topics) if topics else [])
+                for result_id, timestamp, correct, wrong, question_count, topics in cursor.fetchall()
+            ]
+            logger.info("Test sonucu özetleri alındı - Kullanıcı: %s, Satır: %s", user, len(result))
+            return result
         except Exception as e:
-            logger.error(f"Test silme hatası - Test ID: {test_id}, Hata: {e}", exc_info=True)
+            logger.error("Test sonucu özetleri alınırken hata - Kullanıcı: %s, Hata: %s", user, e, exc_info=True)
             raise
 
+    @_track_query
+    def get_plan_json(self, plan_id):
+        try:
+            row = self.conn.execute("SELECT plan_json FROM plans WHERE id = ?", (plan_id,)).fetchone()
+            logger.info("Plan gövdesi alındı - Plan ID: %s", plan_id)
+            return decode_blob(row[0]) if row else None
+        except Exception as e:
+            logger.error("Plan gövdesi alınırken hata - Plan ID: %s, Hata: %s", plan_id, e, exc_info=True)
+            raise
+
+    @_track_query
+    def get_test_result_json(self, result_id):
+        try:
+            row = self.conn.execute("SELECT test_json FROM test_results WHERE id = ?", (result_id,)).fetchone()
+            logger.info("Test sonucu gövdesi alındı - Test Result ID: %s", result_id)
+            return decode_blob(row[0]) if row else None
+        except Exception as e:
+            logger.error("Test sonucu gövdesi alınırken hata - Test Result ID: %s, Hata: %s", result_id, e, exc_info=True)
+            raise
+
+    @_track_query
+    def delete_plan(self, plan_id):
+        try:
+            with self.transaction() as cursor:
+                cursor.execute("DELETE FROM plans WHERE id = ?", (plan_id,))
+            logger.info("Plan silindi - Plan ID: %s", plan_id)
+        except Exception as e:
+            logger.error("Plan silme hatası - Plan ID: %s, Hata: %s", plan_id, e, exc_info=True)
+            raise
+
+    @_track_query
+    def delete_test(self, test_id):
+        try:
+            with self.transaction() as cursor:
+                cursor.execute("DELETE FROM tests WHERE id = ?", (test_id,))
+            logger.info("Test silindi - Test ID: %s", test_id)
+        except Exception as e:
+            logger.error("Test silme hatası - Test ID: %s, Hata: %s", test_id, e, exc_info=True)
+            raise
+
+    @_track_query
     def delete_test_results(self, test_id):
+        try:
+            with self.transaction() as cursor:
+                answer_rows = cursor.execute(
+                    "SELECT user, topic, difficulty, correct FROM answers WHERE result_id = ? ORDER BY id", (test_id,)
+                ).fetchall()
+                if answer_rows:
+                    self._apply_topic_stats(
+                        cursor, answer_rows[0][0], self._count_topic_stats(row[1:] for row in answer_rows), sign=-1
+                    )
+                cursor.execute("DELETE FROM test_results WHERE id = ?", (test_id,))
+                cursor.execute("DELETE FROM answers WHERE result_id = ?", (test_id,))
+            logger.info("Test sonucu silindi - Test Result ID: %s", test_id)
+        except Exception as e:
+            logger.error("Test sonucu silme hatası - Test Result ID: %s, Hata: %s", test_id, e, exc_info=True)
+            raise
+
+    @_track_query
+    def get_topic_stats(self, user):
+        """
+        Cevaplanmış sorulardan konu bazlı doğru/yanlış sayıları.
+        Konular ilk görüldükleri sıraya göre döner.
+        """
         try:
             cursor = self.conn.cursor()
-            cursor.execute("DELETE FROM test_results WHERE id = ?", (test_id,))
-            self.conn.commit()
-            logger.info(f"Test sonucu silindi - Test Result ID: {test_id}")
+            cursor.execute(queries.TOPIC_STATS, (user,))
+            result = {topic: {"correct": correct, "wrong": wrong} for topic, correct, wrong in cursor.fetchall()}
+            logger.info("Konu istatistikleri alındı - Kullanıcı: %s", user)
+            return result
         except Exception as e:
-            logger.error(f"Test sonucu silme hatası - Test Result ID: {test_id}, Hata: {e}", exc_info=True)
+            logger.error("Konu istatistikleri alınırken hata - Kullanıcı: %s, Hata: %s", user, e, exc_info=True)
             raise
 
+    @_track_query
     def get_user_topic_analysis(self, user):
         try:
-            records = self.get_all_test_results(user)
-            if not records:
-                logger.info(f"Kullanıcı için test sonucu bulunamadı - Kullanıcı: {user}")
+            topic_stats = self.get_topic_stats(user)
+            if not topic_stats:
+                logger.info("Kullanıcı için test sonucu bulunamadı - Kullanıcı: %s", user)
                 return []
-            analysis = analyze_topics_with_weights(records)
-            logger.info(f"Konu analizi yapıldı - Kullanıcı: {user}")
+            analysis = analyze_topic_stats(topic_stats)
+            logger.info("Konu analizi yapıldı - Kullanıcı: %s", user)
             return analysis
         except Exception as e:
-            logger.error(f"Konu analizi sırasında hata - Kullanıcı: {user}, Hata: {e}", exc_info=True)
+            logger.error("Konu analizi sırasında hata - Kullanıcı: %s, Hata: %s", user, e, exc_info=True)
+            raise
+
+    @_track_query
+    def get_user_performance(self, user):
+        try:
+            recommendations = build_recommendations(self.get_topic_stats(user))
+            logger.info("Performans analizi yapıldı - Kullanıcı: %s", user)
+            return recommendations
+        except Exception as e:
+            logger.error("Performans analizi sırasında hata - Kullanıcı: %s, Hata: %s", user, e, exc_info=True)
             raise
 
+    @_track_query
+    def get_users(self):
+        """
+        Cevaplanmış sorusu olan tüm kullanıcılar, ada göre sıralı.
+        """
+        try:
+            users = [row[0] for row in self.conn.execute("SELECT DISTINCT user FROM user_topic_stats ORDER BY user")]
+            logger.info("Kullanıcı listesi alındı - Kullanıcı: %s", len(users))
+            return users
+        except Exception as e:
+            logger.error("Kullanıcı listesi alınırken hata: %s", e, exc_info=True)
+            raise
+
+    @_track_query
+    def get_answer_columns(self, users=None):
+        """
+        Konu sayaçlarını tek sorguda AnswerColumns'a yükler: her satır bir
+        (kullanıcı, konu) hücresidir, hücreler ilk görülme sırasındadır.
+        users verilirse yalnızca o kullanıcılar (kohort), None ise herkes okunur.
+        Sayaçlar user_topic_stats'tan gelir; answers taranmaz, JSON çözülmez.
+        """
+        try:
+            sql = "SELECT s.user, s.topic, SUM(s.correct), SUM(s.wrong) FROM user_topic_stats s"
+            params = ()
+            if users is not None:
+                params = tuple(users)
+                sql += f" WHERE s.user IN ({', '.join('?' * len(params))})"
+            sql += f" GROUP BY s.user, s.topic ORDER BY {queries.TOPIC_FIRST_SEEN}"
+            rows = self.conn.execute(sql, params).fetchall()
+            columns = AnswerColumns.from_rows(rows)
+            logger.info("Cevap kolonları yüklendi - Kullanıcı: %s, Cevap: %s", len(columns.users), columns.answer_count)
+            return columns
+        except Exception as e:
+            logger.error("Cevap kolonları yüklenirken hata: %s", e, exc_info=True)
+            raise
+
+    @_track_query
     def get_difficulty_breakdown(self, user):
         try:
-            records = self.get_all_test_results(user)
             difficulty_counts = {
                 "easy": {"doğru": 0, "yanlış": 0},
                 "medium": {"doğru": 0, "yanlış": 0},
                 "hard": {"doğru": 0, "yanlış": 0}
             }
 
-            for _, _, test_json, _, _, _ in records:
-                try:
-                    test = json.loads(test_json)
-                    for q in test:
-                        difficulty = q.get("difficulty", "medium")
-                        if difficulty not in difficulty_counts:
-                            continue
+            cursor = self.conn.cursor()
+            cursor.execute(queries.DIFFICULTY_BREAKDOWN, (user,))
+            for difficulty, correct, wrong in cursor.fetchall():
+                if difficulty in difficulty_counts:
+                    difficulty_counts[difficulty]["doğru"] = correct
+                    difficulty_counts[difficulty]["yanlış"] = wrong
 
-                        user_answer = q.get("user_answer")
-                        correct_answer = q.get("correct_answer")
+            logger.info("Zorluk dağılımı hesaplandı - Kullanıcı: %s", user)
+            return difficulty_counts
+        except Exception as e:
+            logger.error("Zorluk dağılımı alınırken hata - Kullanıcı: %s, Hata: %s", user, e, exc_info=True)
+            raise
 
-                        if user_answer is None or correct_answer is None:
-                            continue
+    @_track_query
+    def get_topic_minutes_estimate(self, user):
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(queries.TOPIC_MINUTES, (user,))
+            topic_minutes = dict(cursor.fetchall())
+
+            logger.info("Konu dakika tahmini yapıldı - Kullanıcı: %s", user)
+            return topic_minutes
+        except Exception as e:
+            logger.error("Konu dakika tahmini alınırken hata - Kullanıcı: %s, Hata: %s", user, e, exc_info=True)
+            raise
 
-                        if user_answer == correct_answer:
-                            difficulty_counts[difficulty]["doğru"] += 1
-                        else:
-                            difficulty_counts[difficulty]["yanlış"] += 1
+    def explain_hot_queries(self):
+        return check_query_plans(self.conn)
 
-                except Exception as e:
-                    logger.warning(f"Test verisi işlenirken hata - Kullanıcı: {user}, Hata: {e}")
-                    continue
+    @_track_query(count_rows=False)
+    def get_dashboard_summary(self, user, daily_target_minutes=60):
+        """
+        Dashboard'un ihtiyaç duyduğu tüm toplamları tek seferde döndürür:
+        günlük seriler, konu dakikaları, zorluk dağılımı ve toplam doğru/yanlış.
+        test_results yalnızca hafif kolonlarıyla, answers yalnızca (user, topic)
+        indeksi üzerinden birer kez okunur; hiçbir JSON gövdesi çözülmez.
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(queries.DASHBOARD_RESULTS, (user,))
+            results = cursor.fetchall()
 
-            logger.info(f"Zorluk dağılımı hesaplandı - Kullanıcı: {user}")
-            return difficulty_counts
+            dates = [timestamp[:10] for _, _, timestamp in results]
+            corrects = [correct for correct, _, _ in results]
+            wrongs = [wrong for _, wrong, _ in results]
+            actual_minutes = [min(daily_target_minutes, 15 * (c + w)) for c, w in zip(corrects, wrongs)]
+
+            cursor.execute(queries.TOPIC_MINUTES, (user,))
+            topic_minutes = dict(cursor.fetchall())
+
+            difficulty_stats = {
+                "easy": {"doğru": 0, "yanlış": 0},
+                "medium": {"doğru": 0, "yanlış": 0},
+                "hard": {"doğru": 0, "yanlış": 0}
+            }
+            cursor.execute(queries.DIFFICULTY_BREAKDOWN, (user,))
+            for difficulty, correct, wrong in cursor.fetchall():
+                if difficulty in difficulty_stats:
+                    difficulty_stats[difficulty]["doğru"] = correct
+                    difficulty_stats[difficulty]["yanlış"] = wrong
+
+            logger.info("Dashboard özeti hesaplandı - Kullanıcı: %s, Test: %s", user, len(results))
+            return {
+                "dates": dates,
+                "target_minutes": [daily_target_minutes] * len(results),
+                "actual_minutes": actual_minutes,
+                "topic_data": topic_minutes,
+                "difficulty_stats": difficulty_stats,
+                "correct": sum(corrects),
+                "wrong": sum(wrongs),
+                "test_count": len(results),
+            }
         except Exception as e:
-            logger.error(f"Zorluk dağılımı alınırken hata - Kullanıcı: {user}, Hata: {e}", exc_info=True)
+            logger.error("Dashboard özeti alınırken hata - Kullanıcı: %s, Hata: %s", user, e, exc_info=True)
             raise
 
-    def get_topic_minutes_estimate(self, user):
+    def _topic_stats_drift(self, cursor):
+        expected = {}
+        for result_id, user, test_json in cursor.execute(
+            "SELECT id, user, test_json FROM test_results ORDER BY id"
+        ).fetchall():
+            try:
+                rows = extract_answer_rows(decode_blob(test_json))
+            except Exception as e:
+                logger.warning("Test sonucu doğrulamada atlandı - Test Result ID: %s, Hata: %s", result_id, e)
+                continue
+            for (topic, difficulty), (c, w) in self._count_topic_stats(rows).items():
+                pair = expected.setdefault((user, topic, difficulty), [0, 0])
+                pair[0] += c
+                pair[1] += w
+
+        actual = {
+            (user, topic, difficulty): [correct, wrong]
+            for user, topic, difficulty, correct, wrong in cursor.execute(
+                "SELECT user, topic, difficulty, correct, wrong FROM user_topic_stats"
+            ).fetchall()
+        }
+
+        drift = []
+        for key in list(expected) + [k for k in actual if k not in expected]:
+            exp = expected.get(key, [0, 0])
+            act = actual.get(key, [0, 0])
+            if exp != act:
+                drift.append({
+                    "user": key[0], "topic": key[1], "difficulty": key[2],
+                    "expected_correct": exp[0], "expected_wrong": exp[1],
+                    "actual_correct": act[0], "actual_wrong": act[1],
+                })
+        return expected, drift
+
+    def verify_user_topic_stats(self, rebuild=False):
+        """
+        user_topic_stats tablosunu test_results geçmişinden yeniden hesaplar ve
+        farklılıkları (drift) döndürür. rebuild=True ise tablo yeniden hesaplanan
+        değerlerle değiştirilir; tarama ve yazım aynı işlemde yapılır, arada
+        kaydedilen ya da silinen sonuçlar ezilmez.
+        """
         try:
-            records = self.get_all_test_results(user)
-            topic_minutes = {}
+            if rebuild:
+                with self.transaction() as cursor:
+                    expected, drift = self._topic_stats_drift(cursor)
+                    cursor.execute("DELETE FROM user_topic_stats")
+                    cursor.executemany("""
+                        INSERT INTO user_topic_stats (user, topic, difficulty, correct, wrong)
+                        VALUES (?, ?, ?, ?, ?)
+                    """, [(user, topic, difficulty, c, w) for (user, topic, difficulty), (c, w) in expected.items()])
+                logger.info("user_topic_stats yeniden oluşturuldu - Satır: %s", len(expected))
+            else:
+                expected, drift = self._topic_stats_drift(self.conn.cursor())
 
-            for _, _, test_json, _, _, _ in records:
-                try:
-                    test = json.loads(test_json)
-                    for q in test:
-                        topic = q.get("topic", "Bilinmeyen")
-                        topic_minutes[topic] = topic_minutes.get(topic, 0) + 2  # 1 soru ≈ 2 dk
-                except Exception as e:
-                    logger.warning(f"Test verisi işlenirken hata (dakika tahmini) - Kullanıcı: {user}, Hata: {e}")
-                    continue
+            logger.info("user_topic_stats doğrulandı - Farklılık: %s", len(drift))
+            return drift
+        except Exception as e:
+            logger.error("user_topic_stats doğrulanırken hata: %s", e, exc_info=True)
+            raise
 
-            logger.info(f"Konu dakika tahmini yapıldı - Kullanıcı: {user}")
-            return topic_minutes
+    def reencode_blobs(self, dry_run=False, batch_size=500):
+        """
+        plan_json/test_json kolonlarındaki tüm kayıtları geçerli kodlayıcıyla yeniden
+        yazar. Her kolon için kayıt sayısı, önceki/sonraki bayt toplamı ve tüm
+        gövdeleri çözüp JSON olarak ayrıştırmanın önceki/sonraki süresini döndürür.
+        """
+        try:
+            report = []
+            for table, column in BLOB_COLUMNS:
+                stats = {
+                    "table": table, "column": column, "rows": 0, "rewritten": 0,
+                    "bytes_before": 0, "bytes_after": 0, "read_s_before": 0.0, "read_s_after": 0.0,
+                }
+                last_id = 0
+                while True:
+                    rows = self.conn.execute(
+                        f"SELECT id, {column} FROM {table} WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+                    ).fetchall()
+                    if not rows:
+                        break
+                    last_id = rows[-1][0]
+
+                    start = time.perf_counter()
+                    texts = [decode_blob(value) for _, value in rows]
+                    for text in texts:
+                        if text is not None:
+                            json_codec.loads(text)
+                    stats["read_s_before"] += time.perf_counter() - start
+
+                    encoded = [encode_blob(text) for text in texts]
+
+                    start = time.perf_counter()
+                    for value in encoded:
+                        if value is not None:
+                            json_codec.loads(decode_blob(value))
+                    stats["read_s_after"] += time.perf_counter() - start
+
+                    updates = []
+                    for (row_id, old), new in zip(rows, encoded):
+                        stats["rows"] += 1
+                        stats["bytes_before"] += stored_size(old)
+                        stats["bytes_after"] += stored_size(new)
+                        if new != old:
+                            updates.append((new, row_id))
+                    stats["rewritten"] += len(updates)
+
+                    if updates and not dry_run:
+                        with self.transaction() as cursor:
+                            cursor.executemany(f"UPDATE {table} SET {column} = ? WHERE id = ?", updates)
+
+                report.append(stats)
+                logger.info(
+                    "Kayıtlar yeniden kodlandı - %s.%s, Satır: %s, Bayt: %s -> %s, Deneme: %s",
+                    table, column, stats['rows'], stats['bytes_before'], stats['bytes_after'], dry_run
+                )
+            return report
+        except Exception as e:
+            logger.error("Kayıtlar yeniden kodlanırken hata: %s", e, exc_info=True)
+            raise
+
+    def vacuum(self):
+        try:
+            # VACUUM işlem içinde çalışamaz; boşalan sayfalar ancak bununla dosyadan atılır
+            self.conn.execute("VACUUM")
+            # WAL kipinde VACUUM sonucu önce WAL dosyasına yazılır; ana dosyaya aktarılıp WAL sıfırlanır
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            logger.info("Veritabanı VACUUM tamamlandı.")
         except Exception as e:
-            logger.error(f"Konu dakika tahmini alınırken hata - Kullanıcı: {user}, Hata: {e}", exc_info=True)
+            logger.error("VACUUM sırasında hata: %s", e, exc_info=True)
             raise
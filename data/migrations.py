@@ -0,0 +1,176 @@
+"""
+Sıralı ve idempotent şema göçleri.
+
+Her göç bir sürüm numarası ile kaydedilir; uygulanan sürümler schema_version
+tablosunda tutulur ve uygulama açılışında eksik olanlar sırayla çalıştırılır.
+Göç adımları tekrar çalıştırılsa da aynı sonucu verecek şekilde yazılmalıdır.
+"""
+from datetime import datetime
+from data import queries
+from data.codec import decode_blob
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+MIGRATIONS = []
+
+
+def migration(version, description):
+    def register(fn):
+        MIGRATIONS.append((version, description, fn))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return register
+
+
+@migration(1, "plans/tests (user, created_at) ve test_results (user, timestamp) indeksleri")
+def _add_user_time_indexes(cursor):
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_plans_user_created ON plans (user, created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tests_user_created ON tests (user, created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_test_results_user_timestamp ON test_results (user, timestamp)")
+
+
+@migration(2, "answers tablosunun test_results geçmişinden doldurulması")
+def _backfill_answers(cursor):
+    # db_manager bu modülü içe aktardığı için döngüyü önlemek adına burada içe aktarılır
+    from data.db_manager import DBManager, extract_answer_rows
+
+    pending = cursor.execute("""
+        SELECT id, user, test_json, timestamp FROM test_results
+        WHERE id NOT IN (SELECT DISTINCT result_id FROM answers)
+        ORDER BY id
+    """).fetchall()
+
+    migrated = 0
+    for result_id, user, test_json, timestamp in pending:
+        try:
+            rows = extract_answer_rows(decode_blob(test_json))
+        except Exception as e:
+            logger.warning("Test sonucu answers tablosuna aktarılamadı - Test Result ID: %s, Hata: %s", result_id, e)
+            continue
+        DBManager._insert_answers(cursor, user, result_id, timestamp, rows)
+        migrated += 1
+    logger.info("answers tablosu dolduruldu - Aktarılan test sonucu: %s", migrated)
+
+
+@migration(3, "user_topic_stats tablosunun answers tablosundan hesaplanması")
+def _rebuild_user_topic_stats(cursor):
+    cursor.execute("DELETE FROM user_topic_stats")
+    cursor.execute("""
+        INSERT INTO user_topic_stats (user, topic, difficulty, correct, wrong)
+        SELECT user, COALESCE(topic, 'GENEL'), COALESCE(difficulty, 'medium'), SUM(correct), SUM(1 - correct)
+        FROM answers
+        WHERE correct IS NOT NULL
+        GROUP BY 1, 2, 3
+        ORDER BY MIN(id)
+    """)
+
+
+def _add_column_if_missing(cursor, table, column, declaration):
+    columns = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})").fetchall()}
+    if column not in columns:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+
+
+@migration(4, "plans ve test_results için özet kolonları (gün/soru sayısı, konu listesi)")
+def _add_summary_columns(cursor):
+    # db_manager bu modülü içe aktardığı için döngüyü önlemek adına burada içe aktarılır
+    from data.db_manager import extract_answer_rows, summarize_answer_rows, summarize_plan
+
+    _add_column_if_missing(cursor, "plans", "day_count", "INTEGER")
+    _add_column_if_missing(cursor, "plans", "topics", "TEXT")
+    _add_column_if_missing(cursor, "test_results", "question_count", "INTEGER")
+    _add_column_if_missing(cursor, "test_results", "topics", "TEXT")
+
+    plans = cursor.execute("SELECT id, plan_json FROM plans WHERE day_count IS NULL ORDER BY id").fetchall()
+    for plan_id, plan_json in plans:
+        try:
+            day_count, topics = summarize_plan(decode_blob(plan_json))
+        except Exception as e:
+            logger.warning("Plan özeti çıkarılamadı - Plan ID: %s, Hata: %s", plan_id, e)
+            continue
+        cursor.execute("UPDATE plans SET day_count = ?, topics = ? WHERE id = ?", (day_count, topics, plan_id))
+
+    results = cursor.execute(
+        "SELECT id, test_json FROM test_results WHERE question_count IS NULL ORDER BY id"
+    ).fetchall()
+    for result_id, test_json in results:
+        try:
+            question_count, topics = summarize_answer_rows(extract_answer_rows(decode_blob(test_json)))
+        except Exception as e:
+            logger.warning("Test sonucu özeti çıkarılamadı - Test Result ID: %s, Hata: %s", result_id, e)
+            continue
+        cursor.execute(
+            "UPDATE test_results SET question_count = ?, topics = ? WHERE id = ?", (question_count, topics, result_id)
+        )
+    logger.info("Özet kolonları dolduruldu - Plan: %s, Test sonucu: %s", len(plans), len(results))
+
+
+def run_migrations(cursor):
+    """
+    Henüz uygulanmamış göçleri sürüm sırasıyla çalıştırır. Çağıranın açtığı
+    işlem içinde çalışır; bir adım hata verirse işlemle birlikte geri alınır.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TEXT
+        )
+    """)
+    applied = {row[0] for row in cursor.execute("SELECT version FROM schema_version").fetchall()}
+
+    for version, description, fn in MIGRATIONS:
+        if version in applied:
+            continue
+        logger.info("Şema göçü uygulanıyor: v%s - %s", version, description)
+        fn(cursor)
+        cursor.execute(
+            "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+            (version, description, datetime.now().isoformat())
+        )
+
+
+def current_version(cursor):
+    row = cursor.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+# Kullanıcıya göre listeleme yapan sık sorgular ve kullanmaları beklenen indeksler:
+# (ad, sorgu, indeks, geçici sıralamaya izin). Konuları ilk görülme sırasına koyan
+# GROUP BY sorguları grupları (kullanıcının konu sayısı kadar satır) geçici B-tree ile
+# sıralar; bu sıralama satır sayısıyla değil konu sayısıyla büyüdüğü için kabul edilir.
+HOT_QUERIES = [
+    ("get_latest_plan", queries.LATEST_PLAN, "idx_plans_user_created", False),
+    ("get_all_plans", queries.ALL_PLANS, "idx_plans_user_created", False),
+    ("get_all_tests_from_tests", queries.ALL_TESTS, "idx_tests_user_created", False),
+    ("get_all_test_results", queries.ALL_TEST_RESULTS, "idx_test_results_user_timestamp", False),
+    ("get_all_test_results_specific", queries.ALL_TEST_RESULTS_SPECIFIC, "idx_test_results_user_timestamp", False),
+    ("get_dashboard_summary (sonuçlar)", queries.DASHBOARD_RESULTS, "idx_test_results_user_timestamp", False),
+    ("get_topic_minutes_estimate", queries.TOPIC_MINUTES, "idx_answers_user_topic", True),
+    ("get_topic_stats", queries.TOPIC_STATS, "sqlite_autoindex_user_topic_stats_1", True),
+    ("get_difficulty_breakdown", queries.DIFFICULTY_BREAKDOWN, "sqlite_autoindex_user_topic_stats_1", False),
+    ("get_plan_summaries", queries.PLAN_SUMMARIES, "idx_plans_user_created", False),
+    ("get_test_result_summaries", queries.TEST_RESULT_SUMMARIES, "idx_test_results_user_timestamp", False),
+]
+
+
+def check_query_plans(conn):
+    """
+    HOT_QUERIES için EXPLAIN QUERY PLAN çıktısını inceler. Her sorgu için
+    beklenen indeksin kullanılıp kullanılmadığını, sıralama için geçici
+    B-tree gerekip gerekmediğini ve buna izin verilip verilmediğini döndürür.
+    """
+    report = []
+    for name, sql, expected_index, allow_temp_sort in HOT_QUERIES:
+        params = ("__plan_check__",) * sql.count("?")
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+        report.append({
+            "query": name,
+            "expected_index": expected_index,
+            "uses_index": any(expected_index in step for step in plan),
+            "temp_sort": any("TEMP B-TREE FOR ORDER BY" in step for step in plan),
+            "temp_sort_allowed": allow_temp_sort,
+            "plan": plan,
+        })
+    return report
@@ -0,0 +1,90 @@
+"""
+DBManager'ın sık çalıştırdığı sorgular. Aynı metin hem DBManager'da hem
+data.migrations.HOT_QUERIES'in EXPLAIN QUERY PLAN kontrolünde kullanılır;
+böylece kontrol edilen plan çalışan sorgununkiyle aynıdır.
+"""
+
+LATEST_PLAN = """
+    SELECT plan_json, created_at FROM plans
+    WHERE user = ?
+    ORDER BY created_at DESC LIMIT 1
+"""
+
+ALL_PLANS = """
+    SELECT id, plan_json, created_at FROM plans
+    WHERE user = ?
+    ORDER BY created_at DESC
+"""
+
+ALL_TESTS = """
+    SELECT id, test_json, created_at FROM tests
+    WHERE user = ?
+    ORDER BY created_at DESC
+"""
+
+ALL_TEST_RESULTS = """
+    SELECT id, user, test_json, correct, wrong, timestamp FROM test_results
+    WHERE user = ?
+    ORDER BY timestamp
+"""
+
+ALL_TEST_RESULTS_SPECIFIC = """
+    SELECT id, test_json, correct, wrong, timestamp FROM test_results
+    WHERE user = ?
+    ORDER BY timestamp
+"""
+
+DASHBOARD_RESULTS = """
+    SELECT correct, wrong, timestamp FROM test_results
+    WHERE user = ?
+    ORDER BY timestamp
+"""
+
+TOPIC_MINUTES = """
+    SELECT COALESCE(topic, 'Bilinmeyen'), COUNT(*) * 2  -- 1 soru ≈ 2 dk
+    FROM answers
+    WHERE user = ?
+    GROUP BY 1  -- NULL konu ile 'Bilinmeyen' konusu aynı satırda toplanır
+    ORDER BY MIN(id)
+"""
+
+# Konuların ilk görülme sırası answers'tan okunur: kullanıcının o konudaki en eski
+# sorusu. Sayaç satırlarının rowid'i silme sonrasında geçmişi yansıtmaz. Konusu
+# olmayan sorular "GENEL" sayıldığından o konu için NULL satırlar da aranır; her iki
+# arama da (user, topic) indeksinde tek adımdır.
+TOPIC_FIRST_SEEN = """(
+    SELECT MIN(id) FROM (
+        SELECT MIN(a.id) AS id FROM answers a WHERE a.user = s.user AND a.topic = s.topic
+        UNION ALL
+        SELECT MIN(a.id) FROM answers a WHERE s.topic = 'GENEL' AND a.user = s.user AND a.topic IS NULL
+    )
+)"""
+
+TOPIC_STATS = f"""
+    SELECT s.topic, SUM(s.correct), SUM(s.wrong)
+    FROM user_topic_stats s
+    WHERE s.user = ?
+    GROUP BY s.topic
+    ORDER BY {TOPIC_FIRST_SEEN}
+"""
+
+DIFFICULTY_BREAKDOWN = """
+    SELECT difficulty, SUM(correct), SUM(wrong)
+    FROM user_topic_stats
+    WHERE user = ?
+    GROUP BY difficulty
+"""
+
+PLAN_SUMMARIES = """
+    SELECT id, created_at, day_count, topics FROM plans
+    WHERE user = ? AND (created_at, id) < (?, ?)
+    ORDER BY created_at DESC, id DESC
+    LIMIT ?
+"""
+
+TEST_RESULT_SUMMARIES = """
+    SELECT id, timestamp, correct, wrong, question_count, topics FROM test_results
+    WHERE user = ? AND (timestamp, id) < (?, ?)
+    ORDER BY timestamp DESC, id DESC
+    LIMIT ?
+"""
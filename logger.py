@@ -1,16 +1,132 @@
+"""
+Uygulama logları. Çağıran iş parçacığı kaydı yalnızca kuyruğa bırakır; mesajın
+oluşturulması, biçimlendirme ve dosya/konsol yazımı arka plandaki QueueListener'da
+yapılır.
+
+Modüller get_logger(__name__) ile "EduWiseAI.<modül>" alt logger'ını kullanır ve
+mesajı %-biçiminde verir: logger.info("Kullanıcı: %s", user). Seviye kapalıysa
+mesaj hiç oluşturulmaz.
+
+Ortam değişkenleri:
+- EDUWISE_LOG_LEVEL: genel seviye (varsayılan DEBUG; konsola INFO ve üstü yazılır)
+- EDUWISE_LOG_LEVELS: modül/paket bazında seviye, ör. "data=WARNING,logic.gemini_api=DEBUG"
+- EDUWISE_LOG_FORMAT: dosya biçimi, "text" (varsayılan) ya da "json" (JSON satırları)
+- EDUWISE_LOG_MAX_CHARS: bir mesajın en fazla uzunluğu (varsayılan 2000), fazlası kırpılır
+"""
+import atexit
+import contextvars
+import datetime
+import json
 import logging
 import os
-from logging.handlers import TimedRotatingFileHandler
+import queue
+import uuid
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 
 LOG_DIR = "logs"
 os.makedirs(LOG_DIR, exist_ok=True)
 
-logger = logging.getLogger("EduWiseAI")
-logger.setLevel(logging.DEBUG)
+APP_LOGGER = "EduWiseAI"
+CONTEXT_FIELDS = ("user", "page", "request_id")
+MAX_MESSAGE_CHARS = int(os.getenv("EDUWISE_LOG_MAX_CHARS", 2000))
+
+# Kuyrukta beklerken değişemeyecek argüman türleri; diğerleri kuyruğa girmeden metne çevrilir
+_STABLE_ARG_TYPES = (str, int, float, bool, type(None), bytes, BaseException, datetime.date)
+
+_context = contextvars.ContextVar("eduwise_log_context", default={})
+
+logger = logging.getLogger(APP_LOGGER)
+logger.setLevel(os.getenv("EDUWISE_LOG_LEVEL", "DEBUG").upper())
 logger.propagate = False
 
 log_file = os.path.join(LOG_DIR, "app.log")
 
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Modüle ait alt logger; kayıtlar uygulama logger'ının kuyruğuna iletilir.
+    """
+    return logging.getLogger(f"{APP_LOGGER}.{name}")
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+@contextmanager
+def log_context(**fields):
+    """
+    Blok içinde (ve içinden kopyalanan bağlamla başlatılan iş parçacıklarında)
+    yazılan kayıtlara user, page, request_id gibi alanları ekler.
+    """
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+class _ContextFilter(logging.Filter):
+    def filter(self, record):
+        for name, value in _context.get().items():
+            if not hasattr(record, name):
+                setattr(record, name, value)
+        return True
+
+
+class _AsyncQueueHandler(QueueHandler):
+    def prepare(self, record):
+        # Varsayılan prepare mesajı burada biçimlendirir; bu iş dinleyiciye bırakılır
+        args = record.args
+        if args and (isinstance(args, dict) or not all(isinstance(value, _STABLE_ARG_TYPES) for value in args)):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class _CappingQueueListener(QueueListener):
+    def prepare(self, record):
+        message = record.getMessage()
+        if len(message) > MAX_MESSAGE_CHARS:
+            message = f"{message[:MAX_MESSAGE_CHARS]}… (+{len(message) - MAX_MESSAGE_CHARS} karakter kırpıldı)"
+        record.msg = message
+        record.args = None
+        return record
+
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        duration = getattr(record, "duration", None)
+        if duration is not None:
+            entry["duration_ms"] = round(duration * 1000, 2)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _apply_module_levels(spec: str):
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, level = item.partition("=")
+        try:
+            get_logger(name.strip()).setLevel(level.strip().upper())
+        except ValueError:
+            logger.warning("EDUWISE_LOG_LEVELS içinde geçersiz seviye: %s", item)
+
+
+formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+
 file_handler = TimedRotatingFileHandler(
     log_file,
     when="midnight",
@@ -21,14 +137,41 @@ file_handler = TimedRotatingFileHandler(
 )
 file_handler.setLevel(logging.DEBUG)
 file_handler.suffix = "%Y-%m-%d"
-
-formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-file_handler.setFormatter(formatter)
+if os.getenv("EDUWISE_LOG_FORMAT", "text").lower() == "json":
+    file_handler.setFormatter(JsonLinesFormatter())
+else:
+    file_handler.setFormatter(formatter)
 
 console_handler = logging.StreamHandler()
 console_handler.setLevel(logging.INFO)
 console_handler.setFormatter(formatter)
 
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
+log_queue = queue.SimpleQueue()
+queue_handler = _AsyncQueueHandler(log_queue)
+queue_handler.addFilter(_ContextFilter())
+logger.addHandler(queue_handler)
+
+listener = _CappingQueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+listener.start()
+
+
+def _stop_listener():
+    listener.stop()
+
+
+def _restart_listener_in_child():
+    # fork edilen süreç QueueHandler'ı devralır ama dinleyici iş parçacığını devralmaz;
+    # yeni kuyruk ve dinleyici olmadan alt süreçteki kayıtlar sessizce kaybolur
+    global log_queue, listener
+    log_queue = queue.SimpleQueue()
+    queue_handler.queue = log_queue
+    listener = _CappingQueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+
+
+# Çıkışta kuyrukta kalan kayıtlar yazılır
+atexit.register(_stop_listener)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listener_in_child)
 
+_apply_module_levels(os.getenv("EDUWISE_LOG_LEVELS", ""))
@@ -0,0 +1,249 @@
+"""
+Konu analizlerinin kolon tabanlı (NumPy) hâli.
+
+Bir kullanıcının veya bir kohortun tüm cevapları bir kez kolonlara
+yüklenir: kullanıcı kodu, konu kodu ve doğru/yanlış sayaçları.
+Konu başına sayaçlar np.bincount ile tek geçişte çıkarılır; başarı oranı,
+zorluk bandı ve ters başarı ağırlıkları dizi işlemleriyle hesaplanır.
+
+Çıktılar topic_analyzer.analyze_topic_stats ve
+performance_analyzer.build_recommendations ile birebir aynıdır: konular ilk
+görüldükleri sırayla işlenir, yuvarlama ve ağırlık toplamı Python float'larıyla
+aynı sırada yapılır, sıralama yuvarlanmış başarı oranına göre kararlıdır.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from logger import get_logger
+from utils import json_codec, metrics
+
+logger = get_logger(__name__)
+
+JSON_DECODE_SECONDS = metrics.histogram(
+    "eduwise_analyzer_json_decode_seconds", "Analizlerde bir çağrıdaki test JSON'larını çözme süresi (toplam)"
+)
+JSON_DECODE_BYTES = metrics.counter(
+    "eduwise_analyzer_json_decode_bytes_total", "Analizlerde çözülen test JSON'larının toplam boyutu"
+)
+
+
+class AnswerColumns:
+    """
+    Cevapların kolon dizileri. Her satır bir (kullanıcı, konu) hücresidir ve o hücredeki
+    doğru/yanlış sayısını taşır; JSON'dan yüklenirken her cevap tek satırdır.
+    users/topics kodların karşılık geldiği değerlerdir ve ilk görülme sırasındadır.
+    """
+    __slots__ = ("users", "topics", "user_codes", "topic_codes", "correct", "wrong")
+
+    def __init__(self, users, topics, user_codes, topic_codes, correct, wrong):
+        self.users = users
+        self.topics = topics
+        self.user_codes = user_codes
+        self.topic_codes = topic_codes
+        self.correct = correct
+        self.wrong = wrong
+
+    @property
+    def answer_count(self):
+        return int(self.correct.sum() + self.wrong.sum())
+
+    @classmethod
+    def from_test_jsons(cls, test_jsons, user=None, keep_partial=False):
+        """
+        Test JSON'larını kolonlara çevirir. Konusu olmayan sorular "GENEL" sayılır.
+        Bozuk JSON'lar atlanır. user_answer ya da correct_answer eksikse KeyError
+        fırlatılır; keep_partial=True ise kayıt o sorudan itibaren bırakılır ve
+        önceki soruları sayılmış olarak kalır (analyze_test_performance davranışı).
+        """
+        topic_index = {}
+        topic_codes = []
+        hits = []
+        decode_seconds = 0.0
+        decoded_bytes = 0
+        for test_json in test_jsons:
+            started = time.perf_counter()
+            try:
+                test_data = json_codec.loads(test_json)
+            except json_codec.JSONDecodeError as e:
+                logger.error("Test JSON'u çözülemedi, kayıt atlandı: %s", e)
+                continue
+            finally:
+                decode_seconds += time.perf_counter() - started
+                decoded_bytes += len(test_json)
+
+            try:
+                for q in test_data:
+                    topic = q.get("topic", "GENEL")
+                    is_correct = q["user_answer"] == q["correct_answer"]
+                    topic_codes.append(topic_index.setdefault(topic, len(topic_index)))
+                    hits.append(is_correct)
+            except KeyError as e:
+                if not keep_partial:
+                    raise
+                logger.error("Test kaydında eksik anahtar: %s, kaydın kalanı atlandı.", e)
+
+        JSON_DECODE_SECONDS.observe(decode_seconds)
+        JSON_DECODE_BYTES.inc(decoded_bytes)
+
+        correct = np.asarray(hits, dtype=np.int64)
+        return cls(
+            users=[user],
+            topics=list(topic_index),
+            user_codes=np.zeros(len(hits), dtype=np.int32),
+            topic_codes=np.asarray(topic_codes, dtype=np.int32),
+            correct=correct,
+            wrong=1 - correct,
+        )
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        İlk görülme sırasındaki (user, topic, correct, wrong) satırlarından kolonları oluşturur.
+        """
+        if rows:
+            users, topics, correct, wrong = zip(*rows)
+        else:
+            users, topics, correct, wrong = (), (), (), ()
+        user_codes, user_values = pd.factorize(pd.Series(users, dtype=object), sort=False)
+        topic_codes, topic_values = pd.factorize(pd.Series(topics, dtype=object), sort=False)
+        return cls(
+            users=list(user_values),
+            topics=list(topic_values),
+            user_codes=user_codes.astype(np.int32),
+            topic_codes=topic_codes.astype(np.int32),
+            correct=np.asarray(correct, dtype=np.int64),
+            wrong=np.asarray(wrong, dtype=np.int64),
+        )
+
+
+def _bincount(codes, weights, size):
+    # Ağırlıklı bincount float64 döndürür; sayaçlar 2**53'ün çok altında olduğundan tam sayıya çevirmek kayıpsızdır
+    return np.bincount(codes, weights=weights, minlength=size).astype(np.int64)
+
+
+def topic_counts(columns):
+    """
+    Konu başına (doğru, yanlış) sayaç dizileri; sıra columns.topics ile aynıdır.
+    """
+    size = len(columns.topics)
+    return (
+        _bincount(columns.topic_codes, columns.correct, size),
+        _bincount(columns.topic_codes, columns.wrong, size),
+    )
+
+
+def user_topic_counts(columns):
+    """
+    Kullanıcı x konu boyutunda (doğru, yanlış) sayaç matrisleri.
+    """
+    shape = (len(columns.users), len(columns.topics))
+    cells = columns.user_codes.astype(np.int64) * shape[1] + columns.topic_codes
+    return (
+        _bincount(cells, columns.correct, shape[0] * shape[1]).reshape(shape),
+        _bincount(cells, columns.wrong, shape[0] * shape[1]).reshape(shape),
+    )
+
+
+def _difficulty_bands(success_rates):
+    return np.select([success_rates >= 0.8, success_rates >= 0.5], ["hard", "medium"], "easy")
+
+
+def _analysis(topics, correct, wrong, min_questions):
+    total = correct + wrong
+    keep = np.flatnonzero(total >= min_questions)
+    if len(keep) < len(topics):
+        logger.debug("%s konu yetersiz veri nedeniyle atlandı.", len(topics) - len(keep))
+
+    success_rates = correct[keep] / total[keep]
+    inverse_scores = (1 - success_rates).tolist()
+    levels = _difficulty_bands(success_rates).tolist()
+    # Toplam ve yuvarlama Python float'larıyla, eski döngüyle aynı sırada yapılır
+    total_inverse_success = sum(inverse_scores)
+    percents = [round(rate * 100, 2) for rate in success_rates.tolist()]
+
+    analysis = [
+        {
+            "topic": topics[index],
+            "success_rate": percent,
+            "difficulty": level,
+            "weight": round(inverse / total_inverse_success, 3) if total_inverse_success > 0 else 0,
+        }
+        for index, percent, level, inverse in zip(keep.tolist(), percents, levels, inverse_scores)
+    ]
+    analysis.sort(key=lambda x: x["success_rate"])
+    return analysis
+
+
+def _recommendations(topics, correct, wrong):
+    total = correct + wrong
+    success_rates = np.divide(correct, total, out=np.zeros(len(topics)), where=total > 0)
+    return {
+        topic: {
+            "zorluk": level,
+            "doğru": c,
+            "yanlış": w,
+            "başarı_oranı": round(rate * 100, 1),
+        }
+        for topic, level, c, w, rate in zip(
+            topics, _difficulty_bands(success_rates).tolist(), correct.tolist(), wrong.tolist(), success_rates.tolist()
+        )
+    }
+
+
+def analyze_columns(columns, min_questions=5):
+    """
+    Tüm kolonlar için analyze_topic_stats çıktısının aynısını üretir.
+    """
+    try:
+        analysis = _analysis(columns.topics, *topic_counts(columns), min_questions)
+        logger.info("analyze_columns tamamlandı: %s cevap, %s konu.", columns.answer_count, len(analysis))
+        return analysis
+    except Exception as e:
+        logger.error("analyze_columns sırasında hata: %s", e, exc_info=True)
+        raise
+
+
+def recommend_columns(columns):
+    """
+    Tüm kolonlar için build_recommendations çıktısının aynısını üretir.
+    """
+    try:
+        return _recommendations(columns.topics, *topic_counts(columns))
+    except Exception as e:
+        logger.error("recommend_columns sırasında hata: %s", e, exc_info=True)
+        raise
+
+
+def _user_topic_order(columns):
+    """
+    Her kullanıcı için konu kodlarını, o kullanıcının cevaplarında ilk görüldükleri sırayla döndürür.
+    """
+    size = len(columns.topics)
+    cells = columns.user_codes.astype(np.int64) * size + columns.topic_codes
+    unique_cells, first_seen = np.unique(cells, return_index=True)
+    user_of_cell = unique_cells // size
+    order = np.lexsort((first_seen, user_of_cell))
+    user_of_cell, topic_of_cell = user_of_cell[order], (unique_cells % size)[order]
+    bounds = np.searchsorted(user_of_cell, np.arange(len(columns.users) + 1))
+    return [topic_of_cell[bounds[i]:bounds[i + 1]] for i in range(len(columns.users))]
+
+
+def analyze_columns_by_user(columns, min_questions=5):
+    """
+    Kohorttaki her kullanıcı için ayrı ayrı analyze_topic_stats çıktısı: {user: analysis}.
+    """
+    try:
+        correct, wrong = user_topic_counts(columns)
+        result = {}
+        for user_code, topic_order in enumerate(_user_topic_order(columns)):
+            topics = [columns.topics[code] for code in topic_order.tolist()]
+            result[columns.users[user_code]] = _analysis(
+                topics, correct[user_code, topic_order], wrong[user_code, topic_order], min_questions
+            )
+        logger.info("analyze_columns_by_user tamamlandı: %s kullanıcı, %s cevap.", len(result), columns.answer_count)
+        return result
+    except Exception as e:
+        logger.error("analyze_columns_by_user sırasında hata: %s", e, exc_info=True)
+        raise
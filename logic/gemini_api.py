@@ -1,35 +1,399 @@
 import os
+import time
+import contextvars
+import sqlite3
+import threading
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
-from logger import logger  # logger'ı ekledik
-import streamlit as st
-# Ortak istemci
-load_dotenv()
-client = genai.Client(
-    api_key=os.getenv("GEMINI_API_KEY"),
+from utils import json_codec, metrics, profiling
+from logic.rate_limiter import AdaptiveConcurrency, CircuitBreaker, GeminiScheduler, RetryPolicy
+from logic.gemini_backends import (
+    DEFAULT_RECORD_PATH, FakeBackend, GeminiRequest, RecordingBackend, ReplayBackend, fake_backend_from_env, request_key
 )
+from logger import get_logger
+
+logger = get_logger(__name__)
 
+load_dotenv()
 
-def call_gemini_json_response(prompt_text: str, system_instruction: str, output_schema: dict, model_name: str = "gemini-2.5-flash-lite") -> str:
+
+class ResponseCache:
     """
-    Gemini API ile JSON formatında çıktı üretir.
+    Gemini yanıtları için SQLite tabanlı, içerik adresli önbellek.
+    Anahtar (model_name, prompt_text, system_instruction, output_schema) özetidir.
+    Süresi (TTL) dolan kayıtlar atılır; kayıt sayısı veya toplam boyut aşılınca
+    en uzun süredir erişilmeyen (LRU) kayıtlar silinir.
     """
+
+    def __init__(self, db_path: str = "data/llm_cache.db", ttl_seconds: int = 24 * 3600,
+                 max_entries: int = 5000, max_bytes: int = 50 * 1024 * 1024):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        try:
+            if os.path.dirname(db_path):
+                os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS response_cache (
+                    key TEXT PRIMARY KEY,
+                    model TEXT,
+                    response TEXT,
+                    size INTEGER,
+                    created_at REAL,
+                    last_access REAL
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_response_cache_last_access ON response_cache (last_access)")
+            self.conn.commit()
+            logger.info("Yanıt önbelleği hazır: %s", db_path)
+        except Exception as e:
+            logger.error("Yanıt önbelleği oluşturulurken hata: %s", e, exc_info=True)
+            raise
+
+    @staticmethod
+    def make_key(model_name: str, prompt_text: str, system_instruction: str, output_schema: dict) -> str:
+        # Kayıt/geri oynatma arka uçlarıyla aynı anahtar
+        return request_key(model_name, prompt_text, system_instruction, output_schema)
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT response, created_at FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            response, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self.conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                self.conn.commit()
+                self.misses += 1
+                self.evictions += 1
+                return None
+
+            self.conn.execute("UPDATE response_cache SET last_access = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            self.hits += 1
+            return response
+
+    def set(self, key: str, model_name: str, response: str):
+        now = time.time()
+        with self._lock:
+            self.conn.execute("""
+                INSERT OR REPLACE INTO response_cache (key, model, response, size, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (key, model_name, response, len(response.encode("utf-8")), now, now))
+            self._evict(now)
+            self.conn.commit()
+
+    def _evict(self, now: float):
+        cursor = self.conn.execute("DELETE FROM response_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        self.evictions += cursor.rowcount
+
+        count, total_bytes = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM response_cache"
+        ).fetchone()
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        # En eski erişilen kayıtlardan başlayarak sınırlara inene kadar sil
+        stale_keys = []
+        for key, size in self.conn.execute("SELECT key, size FROM response_cache ORDER BY last_access ASC"):
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            stale_keys.append((key,))
+            count -= 1
+            total_bytes -= size
+
+        self.conn.executemany("DELETE FROM response_cache WHERE key = ?", stale_keys)
+        self.evictions += len(stale_keys)
+
+    def clear(self):
+        with self._lock:
+            self.conn.execute("DELETE FROM response_cache")
+            self.conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, total_bytes = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM response_cache"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": total_bytes,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Önbellek isteğe bağlıdır: GEMINI_CACHE_ENABLED=1 ile ya da enable_response_cache() ile açılır
+response_cache = None
+
+
+def enable_response_cache(**kwargs) -> ResponseCache:
+    global response_cache
+    response_cache = ResponseCache(**kwargs)
+    return response_cache
+
+
+def disable_response_cache():
+    global response_cache
+    response_cache = None
+
+
+if os.getenv("GEMINI_CACHE_ENABLED", "").lower() in ("1", "true", "yes"):
+    enable_response_cache(
+        db_path=os.getenv("GEMINI_CACHE_PATH", "data/llm_cache.db"),
+        ttl_seconds=int(os.getenv("GEMINI_CACHE_TTL", 24 * 3600)),
+        max_entries=int(os.getenv("GEMINI_CACHE_MAX_ENTRIES", 5000)),
+    )
+
+
+def _copy_error(error: BaseException) -> BaseException:
+    # Aynı hata nesnesi birden çok iş parçacığında fırlatılırsa traceback'ler üst üste biner;
+    # her bekleyene tipini ve alanlarını koruyan ayrı bir kopya verilir
     try:
-        logger.info(f"call_gemini_json_response çağrıldı, model: {model_name}")
+        clone = type(error).__new__(type(error), *error.args)
+        clone.__dict__.update(vars(error))
+        return clone
+    except Exception:
+        return error
+
+
+class _Flight:
+    """
+    Yürütülmekte olan tek bir isteğin yanıt parçaları. Parçalar geldikçe eklenir;
+    bekleyen her çağıran hepsini baştan, kendi zaman aşımıyla okur.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.cond = threading.Condition()
+
+    def publish(self, text: str):
+        with self.cond:
+            self.chunks.append(text)
+            self.cond.notify_all()
 
+    def finish(self, error: BaseException = None):
+        with self.cond:
+            self.done = True
+            self.error = error
+            self.cond.notify_all()
+
+    def iter_chunks(self, timeout: float = None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        position = 0
+        while True:
+            with self.cond:
+                while position >= len(self.chunks) and not self.done:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"Gemini yanıtı {timeout} sn içinde tamamlanmadı")
+                    self.cond.wait(remaining)
+                new_chunks = self.chunks[position:]
+                position = len(self.chunks)
+                finished = self.done and position == len(self.chunks)
+                error = self.error
+            yield from new_chunks
+            if finished:
+                if error is not None:
+                    raise _copy_error(error) from error
+                return
+
+
+class SingleFlight:
+    """
+    Aynı imzalı eşzamanlı istekleri tek isteğe indirger. İlk çağrı isteği arka planda
+    başlatır; istek sürerken gelen aynı anahtarlı çağrılar yeni istek açmak yerine
+    aynı yanıt akışını okur. İstek, bekleyenlerin hepsi zaman aşımına uğrasa da
+    tamamlanır (sonucu varsa önbelleğe yazılır); bittiğinde anahtar serbest kalır.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.started = 0
+        self.coalesced = 0
+        self.timeouts = 0
+
+    def join(self, key: str, produce, on_done=None) -> tuple:
+        """
+        key için yürüyen isteğe katılır, yoksa produce() üretecini arka planda başlatır.
+        (flight, leader) döndürür; on_done yalnızca isteği başlatan çağrınınki kullanılır.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.started += 1
+            else:
+                self.coalesced += 1
+
+        if leader:
+            # Log bağlamı (kullanıcı, sayfa, istek kimliği) arka plan isteğine taşınır
+            context = contextvars.copy_context()
+            threading.Thread(
+                target=context.run, args=(self._run, key, flight, produce, on_done),
+                name=f"gemini-flight-{key[:8]}", daemon=True
+            ).start()
+        return flight, leader
+
+    def _run(self, key: str, flight: _Flight, produce, on_done):
+        try:
+            # İsteği başlatan sayfa profilleniyorsa bu iş parçacığı da örneklenir
+            with profiling.run_thread():
+                for text in produce():
+                    flight.publish(text)
+        except BaseException as e:
+            flight.finish(e)
+        else:
+            flight.finish()
+            if on_done is not None:
+                try:
+                    on_done("".join(flight.chunks))
+                except Exception as e:
+                    logger.warning("Tamamlanan Gemini yanıtı işlenemedi: %s", e)
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+    def stream(self, key: str, produce, timeout: float = None, on_done=None):
+        """
+        Yanıt metni parçalarını döndüren üreteç; timeout bu çağıranın toplam bekleme süresidir.
+        """
+        flight, leader = self.join(key, produce, on_done)
+        if not leader:
+            logger.info("Aynı Gemini isteği zaten yürütülüyor, yanıtı paylaşılacak (%s)", key[:8])
+        try:
+            yield from flight.iter_chunks(timeout)
+        except TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise
+
+    def stats(self) -> dict:
+        with self._lock:
+            in_flight = len(self._flights)
+        return {
+            "started": self.started,
+            "coalesced": self.coalesced,
+            "timeouts": self.timeouts,
+            "in_flight": in_flight,
+        }
+
+
+single_flight = SingleFlight()
+
+# Çağıran başına varsayılan bekleme süresi (saniye); boş ise sınırsız
+DEFAULT_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", 0)) or None
+
+
+def _request_text_stream(prompt_text: str, system_instruction: str, output_schema: dict, model_name: str,
+                         cache=None, cache_key: str = None, timeout: float = None):
+    """
+    İsteği single-flight üzerinden yapar: aynı imzalı eşzamanlı çağrılar tek Gemini isteğini paylaşır.
+    İsteği başlatan çağrı önbellek verdiyse tamamlanan yanıt önbelleğe yazılır.
+    """
+    key = cache_key or ResponseCache.make_key(model_name, prompt_text, system_instruction, output_schema)
+    on_done = None
+    if cache is not None:
+        def on_done(output):
+            _store_in_cache(cache, key, model_name, output)
+
+    return single_flight.stream(
+        key,
+        lambda: _stream_gemini_text(prompt_text, system_instruction, output_schema, model_name),
+        timeout=DEFAULT_TIMEOUT if timeout is None else timeout,
+        on_done=on_done,
+    )
+
+
+def _env_number(name: str, default, cast=int):
+    value = os.getenv(name)
+    return cast(value) if value else default
+
+
+# İstemci tarafı kota ve dayanıklılık ayarları (RPM/TPM boş = sınırsız)
+scheduler = GeminiScheduler(
+    rpm=_env_number("GEMINI_RPM", None),
+    tpm=_env_number("GEMINI_TPM", None),
+    concurrency=AdaptiveConcurrency(
+        initial=_env_number("GEMINI_CONCURRENCY", 8),
+        maximum=_env_number("GEMINI_MAX_CONCURRENCY", 16),
+        latency_target=_env_number("GEMINI_LATENCY_TARGET", None, float),
+    ),
+    retry=RetryPolicy(max_attempts=_env_number("GEMINI_MAX_ATTEMPTS", 4)),
+    breaker=CircuitBreaker(
+        failure_threshold=_env_number("GEMINI_BREAKER_FAILURES", 5),
+        reset_timeout=_env_number("GEMINI_BREAKER_RESET", 30.0, float),
+    ),
+)
+
+# Girdi token tahmini için kaba oran; gerçek sayı yanıttaki usage_metadata ile düzeltilir
+CHARS_PER_TOKEN = 4
+
+
+def estimate_prompt_tokens(prompt_text: str, system_instruction: str, output_schema: dict) -> int:
+    chars = len(prompt_text) + len(system_instruction) + len(json_codec.dumps(output_schema))
+    return max(1, chars // CHARS_PER_TOKEN)
+
+
+def _prompt_token_count(chunk):
+    usage = getattr(chunk, "usage_metadata", None)
+    return getattr(usage, "prompt_token_count", None)
+
+
+class GenaiBackend:
+    """
+    google-genai istemcisiyle gerçek Gemini arka ucu. İstemci ilk istekte oluşturulur;
+    böylece sahte arka uçla çalışırken API anahtarı gerekmez.
+    """
+    name = "genai"
+
+    def __init__(self, api_key: str = None):
+        self.api_key = api_key
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = genai.Client(api_key=self.api_key or os.getenv("GEMINI_API_KEY"))
+        return self._client
+
+    def stream(self, request: GeminiRequest):
         contents = [
             types.Content(
                 role="user",
-                parts=[types.Part.from_text(text=prompt_text)],
+                parts=[types.Part.from_text(text=request.prompt_text)],
             )
         ]
 
         system_instructions = [
-            types.Part.from_text(text=system_instruction)
+            types.Part.from_text(text=request.system_instruction)
         ]
 
-        schema = convert_dict_to_schema(output_schema)
+        schema = convert_dict_to_schema(request.output_schema)
 
         generate_content_config = types.GenerateContentConfig(
             response_mime_type="application/json",
@@ -37,24 +401,312 @@ def call_gemini_json_response(prompt_text: str, system_instruction: str, output_
             system_instruction=system_instructions,
         )
 
-        response_chunks = client.models.generate_content_stream(
-            model=model_name,
+        return self.client.models.generate_content_stream(
+            model=request.model_name,
             contents=contents,
             config=generate_content_config,
         )
 
-        output = ""
-        for chunk in response_chunks:
-            output += chunk.text
+
+BACKENDS = ("genai", "record", "replay", "fake")
+
+
+def create_backend(name: str = None):
+    """
+    GEMINI_BACKEND ile seçilen arka uç:
+    genai (varsayılan), record (genai + JSONL kaydı), replay (kayıtları geri oynatır), fake (şemadan üretir).
+    """
+    name = (name or os.getenv("GEMINI_BACKEND") or "genai").lower()
+    record_path = os.getenv("GEMINI_RECORD_PATH", DEFAULT_RECORD_PATH)
+    if name == "genai":
+        return GenaiBackend()
+    if name == "record":
+        return RecordingBackend(GenaiBackend(), record_path)
+    if name == "replay":
+        return fake_backend_from_env(ReplayBackend, path=record_path)
+    if name == "fake":
+        return fake_backend_from_env(FakeBackend)
+    raise ValueError(f"Bilinmeyen Gemini arka ucu: {name} (seçenekler: {', '.join(BACKENDS)})")
+
+
+backend = create_backend()
+logger.info("Gemini arka ucu: %s", backend.name)
+
+
+def set_backend(new_backend):
+    """
+    Etkin arka ucu değiştirir (ölçüm betikleri ve yük testleri için); öncekini döndürür.
+    """
+    global backend
+    previous, backend = backend, new_backend
+    logger.info("Gemini arka ucu değiştirildi: %s", getattr(new_backend, 'name', type(new_backend).__name__))
+    return previous
+
+
+def _stream_gemini_text(prompt_text: str, system_instruction: str, output_schema: dict, model_name: str):
+    """
+    Gemini akışındaki metin parçalarını geldikçe döndürür.
+    """
+    request = GeminiRequest(model_name, prompt_text, system_instruction, output_schema)
+    active_backend = backend
+
+    def open_stream():
+        return active_backend.stream(request)
+
+    estimated_tokens = estimate_prompt_tokens(prompt_text, system_instruction, output_schema)
+    started = time.perf_counter()
+    chunks = 0
+    output_bytes = 0
+    usage = None
+    outcome = "error"
+    try:
+        for chunk in scheduler.stream(open_stream, estimated_tokens, _prompt_token_count):
+            if not chunks:
+                GEMINI_FIRST_CHUNK_SECONDS.labels(model=model_name).observe(time.perf_counter() - started)
+            chunks += 1
+            usage = getattr(chunk, "usage_metadata", None) or usage
+            if chunk.text:
+                output_bytes += len(chunk.text.encode("utf-8"))
+                yield chunk.text
+        outcome = "ok"
+    finally:
+        # Erken kapatılan akış (GeneratorExit) da ölçülür
+        _record_stream_metrics(model_name, outcome, time.perf_counter() - started, chunks, output_bytes, usage)
+
+
+GEMINI_FIRST_CHUNK_SECONDS = metrics.histogram(
+    "eduwise_gemini_first_chunk_seconds", "Gemini isteğinin ilk yanıt parçasına kadar geçen süre", ["model"]
+)
+GEMINI_REQUEST_SECONDS = metrics.histogram(
+    "eduwise_gemini_request_seconds", "Gemini akışının toplam süresi (yeniden denemeler dahil)", ["model", "outcome"]
+)
+GEMINI_CHUNKS = metrics.histogram(
+    "eduwise_gemini_chunks", "Gemini yanıtı başına parça sayısı", ["model"], buckets=metrics.COUNT_BUCKETS
+)
+GEMINI_OUTPUT_BYTES = metrics.histogram(
+    "eduwise_gemini_output_bytes", "Gemini yanıtı başına metin boyutu (bayt)", ["model"], buckets=metrics.BYTES_BUCKETS
+)
+GEMINI_TOKENS = metrics.counter(
+    "eduwise_gemini_tokens_total", "Yanıtların usage_metadata'sındaki token sayıları", ["model", "kind"]
+)
+GEMINI_CALLS = metrics.counter(
+    "eduwise_gemini_calls_total", "Gemini çağrıları; source=cache önbellekten, live istekten (birleşenler dahil)",
+    ["api", "source"]
+)
+
+
+def _record_stream_metrics(model_name: str, outcome: str, elapsed: float, chunks: int, output_bytes: int, usage):
+    GEMINI_REQUEST_SECONDS.labels(model=model_name, outcome=outcome).observe(elapsed)
+    logger.debug("Gemini akışı bitti - model: %s, sonuç: %s, parça: %s, bayt: %s",
+                 model_name, outcome, chunks, output_bytes, extra={"duration": elapsed})
+    if not chunks:
+        return
+    GEMINI_CHUNKS.labels(model=model_name).observe(chunks)
+    GEMINI_OUTPUT_BYTES.labels(model=model_name).observe(output_bytes)
+    for kind, field in (("prompt", "prompt_token_count"), ("output", "candidates_token_count")):
+        count = getattr(usage, field, None)
+        if count:
+            GEMINI_TOKENS.labels(model=model_name, kind=kind).inc(count)
+
+
+def _store_in_cache(cache, cache_key: str, model_name: str, output: str):
+    try:
+        json_codec.loads(output)
+        cache.set(cache_key, model_name, output)
+    except json_codec.JSONDecodeError:
+        logger.warning("Geçersiz JSON yanıtı önbelleğe alınmadı.")
+
+
+def call_gemini_json_response(prompt_text: str, system_instruction: str, output_schema: dict, model_name: str = "gemini-2.5-flash-lite", use_cache: bool = True,
+                              timeout: float = None) -> str:
+    """
+    Gemini API ile JSON formatında çıktı üretir.
+    Önbellek açıksa aynı istek ağa gitmeden önbellekten döner; use_cache=False önbelleği atlar.
+    Aynı istek o anda yürütülüyorsa yeni istek açılmaz, onun yanıtı beklenir.
+    timeout (sn) aşılırsa TimeoutError fırlatılır; verilmezse GEMINI_TIMEOUT kullanılır.
+    """
+    try:
+        logger.info("call_gemini_json_response çağrıldı, model: %s", model_name)
+
+        cache = response_cache if use_cache else None
+        cache_key = None
+        if cache is not None:
+            cache_key = ResponseCache.make_key(model_name, prompt_text, system_instruction, output_schema)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info("call_gemini_json_response önbellekten döndü, model: %s", model_name)
+                GEMINI_CALLS.labels(api="json", source="cache").inc()
+                return cached
+
+        GEMINI_CALLS.labels(api="json", source="live").inc()
+
+        output = "".join(_request_text_stream(prompt_text, system_instruction, output_schema, model_name,
+                                              cache, cache_key, timeout))
 
         logger.info("call_gemini_json_response başarıyla tamamlandı")
         return output
 
     except Exception as e:
-        logger.error(f"call_gemini_json_response sırasında hata oluştu: {e}", exc_info=True)
+        logger.error("call_gemini_json_response sırasında hata oluştu: %s", e, exc_info=True)
         raise
 
 
+class JsonArrayStreamParser:
+    """
+    Parça parça gelen JSON metninde, kök nesnedeki array_key dizisinin
+    her elemanını kapandığı anda çözer. Metin yalnızca bir kez taranır.
+    Yalnızca kök nesnedeki "array_key": [ eşleşir; aynı metin bir string değerinde
+    geçerse ya da anahtarın değeri dizi değilse dizi bulunmamış sayılır (done False).
+    """
+
+    def __init__(self, array_key: str):
+        self.array_key = array_key
+        self._buf = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._last_key = None
+        # Kök nesnede sıradaki string bir anahtar mı (değer değil)
+        self._expect_key = False
+        self._item_start = None
+        # seek: anahtar aranıyor, open: ':' sonrası '[' bekleniyor, array: dizi içi, done: dizi bitti
+        self._state = "seek"
+
+    @property
+    def done(self) -> bool:
+        return self._state == "done"
+
+    def feed(self, text: str) -> list:
+        self._buf += text
+        buf = self._buf
+        items = []
+        i = self._pos
+
+        while i < len(buf):
+            ch = buf[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._state == "seek" and self._depth == 1 and self._expect_key:
+                        self._last_key = buf[self._string_start:i + 1]
+                i += 1
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+                if self._state == "open":
+                    self._state = "seek"
+                elif self._state == "array" and self._depth == 2 and self._item_start is None:
+                    self._item_start = i
+            elif ch in "{[":
+                if self._state == "open":
+                    self._state = "array" if ch == "[" and self._depth == 1 else "seek"
+                elif self._state == "array" and self._depth == 2 and self._item_start is None:
+                    self._item_start = i
+                self._depth += 1
+                self._expect_key = self._depth == 1 and ch == "{"
+            elif ch in "}]":
+                self._depth -= 1
+                if self._state == "array":
+                    if self._depth == 1:
+                        if self._item_start is not None:
+                            items.append(json_codec.loads(buf[self._item_start:i]))
+                            self._item_start = None
+                        self._state = "done"
+                    elif self._depth == 2 and self._item_start is not None:
+                        items.append(json_codec.loads(buf[self._item_start:i + 1]))
+                        self._item_start = None
+            elif ch == ":":
+                if self._depth == 1:
+                    self._expect_key = False
+                if self._state == "seek" and self._depth == 1 and self._last_key is not None:
+                    if json_codec.loads(self._last_key) == self.array_key:
+                        self._state = "open"
+                    self._last_key = None
+            elif ch == ",":
+                if self._depth == 1:
+                    self._expect_key = True
+                if self._state == "array" and self._depth == 2 and self._item_start is not None:
+                    items.append(json_codec.loads(buf[self._item_start:i]))
+                    self._item_start = None
+            elif not ch.isspace():
+                if self._state == "array" and self._depth == 2 and self._item_start is None:
+                    self._item_start = i
+                elif self._state == "open":
+                    self._state = "seek"
+            i += 1
+
+        # Tamamlanmış kısım atılır; yarım kalan eleman ya da string korunur
+        keep = i
+        if self._item_start is not None:
+            keep = min(keep, self._item_start)
+        if self._in_string:
+            keep = min(keep, self._string_start)
+        self._buf = buf[keep:]
+        self._pos = i - keep
+        if self._item_start is not None:
+            self._item_start -= keep
+        if self._in_string:
+            self._string_start -= keep
+
+        return items
+
+
+def stream_gemini_json_items(prompt_text: str, system_instruction: str, output_schema: dict, array_key: str,
+                             model_name: str = "gemini-2.5-flash-lite", use_cache: bool = True, timeout: float = None):
+    """
+    call_gemini_json_response ile aynı isteği yapar, ancak yanıtın array_key
+    dizisindeki her elemanı tamamlandığı anda (dict olarak) döndüren bir üreteçtir.
+    """
+    logger.info("stream_gemini_json_items çağrıldı, model: %s, anahtar: %s", model_name, array_key)
+
+    cache = response_cache if use_cache else None
+    cache_key = None
+    if cache is not None:
+        cache_key = ResponseCache.make_key(model_name, prompt_text, system_instruction, output_schema)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info("stream_gemini_json_items önbellekten döndü, model: %s", model_name)
+            GEMINI_CALLS.labels(api="stream", source="cache").inc()
+            yield from json_codec.loads(cached).get(array_key, [])
+            return
+
+    GEMINI_CALLS.labels(api="stream", source="live").inc()
+    parser = JsonArrayStreamParser(array_key)
+    parts = []
+    item_count = 0
+    try:
+        for text in _request_text_stream(prompt_text, system_instruction, output_schema, model_name,
+                                         cache, cache_key, timeout):
+            parts.append(text)
+            for item in parser.feed(text):
+                item_count += 1
+                yield item
+        if not parser.done:
+            # Dizi akışta bulunamadı ya da kapanmadı: yanıtın tamamı çözülür, kalan elemanlar verilir
+            logger.warning("stream_gemini_json_items akışta '%s' dizisini bulamadı, tam yanıt çözülüyor", array_key)
+            data = json_codec.loads("".join(parts))
+            items = data.get(array_key) if isinstance(data, dict) else None
+            if not isinstance(items, list):
+                items = []
+            for item in items[item_count:]:
+                item_count += 1
+                yield item
+    except Exception as e:
+        logger.error("stream_gemini_json_items sırasında hata oluştu: %s", e, exc_info=True)
+        raise
+
+    logger.info("stream_gemini_json_items tamamlandı, eleman sayısı: %s", item_count)
+
+
 def convert_dict_to_schema(schema_dict: dict) -> genai.types.Schema:
     """
     Python dict şemasını Gemini Schema formatına dönüştürür.
@@ -84,5 +736,5 @@ def convert_dict_to_schema(schema_dict: dict) -> genai.types.Schema:
         return recursive_convert(schema_dict)
 
     except Exception as e:
-        logger.error(f"convert_dict_to_schema sırasında hata oluştu: {e}", exc_info=True)
+        logger.error("convert_dict_to_schema sırasında hata oluştu: %s", e, exc_info=True)
         raise
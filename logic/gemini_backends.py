@@ -0,0 +1,229 @@
+"""
+Gemini çağrıları için değiştirilebilir arka uçlar.
+
+Bir arka uç stream(request) ile yanıt parçalarını (text, usage_metadata alanlı
+nesneler) döndürür. Gerçek istemci logic.gemini_api.GenaiBackend'dir; buradakiler
+ağ ve API anahtarı gerektirmez:
+
+- RecordingBackend: başka bir arka ucu sarar, her başarılı istek/yanıt çiftini JSONL'e ekler
+- FakeBackend: yanıtı şemadan üretir; gecikme, parça boyutu ve hata oranı ayarlanabilir
+- ReplayBackend: kayıtlı yanıtları aynı istek anahtarıyla geri oynatır, kayıt yoksa FakeBackend gibi davranır
+"""
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+GeminiRequest = namedtuple("GeminiRequest", ["model_name", "prompt_text", "system_instruction", "output_schema"])
+Chunk = namedtuple("Chunk", ["text", "usage_metadata"])
+Usage = namedtuple("Usage", ["prompt_token_count", "candidates_token_count", "total_token_count"])
+
+DEFAULT_RECORD_PATH = "data/gemini_recordings.jsonl"
+
+
+def request_key(model_name: str, prompt_text: str, system_instruction: str, output_schema: dict) -> str:
+    # Anahtar kurulu JSON arka ucundan bağımsız kalsın diye standart json ile üretilir
+    payload = json.dumps(
+        [model_name, prompt_text, system_instruction, output_schema],
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _key_of(request: GeminiRequest) -> str:
+    return request_key(request.model_name, request.prompt_text, request.system_instruction, request.output_schema)
+
+
+class InjectedError(RuntimeError):
+    """FakeBackend'in ürettiği yapay API hatası; code alanı HTTP durum kodudur."""
+
+    def __init__(self, code: int, message: str = "Yapay hata"):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class RecordingBackend:
+    name = "record"
+
+    def __init__(self, inner, path: str = DEFAULT_RECORD_PATH):
+        self.inner = inner
+        self.path = path
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def stream(self, request: GeminiRequest):
+        started = time.perf_counter()
+        first_chunk_s = None
+        texts = []
+        usage = None
+        for chunk in self.inner.stream(request):
+            if first_chunk_s is None:
+                first_chunk_s = time.perf_counter() - started
+            if chunk.text:
+                texts.append(chunk.text)
+            usage = getattr(chunk, "usage_metadata", None) or usage
+            yield chunk
+
+        record = {
+            "key": _key_of(request),
+            "model": request.model_name,
+            "prompt": request.prompt_text,
+            "system_instruction": request.system_instruction,
+            "schema": request.output_schema,
+            "response": "".join(texts),
+            "chunks": len(texts),
+            "first_chunk_s": round(first_chunk_s or 0.0, 4),
+            "latency_s": round(time.perf_counter() - started, 4),
+            "prompt_tokens": getattr(usage, "prompt_token_count", None),
+            "output_tokens": getattr(usage, "candidates_token_count", None),
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+_WORDS = (
+    "konu kavram örnek soru cevap tanım özellik kural işlem sonuç neden etki yöntem adım "
+    "grafik tablo oran değer fark benzerlik ilişki durum zaman yapı biçim ölçü birim sistem "
+    "enerji kuvvet hareket hız hücre bitki fonksiyon türev denklem sayı kümeler olasılık "
+    "cümle fiil zaman eki metin paragraf anlam yorum karşılaştırma uygulama problem çözüm"
+).split()
+
+
+class FakeBackend:
+    """
+    Yanıtı output_schema'dan üretir. Diziler minItems kadar (yoksa array_length) eleman,
+    enum alanları enum'dan rastgele bir değer, tamsayılar dizi içindeki sıra numarası alır;
+    metinler birbirine benzemeyecek şekilde rastgele kelimelerden oluşur.
+    """
+    name = "fake"
+
+    def __init__(self, first_chunk_latency: float = 0.2, chunk_delay: float = 0.01, chunk_size: int = 64,
+                 error_rate: float = 0.0, error_codes: tuple = (429, 503), array_length: int = 5, seed: int = None):
+        self.first_chunk_latency = first_chunk_latency
+        self.chunk_delay = chunk_delay
+        self.chunk_size = max(1, chunk_size)
+        self.error_rate = error_rate
+        self.error_codes = error_codes
+        self.array_length = array_length
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def _words(self, count: int) -> str:
+        with self._lock:
+            return " ".join(self._rng.choice(_WORDS) for _ in range(count))
+
+    def synthesize(self, schema: dict, name: str = "", index: int = 0):
+        schema_type = schema.get("type")
+        if "enum" in schema:
+            with self._lock:
+                return self._rng.choice(schema["enum"])
+        if schema_type == "object":
+            return {
+                key: self.synthesize(value, key, index)
+                for key, value in schema.get("properties", {}).items()
+            }
+        if schema_type == "array":
+            length = schema.get("minItems", self.array_length)
+            return [self.synthesize(schema.get("items", {}), name, i) for i in range(length)]
+        if schema_type == "integer":
+            return index + 1
+        if schema_type == "number":
+            return float(index + 1)
+        if schema_type == "boolean":
+            return index % 2 == 0
+        return f"{name} {index + 1}: {self._words(8)}".strip()
+
+    def response_text(self, request: GeminiRequest) -> str:
+        return json.dumps(self.synthesize(request.output_schema), ensure_ascii=False)
+
+    def stream(self, request: GeminiRequest):
+        with self._lock:
+            self.calls += 1
+            fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+            code = self._rng.choice(self.error_codes) if fail else None
+            if fail:
+                self.errors += 1
+
+        time.sleep(self.first_chunk_latency)
+        if fail:
+            raise InjectedError(code)
+
+        text = self.response_text(request)
+        prompt_tokens = max(1, len(request.prompt_text) // 4)
+        pieces = [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+        for i, piece in enumerate(pieces):
+            if i:
+                time.sleep(self.chunk_delay)
+            usage = None
+            if i == len(pieces) - 1:
+                output_tokens = max(1, len(text) // 4)
+                usage = Usage(prompt_tokens, output_tokens, prompt_tokens + output_tokens)
+            yield Chunk(piece, usage)
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "errors": self.errors}
+
+
+class ReplayBackend(FakeBackend):
+    """
+    RecordingBackend'in yazdığı JSONL'deki yanıtları istek anahtarıyla bulup FakeBackend'in
+    gecikme/parçalama/hata ayarlarıyla geri oynatır. strict=True ise kaydı olmayan istek
+    LookupError verir, değilse yanıt şemadan üretilir.
+    """
+    name = "replay"
+
+    def __init__(self, path: str = DEFAULT_RECORD_PATH, strict: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.strict = strict
+        self.responses = {}
+        self.hits = 0
+        self.misses = 0
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self.responses[record["key"]] = record["response"]
+        logger.info("Gemini kayıtları yüklendi: %s, %s yanıt", path, len(self.responses))
+
+    def response_text(self, request: GeminiRequest) -> str:
+        recorded = self.responses.get(_key_of(request))
+        with self._lock:
+            if recorded is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if recorded is not None:
+            return recorded
+        if self.strict:
+            raise LookupError(f"Bu istek için kayıt yok ({_key_of(request)[:8]})")
+        return super().response_text(request)
+
+    def stats(self) -> dict:
+        return {**super().stats(), "hits": self.hits, "misses": self.misses}
+
+
+def fake_backend_from_env(cls=FakeBackend, **kwargs):
+    return cls(
+        first_chunk_latency=float(os.getenv("GEMINI_FAKE_LATENCY", 0.2)),
+        chunk_delay=float(os.getenv("GEMINI_FAKE_CHUNK_DELAY", 0.01)),
+        chunk_size=int(os.getenv("GEMINI_FAKE_CHUNK_SIZE", 64)),
+        error_rate=float(os.getenv("GEMINI_FAKE_ERROR_RATE", 0.0)),
+        seed=int(os.environ["GEMINI_FAKE_SEED"]) if os.getenv("GEMINI_FAKE_SEED") else None,
+        **kwargs,
+    )
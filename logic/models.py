@@ -0,0 +1,190 @@
+"""
+Soru ve plan günü için hafif, tipli modeller.
+
+Sözlük yerine __slots__ kullanıldığından nesneler anahtar tablosu taşımaz;
+session_state'te tutulan 40 soruluk testler ve uzun planlar daha az yer
+kaplar, daha hızlı kopyalanır. Dışarıdan gelen veri (Gemini yanıtı,
+veritabanındaki JSON) from_dict ile doğrulanarak modele çevrilir; JSON'a
+yazarken to_dict kullanılır (utils.json_codec bunu kendiliğinden yapar).
+"""
+from datetime import date, datetime
+
+ANSWER_LETTERS = ("A", "B", "C", "D")
+
+
+def _require(data, *keys):
+    missing = [key for key in keys if key not in data]
+    if missing:
+        raise ValueError(f"Eksik alan: {', '.join(missing)}")
+
+
+def _answer_letter(value, field):
+    letter = str(value).strip().upper()
+    if letter not in ANSWER_LETTERS:
+        raise ValueError(f"Geçersiz {field} harfi: {value}")
+    return letter
+
+
+class _SlotsModel:
+    """
+    Alanları yalnızca değişmez değerler (str, int, bool, str demeti) tutan modeller için
+    ortak eşitlik ve kopyalama. Değerler paylaşılabildiğinden kopya, yeni bir kabuk
+    oluşturup alanları aktarmaktan ibarettir; copy.deepcopy'nin genel yolundan çok hızlıdır.
+    """
+    __slots__ = ()
+    _fields = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = tuple(name for klass in reversed(cls.__mro__) for name in vars(klass).get("__slots__", ()))
+
+    def __copy__(self):
+        clone = object.__new__(type(self))
+        for name in self._fields:
+            object.__setattr__(clone, name, getattr(self, name))
+        return clone
+
+    def __deepcopy__(self, memo):
+        return self.__copy__()
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._fields)
+
+    __hash__ = None
+
+
+class Question(_SlotsModel):
+    __slots__ = ("question", "options", "correct_answer", "explanation", "topic", "difficulty")
+
+    def __init__(self, question, options, correct_answer, explanation="", topic=None, difficulty=None):
+        self.question = question
+        self.options = tuple(options)
+        self.correct_answer = correct_answer
+        self.explanation = explanation
+        self.topic = topic
+        self.difficulty = difficulty
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict):
+            raise ValueError(f"Soru bir JSON nesnesi değil: {type(data).__name__}")
+        _require(data, "question", "options", "correct_answer")
+        question = data["question"]
+        options = data["options"]
+        if not isinstance(question, str) or not question.strip():
+            raise ValueError("Soru metni boş")
+        if not isinstance(options, (list, tuple)) or len(options) != 4:
+            raise ValueError("Seçenek sayısı 4 değil")
+        return cls(
+            question=question,
+            options=[str(option) for option in options],
+            correct_answer=_answer_letter(data["correct_answer"], "doğru cevap"),
+            explanation=str(data.get("explanation") or ""),
+            topic=data.get("topic"),
+            difficulty=data.get("difficulty"),
+        )
+
+    def to_dict(self):
+        data = {
+            "question": self.question,
+            "options": list(self.options),
+            "correct_answer": self.correct_answer,
+            "explanation": self.explanation,
+        }
+        # Boş isteğe bağlı alanlar yazılmaz; eski kayıtlarla aynı biçim korunur
+        if self.topic is not None:
+            data["topic"] = self.topic
+        if self.difficulty is not None:
+            data["difficulty"] = self.difficulty
+        return data
+
+    def answer(self, user_answer):
+        """
+        Soruyu değiştirmeden, verilen cevapla (None = cevapsız) yeni bir AnsweredQuestion döndürür.
+        """
+        return AnsweredQuestion(
+            self.question, self.options, self.correct_answer, self.explanation, self.topic, self.difficulty,
+            user_answer=None if user_answer is None else _answer_letter(user_answer, "kullanıcı cevabı"),
+        )
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.question[:40]!r}, correct_answer={self.correct_answer!r})"
+
+
+class AnsweredQuestion(Question):
+    __slots__ = ("user_answer",)
+
+    def __init__(self, question, options, correct_answer, explanation="", topic=None, difficulty=None, user_answer=None):
+        super().__init__(question, options, correct_answer, explanation, topic, difficulty)
+        self.user_answer = user_answer
+
+    @classmethod
+    def from_dict(cls, data):
+        return Question.from_dict(data).answer(data.get("user_answer"))
+
+    @property
+    def is_correct(self):
+        return self.user_answer is not None and self.user_answer == self.correct_answer
+
+    def to_dict(self):
+        data = super().to_dict()
+        # Cevapsız sorular da user_answer anahtarıyla (None) yazılır; analizler anahtarı doğrudan okur
+        data["user_answer"] = self.user_answer
+        return data
+
+
+class PlanDay(_SlotsModel):
+    __slots__ = ("gun", "tarih", "konu", "alt_konu", "etkinlik", "gorev", "tekrar", "soru_coz")
+
+    def __init__(self, gun, tarih, konu, alt_konu="", etkinlik="", gorev="", tekrar=False, soru_coz=False):
+        self.gun = gun
+        self.tarih = tarih
+        self.konu = konu
+        self.alt_konu = alt_konu
+        self.etkinlik = etkinlik
+        self.gorev = gorev
+        self.tekrar = tekrar
+        self.soru_coz = soru_coz
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict):
+            raise ValueError(f"Plan günü bir JSON nesnesi değil: {type(data).__name__}")
+        _require(data, "gun", "tarih", "konu")
+        try:
+            gun = int(data["gun"])
+        except (TypeError, ValueError):
+            raise ValueError(f"Geçersiz gün numarası: {data['gun']}")
+        return cls(
+            gun=gun,
+            tarih=str(data["tarih"]),
+            konu=str(data["konu"]),
+            alt_konu=str(data.get("alt_konu") or ""),
+            etkinlik=str(data.get("etkinlik") or ""),
+            gorev=str(data.get("gorev") or ""),
+            tekrar=bool(data.get("tekrar")),
+            soru_coz=bool(data.get("soru_coz")),
+        )
+
+    @classmethod
+    def coerce(cls, value):
+        """
+        Zaten PlanDay ise olduğu gibi, sözlükse doğrulayarak PlanDay döndürür.
+        """
+        return value if isinstance(value, cls) else cls.from_dict(value)
+
+    @property
+    def plan_date(self) -> date | None:
+        try:
+            return datetime.strptime(self.tarih, "%Y-%m-%d").date()
+        except ValueError:
+            return None
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self._fields}
+
+    def __repr__(self):
+        return f"PlanDay(gun={self.gun!r}, tarih={self.tarih!r}, konu={self.konu!r})"
+
@@ -1,31 +1,35 @@
-import json
-from collections import defaultdict
-from logger import logger
+from logic.columnar_analytics import AnswerColumns, recommend_columns
+from logger import get_logger
+from utils import profiling
 
+logger = get_logger(__name__)
+
+@profiling.profiled
 def analyze_test_performance(test_records):
     """
     Her konuya göre doğru/yanlış oranlarını analiz eder.
     """
     try:
-        logger.info(f"analyze_test_performance çağrıldı, kayıt sayısı: {len(test_records)}")
-
-        topic_stats = defaultdict(lambda: {"correct": 0, "wrong": 0})
-
-        for record in test_records:
-            try:
-                _, test_json, correct, wrong, _ = record
-                test_data = json.loads(test_json)
-                for q in test_data:
-                    topic = q.get("topic", "GENEL")
-                    if q["user_answer"] == q["correct_answer"]:
-                        topic_stats[topic]["correct"] += 1
-                    else:
-                        topic_stats[topic]["wrong"] += 1
-            except json.JSONDecodeError as e:
-                logger.error(f"JSON decode hatası test kaydında: {record}, hata: {e}")
-            except KeyError as e:
-                logger.error(f"Anahtar hatası test kaydında: {record}, eksik anahtar: {e}")
+        logger.info("analyze_test_performance çağrıldı, kayıt sayısı: %s", len(test_records))
+
+        columns = AnswerColumns.from_test_jsons(
+            (test_json for _, test_json, _, _, _ in test_records), keep_partial=True
+        )
+        recommendations = recommend_columns(columns)
+
+        logger.info("analyze_test_performance başarıyla tamamlandı. Konu sayısı: %s", len(recommendations))
+        return recommendations
 
+    except Exception as e:
+        logger.error("analyze_test_performance sırasında hata oluştu: %s", e, exc_info=True)
+        raise
+
+
+def build_recommendations(topic_stats):
+    """
+    Konu bazlı doğru/yanlış sayaçlarından zorluk önerisi üretir.
+    """
+    try:
         recommendations = {}
         for topic, stats in topic_stats.items():
             total = stats["correct"] + stats["wrong"]
@@ -45,9 +49,8 @@ def analyze_test_performance(test_records):
                 "başarı_oranı": round(success_rate * 100, 1)
             }
 
-        logger.info(f"analyze_test_performance başarıyla tamamlandı. Konu sayısı: {len(recommendations)}")
         return recommendations
 
     except Exception as e:
-        logger.error(f"analyze_test_performance sırasında hata oluştu: {e}", exc_info=True)
+        logger.error("build_recommendations sırasında hata oluştu: %s", e, exc_info=True)
         raise
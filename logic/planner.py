@@ -1,11 +1,16 @@
-import json
-from logic.gemini_api import call_gemini_json_response
-from logger import logger
+from logic.gemini_api import call_gemini_json_response, stream_gemini_json_items
+from logic.models import PlanDay
+from logger import get_logger
+from utils import profiling
 
+logger = get_logger(__name__)
 
+
+@profiling.profiled
 def generate_learning_plan_json(user_topic: str, user_level: str, daily_minutes: int, start_date: str, duration_days: int) -> str:
     try:
-        logger.info(f"generate_learning_plan_json çağrıldı: topic={user_topic}, level={user_level}, daily_minutes={daily_minutes}, start_date={start_date}, duration_days={duration_days}")
+        logger.info("generate_learning_plan_json çağrıldı: topic=%s, level=%s, daily_minutes=%s, start_date=%s, duration_days=%s",
+                    user_topic, user_level, daily_minutes, start_date, duration_days)
         
         prompt = f"""
 Bir kullanıcı "{user_topic}" öğrenmek istiyor.
@@ -90,13 +95,14 @@ Yalnızca aşağıdaki JSON formatında çıktı üret.
         return result
 
     except Exception as e:
-        logger.error(f"generate_learning_plan_json sırasında hata oluştu: {e}", exc_info=True)
+        logger.error("generate_learning_plan_json sırasında hata oluştu: %s", e, exc_info=True)
         raise
 
 
+@profiling.profiled
 def generate_learning_path_json(user_topic: str, user_level: str) -> dict:
     try:
-        logger.info(f"generate_learning_path_json çağrıldı: topic={user_topic}, level={user_level}")
+        logger.info("generate_learning_path_json çağrıldı: topic=%s, level=%s", user_topic, user_level)
         
         prompt = f"""
 Bir kullanıcı "{user_topic}" öğrenmek istiyor.
@@ -150,15 +156,12 @@ Yalnızca aşağıdaki JSON formatında çıktı üret.
         return result
 
     except Exception as e:
-        logger.error(f"generate_learning_path_json sırasında hata oluştu: {e}", exc_info=True)
+        logger.error("generate_learning_path_json sırasında hata oluştu: %s", e, exc_info=True)
         raise
 
 
-def generate_study_plan_json(tum_konular: list, baglantilar: list, daily_minutes: int, start_date: str, duration_days: int) -> dict:
-    try:
-        logger.info(f"generate_study_plan_json çağrıldı: daily_minutes={daily_minutes}, start_date={start_date}, duration_days={duration_days}")
-        
-        prompt = f"""
+def _build_study_plan_request(tum_konular: list, baglantilar: list, daily_minutes: int, start_date: str, duration_days: int) -> tuple:
+    prompt = f"""
 Bir kullanıcı öğrenmeye başlıyor.
 - Günlük {daily_minutes} dakika çalışabiliyor.
 - Başlangıç tarihi: {start_date}
@@ -184,36 +187,75 @@ Her gün için şunları belirt:
 
 Sadece aşağıdaki JSON formatında çıktı ver.
 """
-        system_instruction = "Sadece 'calisma_plani' alanını içeren bir JSON çıktısı ver."
+    system_instruction = "Sadece 'calisma_plani' alanını içeren bir JSON çıktısı ver."
 
-        output_schema = {
-            "type": "object",
-            "required": ["calisma_plani"],
-            "properties": {
-                "calisma_plani": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "required": ["gun", "tarih", "konu", "alt_konu", "etkinlik", "gorev", "tekrar", "soru_coz"],
-                        "properties": {
-                            "gun": {"type": "integer"},
-                            "tarih": {"type": "string"},
-                            "konu": {"type": "string"},
-                            "alt_konu": {"type": "string"},
-                            "etkinlik": {"type": "string"},
-                            "gorev": {"type": "string"},
-                            "tekrar": {"type": "boolean"},
-                            "soru_coz": {"type": "boolean"}
-                        }
+    output_schema = {
+        "type": "object",
+        "required": ["calisma_plani"],
+        "properties": {
+            "calisma_plani": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "required": ["gun", "tarih", "konu", "alt_konu", "etkinlik", "gorev", "tekrar", "soru_coz"],
+                    "properties": {
+                        "gun": {"type": "integer"},
+                        "tarih": {"type": "string"},
+                        "konu": {"type": "string"},
+                        "alt_konu": {"type": "string"},
+                        "etkinlik": {"type": "string"},
+                        "gorev": {"type": "string"},
+                        "tekrar": {"type": "boolean"},
+                        "soru_coz": {"type": "boolean"}
                     }
                 }
             }
         }
+    }
+
+    return prompt, system_instruction, output_schema
+
+
+@profiling.profiled
+def generate_study_plan_json(tum_konular: list, baglantilar: list, daily_minutes: int, start_date: str, duration_days: int) -> dict:
+    try:
+        logger.info("generate_study_plan_json çağrıldı: daily_minutes=%s, start_date=%s, duration_days=%s",
+                    daily_minutes, start_date, duration_days)
+
+        prompt, system_instruction, output_schema = _build_study_plan_request(
+            tum_konular, baglantilar, daily_minutes, start_date, duration_days
+        )
 
         result = call_gemini_json_response(prompt, system_instruction, output_schema)
         logger.info("generate_study_plan_json başarıyla tamamlandı.")
         return result
 
     except Exception as e:
-        logger.error(f"generate_study_plan_json sırasında hata oluştu: {e}", exc_info=True)
+        logger.error("generate_study_plan_json sırasında hata oluştu: %s", e, exc_info=True)
+        raise
+
+
+@profiling.profiled
+def iter_study_plan_days(tum_konular: list, baglantilar: list, daily_minutes: int, start_date: str, duration_days: int):
+    """
+    generate_study_plan_json ile aynı planı üretir, ancak calisma_plani
+    içindeki her günü yanıt akışında tamamlandığı anda PlanDay olarak döndürür.
+    """
+    try:
+        logger.info("iter_study_plan_days çağrıldı: daily_minutes=%s, start_date=%s, duration_days=%s",
+                    daily_minutes, start_date, duration_days)
+
+        prompt, system_instruction, output_schema = _build_study_plan_request(
+            tum_konular, baglantilar, daily_minutes, start_date, duration_days
+        )
+
+        for item in stream_gemini_json_items(prompt, system_instruction, output_schema, "calisma_plani"):
+            try:
+                yield PlanDay.from_dict(item)
+            except ValueError as e:
+                logger.warning("Hatalı plan günü atlandı: %s", e)
+        logger.info("iter_study_plan_days başarıyla tamamlandı.")
+
+    except Exception as e:
+        logger.error("iter_study_plan_days sırasında hata oluştu: %s", e, exc_info=True)
         raise
@@ -1,12 +1,21 @@
 from data.db_manager import DBManager
+import os
 import random
-import json
-from logic.gemini_api import call_gemini_json_response
-from logic.performance_analyzer import analyze_test_performance
-from logger import logger  # Logger'ı import et
-
+from utils import json_codec, profiling
+import re
+import contextvars
+from difflib import SequenceMatcher
+from concurrent.futures import ThreadPoolExecutor
+from logic.gemini_api import call_gemini_json_response, stream_gemini_json_items
+from logic.models import ANSWER_LETTERS, Question
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+@profiling.profiled
 def generate_mc_questions_json(konu: str, alt_konu: str, zorluk: str, soru_sayisi: int) -> str:
-    logger.info(f"generate_mc_questions_json çağrıldı: konu={konu}, alt_konu={alt_konu}, zorluk={zorluk}, soru_sayisi={soru_sayisi}")
+    logger.info("generate_mc_questions_json çağrıldı: konu=%s, alt_konu=%s, zorluk=%s, soru_sayisi=%s",
+                konu, alt_konu, zorluk, soru_sayisi)
     prompt = f"""
 Konu: "{konu}"
 Alt konu: "{alt_konu}"
@@ -59,12 +68,62 @@ Lütfen yalnızca aşağıdaki JSON formatında çıktı ver.
         logger.info("generate_mc_questions_json başarılı şekilde tamamlandı.")
         return result
     except Exception as e:
-        logger.exception(f"generate_mc_questions_json sırasında hata: {e}")
+        logger.exception("generate_mc_questions_json sırasında hata: %s", e)
         raise
 
 
-def generate_question_for_topic(topic: str, difficulty: str = "medium", count: int = 5) -> list[dict]:
-    logger.info(f"generate_question_for_topic çağrıldı: topic={topic}, difficulty={difficulty}, count={count}")
+_bank_db = None
+
+
+def _get_bank_db() -> DBManager:
+    global _bank_db
+    if _bank_db is None:
+        _bank_db = DBManager()
+    return _bank_db
+
+
+def _save_to_bank(topic: str, difficulty: str, questions: list[Question]):
+    # Soru bankası yalnızca bir önbellektir; yazılamaması üretimi bozmamalı
+    try:
+        if questions:
+            _get_bank_db().add_questions_to_bank(topic, difficulty, questions)
+    except Exception as e:
+        logger.warning("Sorular soru bankasına yazılamadı (%s): %s", topic, e)
+
+
+QUESTION_BATCH_SIZE = 10
+MAX_TOPUP_ROUNDS = 2
+NEAR_DUPLICATE_RATIO = 0.9
+# Tekrar elemesinde karşılaştırılan, kullanıcının daha önce gördüğü en fazla soru sayısı
+SEEN_DEDUP_LIMIT = 500
+
+QUESTION_ITEM_SCHEMA = {
+    "type": "object",
+    "required": ["question", "options", "correct_answer", "explanation"],
+    "properties": {
+        "question": {"type": "string"},
+        "options": {
+            "type": "array",
+            "items": {"type": "string"},
+            "minItems": 4,
+            "maxItems": 4,
+            "uniqueItems": True
+        },
+        "correct_answer": {
+            "type": "string",
+            "enum": ["A", "B", "C", "D"]
+        },
+        "explanation": {"type": "string"}
+    }
+}
+
+
+def _build_question_request(topic: str, difficulty: str, count: int, part: tuple = None, avoid: list = None) -> tuple:
+    """
+    Tek bir soru üretim isteğinin (prompt, system_instruction, schema) üçlüsünü hazırlar.
+    part=(i, n) verilirse istek n parçalık bir setin i. parçası olarak işaretlenir;
+    avoid içindeki soru kökleri tekrar üretilmemesi için prompta eklenir.
+    """
 
     prompt = f"""
 Konu: {topic}
@@ -95,6 +154,13 @@ Lütfen aşağıdaki JSON formatında yanıt ver:
 }}
     """
 
+    if part:
+        prompt += f"\nBu istek {part[1]} parçalık bir soru setinin {part[0]}. parçasıdır. Konunun farklı yönlerine odaklan ve diğer parçalarla aynı soruları üretme.\n"
+
+    if avoid:
+        avoid_list = "\n".join(f"- {stem}" for stem in avoid)
+        prompt += f"\nAşağıdaki sorulardan farklı sorular üret:\n{avoid_list}\n"
+
     system_instruction = "Bu bir test uygulamasıdır. Lütfen sadece geçerli JSON formatı döndür. Şıklar arasında sadece bir doğru olsun."
 
     schema = {
@@ -104,73 +170,431 @@ Lütfen aşağıdaki JSON formatında yanıt ver:
             "sorular": {
                 "type": "array",
                 "minItems": count,
-                "items": {
-                    "type": "object",
-                    "required": ["question", "options", "correct_answer", "explanation"],
-                    "properties": {
-                        "question": {"type": "string"},
-                        "options": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "minItems": 4,
-                            "maxItems": 4,
-                            "uniqueItems": True
-                        },
-                        "correct_answer": {
-                            "type": "string",
-                            "enum": ["A", "B", "C", "D"]
-                        },
-                        "explanation": {"type": "string"}
-                    }
-                }
+                "items": QUESTION_ITEM_SCHEMA
             }
         }
     }
 
-    try:
-        response = call_gemini_json_response(prompt, system_instruction, schema)
-        if isinstance(response, str):
-            response = json.loads(response)
+    return prompt, system_instruction, schema
 
-        formatted_questions = []
 
-        for item in response["sorular"]:
-            options = item["options"]
-            correct_letter = item["correct_answer"].upper()
+def _request_questions(topic: str, difficulty: str, count: int, part: tuple = None, avoid: list = None) -> list[Question]:
+    """
+    Tek bir Gemini isteğiyle soru üretir ve şıkları karıştırılmış soru listesi döndürür.
+    """
+    logger.info("_request_questions çağrıldı: topic=%s, difficulty=%s, count=%s, part=%s", topic, difficulty, count, part)
+
+    prompt, system_instruction, schema = _build_question_request(topic, difficulty, count, part, avoid)
+    response = call_gemini_json_response(prompt, system_instruction, schema)
+    if isinstance(response, str):
+        response = json_codec.loads(response)
+
+    formatted_questions = []
+
+    for item in response["sorular"]:
+        try:
+            formatted_questions.append(_format_question(item, topic))
+        except (KeyError, IndexError, ValueError, AttributeError) as e:
+            logger.warning("Hatalı soru atlandı (%s): %s", topic, e)
+
+    return formatted_questions
+
+
+def _stream_questions(topic: str, difficulty: str, count: int, part: tuple = None):
+    """
+    _request_questions ile aynı isteği yapar, ancak her soruyu yanıt akışında tamamlandığı anda döndürür.
+    """
+    logger.info("_stream_questions çağrıldı: topic=%s, difficulty=%s, count=%s, part=%s", topic, difficulty, count, part)
+
+    prompt, system_instruction, schema = _build_question_request(topic, difficulty, count, part)
+    for item in stream_gemini_json_items(prompt, system_instruction, schema, "sorular"):
+        try:
+            yield _format_question(item, topic)
+        except (KeyError, IndexError, ValueError, AttributeError) as e:
+            logger.warning("Hatalı soru atlandı (%s): %s", topic, e)
+
+
+def _format_question(item: dict, topic: str) -> Question:
+    question = Question.from_dict(item)
+    correct_option_text = question.options[ANSWER_LETTERS.index(question.correct_answer)]
+
+    shuffled_options = list(question.options)
+    random.shuffle(shuffled_options)
+
+    question.correct_answer = ANSWER_LETTERS[shuffled_options.index(correct_option_text)]
+    question.options = tuple(f"{label}) {opt}" for label, opt in zip(ANSWER_LETTERS, shuffled_options))
+    question.topic = topic
+    return question
+
+
+def _normalize_stem(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def _is_near_duplicate(stem: str, other: str) -> bool:
+    if stem == other:
+        return True
+    # Görülen sorularla birlikte liste uzar; ucuz üst sınırlar çoğu çifti ratio() hesaplamadan eler
+    matcher = SequenceMatcher(None, stem, other)
+    return (matcher.real_quick_ratio() >= NEAR_DUPLICATE_RATIO
+            and matcher.quick_ratio() >= NEAR_DUPLICATE_RATIO
+            and matcher.ratio() >= NEAR_DUPLICATE_RATIO)
+
+
+def _merge_unique(questions: list[Question], new_questions: list[Question], seen_stems: list[str]) -> int:
+    """
+    new_questions içinden aynı ya da neredeyse aynı soru kökü olmayanları questions'a ekler.
+    """
+    added = 0
+    for q in new_questions:
+        stem = _normalize_stem(q.question)
+        if not stem:
+            continue
+        if any(_is_near_duplicate(stem, s) for s in seen_stems):
+            logger.debug("Tekrarlanan soru atlandı: %s", q.question)
+            continue
+        seen_stems.append(stem)
+        questions.append(q)
+        added += 1
+    return added
+
+
+def _iter_top_up(topic: str, difficulty: str, count: int, questions: list[Question], seen_stems: list[str],
+                 errors: list):
+    """
+    questions count'a ulaşana kadar en fazla MAX_TOPUP_ROUNDS ek istek yapar ve
+    eklenen soruları sırayla döndürür. İstek hataları errors listesine eklenir.
+    """
+    for round_no in range(MAX_TOPUP_ROUNDS):
+        shortfall = count - len(questions)
+        if shortfall <= 0:
+            break
+        logger.info("Eksik sorular tamamlanıyor (%s): %s soru, tur %s", topic, shortfall, round_no + 1)
+        try:
+            # Tekrar elemesinden sonra yine eksik kalmamak için biraz fazla istenir
+            extra = _request_questions(topic, difficulty, shortfall + max(1, shortfall // 4),
+                                       avoid=[q.question for q in questions])
+            added = _merge_unique(questions, extra, seen_stems)
+        except Exception as e:
+            errors.append(e)
+            logger.error("Eksik soru tamamlama başarısız (%s) → %s", topic, e)
+            continue
+        yield from questions[len(questions) - added:]
 
-            index_map = {"A": 0, "B": 1, "C": 2, "D": 3}
-            correct_index = index_map.get(correct_letter, -1)
-            if correct_index == -1:
-                raise ValueError(f"Geçersiz doğru cevap harfi: {correct_letter}")
 
-            correct_option_text = options[correct_index]
+@profiling.profiled
+def iter_questions_for_topic(topic: str, difficulty: str = "medium", count: int = 5,
+                             batch_size: int = QUESTION_BATCH_SIZE, max_parallel: int = 4,
+                             known: list[str] = None):
+    """
+    count soruyu en fazla batch_size soruluk parçalara bölüp paralel üretir ve
+    soruları hazır oldukça döndüren bir üreteçtir. İlk parça akış olarak okunur,
+    böylece ilk soru tüm yanıt beklenmeden gelir; diğer parçalar arka planda üretilir.
+    Aynı/benzer soru kökleri atılır (known: kullanıcının zaten gördüğü soru metinleri
+    de bunlara dahildir), eksik kalan sayı ek isteklerle tamamlanır.
+    En fazla count soru döner.
+    """
+    logger.info("iter_questions_for_topic çağrıldı: topic=%s, difficulty=%s, count=%s", topic, difficulty, count)
 
-            shuffled_options = options[:]
-            random.shuffle(shuffled_options)
+    batch_count = max(1, -(-count // batch_size))
+    sizes = [count // batch_count + (1 if i < count % batch_count else 0) for i in range(batch_count)]
 
-            new_correct_index = shuffled_options.index(correct_option_text)
-            new_correct_letter = ["A", "B", "C", "D"][new_correct_index]
+    questions = []
+    seen_stems = [stem for stem in map(_normalize_stem, known or []) if stem]
+    yielded = 0
+    last_error = None
 
-            labeled_options = [f"{label}) {opt}" for label, opt in zip(["A", "B", "C", "D"], shuffled_options)]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_parallel, batch_count - 1))) as executor:
+        futures = [
+            executor.submit(
+                contextvars.copy_context().run, profiling.call_in_run,
+                _request_questions, topic, difficulty, size, (i + 1, batch_count)
+            )
+            for i, size in enumerate(sizes) if i > 0
+        ]
 
-            formatted_questions.append({
-                "question": item["question"],
-                "options": labeled_options,
-                "correct_answer": new_correct_letter,
-                "explanation": item["explanation"],
-                "topic": topic
-            })
+        try:
+            for q in _stream_questions(topic, difficulty, sizes[0], (1, batch_count) if batch_count > 1 else None):
+                if _merge_unique(questions, [q], seen_stems) and yielded < count:
+                    yielded += 1
+                    yield q
+        except Exception as e:
+            last_error = e
+            logger.error("Soru parçası üretilemedi (%s) → %s", topic, e)
+
+        for future in futures:
+            try:
+                added = _merge_unique(questions, future.result(), seen_stems)
+            except Exception as e:
+                last_error = e
+                logger.error("Soru parçası üretilemedi (%s) → %s", topic, e)
+                continue
+            for q in questions[len(questions) - added:]:
+                if yielded < count:
+                    yielded += 1
+                    yield q
+
+    errors = []
+    for q in _iter_top_up(topic, difficulty, count, questions, seen_stems, errors):
+        if yielded < count:
+            yielded += 1
+            yield q
+    if errors:
+        last_error = errors[-1]
+
+    _save_to_bank(topic, difficulty, questions)
+
+    if not yielded and last_error is not None:
+        raise last_error
+    if yielded < count:
+        logger.warning("iter_questions_for_topic istenen sayıya ulaşamadı: %s/%s", yielded, count)
+
+
+@profiling.profiled
+def generate_question_for_topic(topic: str, difficulty: str = "medium", count: int = 5,
+                                batch_size: int = QUESTION_BATCH_SIZE, max_parallel: int = 4) -> list[Question]:
+    """
+    iter_questions_for_topic sonucunu liste olarak döndürür.
+    """
+    logger.info("generate_question_for_topic çağrıldı: topic=%s, difficulty=%s, count=%s", topic, difficulty, count)
 
+    try:
+        questions = list(iter_questions_for_topic(topic, difficulty, count, batch_size, max_parallel))
         logger.info("generate_question_for_topic başarıyla tamamlandı.")
-        return formatted_questions
+        return questions
+
+    except Exception as e:
+        logger.exception("generate_question_for_topic sırasında hata: %s", e)
+        raise
+
+
+@profiling.profiled
+def iter_questions_for_user(user: str, topic: str, difficulty: str = "medium", count: int = 5):
+    """
+    Önce soru bankasından kullanıcının daha önce görmediği soruları döndürür,
+    eksik kalan kısım için Gemini'den soru üretir. Dönen sorular kullanıcı için
+    görüldü olarak işaretlenir.
+    """
+    logger.info("iter_questions_for_user çağrıldı: user=%s, topic=%s, difficulty=%s, count=%s",
+                user, topic, difficulty, count)
+
+    db = _get_bank_db()
+    try:
+        bank_questions = db.get_unseen_bank_questions(user, topic, difficulty, count)
+    except Exception as e:
+        logger.warning("Soru bankası kullanılamadı (%s): %s", topic, e)
+        bank_questions = []
+
+    yield from bank_questions
+
+    generated = []
+    shortfall = count - len(bank_questions)
+    if shortfall > 0:
+        # Üretilen sorular bankadan verilenlerle ve kullanıcının daha önce gördükleriyle de karşılaştırılır
+        try:
+            seen_questions = db.get_seen_bank_questions(user, topic, SEEN_DEDUP_LIMIT)
+        except Exception as e:
+            logger.warning("Görülen sorular okunamadı (%s): %s", topic, e)
+            seen_questions = []
+        known = [q.question for q in bank_questions + seen_questions]
+        for q in iter_questions_for_topic(topic, difficulty, shortfall, known=known):
+            generated.append(q)
+            yield q
 
+    try:
+        db.mark_bank_questions_seen(user, topic, difficulty, bank_questions + generated)
     except Exception as e:
-        logger.exception(f"generate_question_for_topic sırasında hata: {e}")
+        logger.warning("Görülen sorular işaretlenemedi (%s): %s", topic, e)
+
+    logger.info("iter_questions_for_user tamamlandı: bankadan=%s, üretilen=%s", len(bank_questions), len(generated))
+
+
+@profiling.profiled
+def generate_questions_for_user(user: str, topic: str, difficulty: str = "medium", count: int = 5) -> list[Question]:
+    try:
+        return list(iter_questions_for_user(user, topic, difficulty, count))
+    except Exception as e:
+        logger.exception("generate_questions_for_user sırasında hata: %s", e)
         raise
 
 
-def generate_questions_from_analysis(analysis: list, total_questions: int) -> list:
-    logger.info(f"generate_questions_from_analysis çağrıldı, toplam soru sayısı: {total_questions}")
+def _slot_key(index: int) -> str:
+    return f"konu_{index + 1}"
+
+
+def _build_multi_topic_request(slots: list[tuple]) -> tuple:
+    """
+    Birden fazla (topic, difficulty, count) dilimi için tek isteğin (prompt, system_instruction, schema)
+    üçlüsünü hazırlar. Yanıtta her dilimin soruları kendi anahtarı (konu_1, konu_2, ...) altında gelir;
+    konu adları serbest metin olduğundan şema anahtarı olarak kullanılmaz.
+    """
+    slot_lines = "\n".join(
+        f"- {_slot_key(i)}: {topic} (zorluk: {difficulty}, {count} soru)"
+        for i, (topic, difficulty, count) in enumerate(slots)
+    )
+
+    prompt = f"""
+Aşağıdaki her konu için belirtilen zorlukta ve sayıda çoktan seçmeli soru oluştur.
+Her konunun sorularını JSON yanıtında yanındaki anahtarın altına yaz:
+
+{slot_lines}
+
+Her soru için kurallar:
+
+1. Her soru açık ve net olmalı.
+2. 4 farklı seçenek içermeli.
+3. Yalnızca 1 doğru cevap olmalı.
+4. Doğru cevap pozisyon olarak (A/B/C/D) belirtilmeli.
+5. Kısa açıklama (çözüm) eklenmeli.
+6. Şıklar birden fazla doğru içeremez.
+7. Sorular yalnızca ait oldukları anahtarın konusuyla ilgili olmalı.
+
+Lütfen aşağıdaki JSON formatında yanıt ver:
+
+{{
+  "{_slot_key(0)}": [
+    {{
+      "question": "Soru metni",
+      "options": ["option1", "option2", "option3", "option4"],
+      "correct_answer": "B",
+      "explanation": "Kısa açıklama"
+    }},
+    ...
+  ],
+  ...
+}}
+    """
+
+    system_instruction = "Bu bir test uygulamasıdır. Lütfen sadece geçerli JSON formatı döndür. Şıklar arasında sadece bir doğru olsun."
+
+    schema = {
+        "type": "object",
+        "required": [_slot_key(i) for i in range(len(slots))],
+        "properties": {
+            _slot_key(i): {"type": "array", "minItems": count, "items": QUESTION_ITEM_SCHEMA}
+            for i, (_, _, count) in enumerate(slots)
+        }
+    }
+
+    return prompt, system_instruction, schema
+
+
+def _request_multi_topic_questions(slots: list[tuple]) -> list[list[Question]]:
+    """
+    Tek bir Gemini isteğiyle tüm dilimlerin sorularını üretir; dilim sırasıyla soru listeleri döndürür.
+    """
+    logger.info("_request_multi_topic_questions çağrıldı: %s konu, %s soru", len(slots), sum(c for _, _, c in slots))
+
+    prompt, system_instruction, schema = _build_multi_topic_request(slots)
+    response = call_gemini_json_response(prompt, system_instruction, schema)
+    if isinstance(response, str):
+        response = json_codec.loads(response)
+
+    results = []
+    for i, (topic, _, _) in enumerate(slots):
+        formatted_questions = []
+        for item in response.get(_slot_key(i)) or []:
+            try:
+                formatted_questions.append(_format_question(item, topic))
+            except (KeyError, IndexError, ValueError, AttributeError) as e:
+                logger.warning("Hatalı soru atlandı (%s): %s", topic, e)
+        results.append(formatted_questions)
+    return results
+
+
+def _generate_slot_group(slots: list[tuple]) -> list[list[Question]]:
+    """
+    Dilimleri tek istekte üretir, sonra her konuyu ayrı ayrı tekilleştirip eksiklerini
+    konu bazlı ek isteklerle tamamlar. Tek dilimlik grup doğrudan konu bazlı yola gider.
+    """
+    if len(slots) == 1:
+        return [_generate_topic_batch(*slots[0])]
+
+    try:
+        batches = _request_multi_topic_questions(slots)
+    except Exception as e:
+        logger.error("Çok konulu istek başarısız, konular tek tek tamamlanacak → %s", e)
+        batches = [[] for _ in slots]
+
+    results = []
+    for (topic, difficulty, count), batch in zip(slots, batches):
+        questions = []
+        seen_stems = []
+        _merge_unique(questions, batch, seen_stems)
+        errors = []
+        for _ in _iter_top_up(topic, difficulty, count, questions, seen_stems, errors):
+            pass
+        if not questions and errors:
+            logger.error("Soru üretilemedi (%s) → %s", topic, errors[-1])
+        elif len(questions) < count:
+            logger.warning("Konu için istenen sayıya ulaşılamadı (%s): %s/%s", topic, len(questions), count)
+        _save_to_bank(topic, difficulty, questions)
+        results.append(questions[:count])
+    return results
+
+
+QUESTION_STRATEGIES = ("single", "per_topic", "hybrid")
+DEFAULT_QUESTION_STRATEGY = os.getenv("EDUWISE_QUESTION_STRATEGY", "hybrid")
+# hybrid: toplamı bu sınırı aşmayan küçük konular tek istekte birleştirilir
+MULTI_TOPIC_MAX_QUESTIONS = 20
+
+
+def plan_question_groups(jobs: list[tuple], strategy: str = "hybrid",
+                         max_questions: int = MULTI_TOPIC_MAX_QUESTIONS) -> list[list[tuple]]:
+    """
+    (topic, difficulty, count) işlerini isteklere böler; her grup tek bir çağrıdır
+    (tek elemanlı gruplar konu bazlı üretilir).
+    - single: tüm konular tek istekte
+    - per_topic: her konu ayrı istekte
+    - hybrid: toplam max_questions'ı aşmıyorsa tek istek; aşıyorsa QUESTION_BATCH_SIZE ve
+      üzeri konular ayrı, küçük konular sırayla max_questions'a kadar paketlenir
+    """
+    if strategy not in QUESTION_STRATEGIES:
+        raise ValueError(f"Bilinmeyen soru üretim stratejisi: {strategy}")
+    if not jobs:
+        return []
+    if strategy == "single":
+        return [list(jobs)]
+    if strategy == "per_topic":
+        return [[job] for job in jobs]
+    if sum(count for _, _, count in jobs) <= max_questions:
+        return [list(jobs)]
+
+    groups = []
+    current = []
+    current_total = 0
+    for job in jobs:
+        count = job[2]
+        if count >= QUESTION_BATCH_SIZE:
+            groups.append([job])
+            continue
+        if current and current_total + count > max_questions:
+            groups.append(current)
+            current, current_total = [], 0
+        current.append(job)
+        current_total += count
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _generate_topic_batch(topic: str, difficulty: str, count: int) -> list[Question]:
+    # Sorular _format_question içinde Question.from_dict ile doğrulanmış olarak gelir
+    return generate_question_for_topic(topic=topic, difficulty=difficulty, count=count)
+
+
+@profiling.profiled
+def generate_questions_from_analysis(analysis: list, total_questions: int, max_parallel: int = 4,
+                                     strategy: str = None) -> list:
+    """
+    Seçilen konuların sorularını plan_question_groups'un belirlediği isteklerle üretir;
+    istekler en fazla max_parallel eşzamanlı yürür. Bir istekteki hata diğerlerini
+    etkilemez; çıktı sırası konu sırasına göre sabittir. max_parallel=1 verilirse
+    istekler sırayla yapılır. strategy verilmezse EDUWISE_QUESTION_STRATEGY kullanılır.
+    """
+    strategy = strategy or DEFAULT_QUESTION_STRATEGY
+    logger.info("generate_questions_from_analysis çağrıldı, toplam soru sayısı: %s, max_parallel: %s, strateji: %s",
+                total_questions, max_parallel, strategy)
 
     weighted_topics = [item["topic"] for item in analysis]
     weights = [item["weight"] for item in analysis]
@@ -181,35 +605,31 @@ def generate_questions_from_analysis(analysis: list, total_questions: int) -> li
     for topic in selected_topics:
         topic_counts[topic] = topic_counts.get(topic, 0) + 1
 
-    generated_questions = []
-
+    jobs = []
     for topic, count in topic_counts.items():
         difficulty = next((item["difficulty"] for item in analysis if item["topic"] == topic), "medium")
+        jobs.append((topic, difficulty, count))
 
-        try:
-            question_batch = generate_question_for_topic(topic=topic, difficulty=difficulty, count=count)
-
-            for q in question_batch:
-                if not all(k in q for k in ["question", "options", "correct_answer", "explanation"]):
-                    raise ValueError("Eksik alan var")
+    groups = plan_question_groups(jobs, strategy)
+    logger.info("%s konu %s istekte üretilecek.", len(jobs), len(groups))
 
-                options = q["options"]
-                correct = q["correct_answer"].strip().upper()
+    questions_by_job = {}
 
-                if correct not in ["A", "B", "C", "D"]:
-                    raise ValueError("Geçersiz doğru cevap formatı")
+    with ThreadPoolExecutor(max_workers=max(1, min(max_parallel, len(groups) or 1))) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, profiling.call_in_run, _generate_slot_group, group)
+            for group in groups
+        ]
 
-                generated_questions.append({
-                    "question": q["question"],
-                    "options": options,
-                    "correct_answer": correct,
-                    "explanation": q["explanation"],
-                    "topic": topic
-                })
+        for group, future in zip(groups, futures):
+            try:
+                questions_by_job.update(zip(group, future.result()))
+            except Exception as e:
+                logger.error("Soru üretilemedi (%s) → %s", ', '.join(topic for topic, _, _ in group), e)
+                continue
 
-        except Exception as e:
-            logger.error(f"Soru üretilemedi ({topic}) → {e}")
-            continue
+    # Sonuçlar tamamlanma ya da gruplanma sırasına değil, konu sırasına göre toplanır
+    generated_questions = [q for job in jobs for q in questions_by_job.get(job, [])]
 
-    logger.info(f"generate_questions_from_analysis tamamlandı, toplam üretilen soru: {len(generated_questions)}")
+    logger.info("generate_questions_from_analysis tamamlandı, toplam üretilen soru: %s", len(generated_questions))
     return generated_questions
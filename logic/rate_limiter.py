@@ -0,0 +1,336 @@
+"""
+Gemini istekleri için istemci tarafı zamanlayıcı.
+
+Dört parçadan oluşur:
+- TokenBucket: dakikalık istek (RPM) ve girdi token (TPM) kotası
+- AdaptiveConcurrency: 429 ve gecikmeye göre AIMD ile ayarlanan eşzamanlılık sınırı
+- RetryPolicy: geçici hatalarda jitter'lı üstel geri çekilme (sunucu bekleme süresi verirse o kullanılır)
+- CircuitBreaker: art arda sunucu/ağ hatalarında istekleri bir süre hemen reddeder
+
+GeminiScheduler bunları tek bir akış çağrısı etrafında birleştirir. Akış ilk parçayı
+verdikten sonra oluşan hatalar yeniden denenmez; aksi hâlde çağıran aynı metni iki kez alırdı.
+"""
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from logger import get_logger
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+logger = get_logger(__name__)
+
+# Yeniden denenebilir HTTP durum kodları
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(RuntimeError):
+    """Devre kesici açıkken yapılan çağrılarda fırlatılır."""
+
+
+def status_code(error: BaseException):
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return code
+    response = getattr(error, "response", None)
+    code = getattr(response, "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    return status_code(error) == 429
+
+
+def is_transient(error: BaseException) -> bool:
+    if status_code(error) in TRANSIENT_STATUS_CODES:
+        return True
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    return httpx is not None and isinstance(error, httpx.TransportError)
+
+
+def retry_after(error: BaseException):
+    """
+    Hata ayrıntılarında sunucunun önerdiği bekleme süresi (ör. RetryInfo.retryDelay "12s") varsa saniye olarak döndürür.
+    """
+    details = getattr(error, "details", None)
+    if isinstance(details, dict):
+        details = details.get("error", details).get("details", [])
+    for detail in details if isinstance(details, list) else []:
+        delay = detail.get("retryDelay") if isinstance(detail, dict) else None
+        match = re.fullmatch(r"(\d+(?:\.\d+)?)s", str(delay or ""))
+        if match:
+            return float(match.group(1))
+    return None
+
+
+class TokenBucket:
+    """
+    Dakikada rate_per_minute birim dolan kova. rate_per_minute boş/0 ise sınırsızdır.
+    Kapasiteden büyük istekler kova dolduğunda geçer; settle ile tahmin sonradan düzeltilebilir.
+    """
+
+    def __init__(self, rate_per_minute: float = None, capacity: float = None, clock=time.monotonic):
+        self.rate = (rate_per_minute or 0) / 60.0
+        self.capacity = capacity or rate_per_minute or 0
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate <= 0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1) -> float:
+        """
+        amount birim alınana kadar bekler; beklenen süreyi (sn) döndürür.
+        """
+        if self.unlimited:
+            return 0.0
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                delay = (amount - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def settle(self, estimated: float, actual: float):
+        """
+        Tahminle alınan miktarı gerçekleşen miktara göre düzeltir (kova eksiye düşebilir).
+        """
+        if self.unlimited or actual is None:
+            return
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= actual - min(estimated, self.capacity)
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD eşzamanlılık sınırı: her başarılı istekte sınır 1/limit artar (yaklaşık tur başına +1),
+    429'da ya da ilk parçaya kadar geçen süre latency_target'ı aştığında decrease_factor ile çarpılır.
+    """
+
+    def __init__(self, initial: int = 8, minimum: int = 1, maximum: int = 16,
+                 decrease_factor: float = 0.5, latency_target: float = None):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease_factor = decrease_factor
+        self.latency_target = latency_target
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self):
+        """
+        Sınır izin verene kadar bekler; yer alındığı anı (monotonic) döndürür, record'a verilir.
+        """
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+        try:
+            yield time.monotonic()
+        finally:
+            with self._cond:
+                self.in_flight -= 1
+                self._cond.notify_all()
+
+    def record(self, started: float, latency: float = None, throttled: bool = False):
+        with self._cond:
+            slow = self.latency_target is not None and latency is not None and latency > self.latency_target
+            if throttled or slow:
+                # Son azaltmadan önce başlamış isteklerin hataları eski sınıra aittir; tur başına tek azaltma
+                if started >= self._last_decrease:
+                    self.limit = max(self.minimum, self.limit * self.decrease_factor)
+                    self._last_decrease = time.monotonic()
+                    logger.info("Gemini eşzamanlılık sınırı düşürüldü: %s", int(self.limit))
+            else:
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+
+class RetryPolicy:
+    """
+    Jitter'lı üstel geri çekilme: deneme n için bekleme U(0, min(max_delay, base_delay * 2**n)).
+    """
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 1.0, max_delay: float = 30.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, error: BaseException = None) -> float:
+        suggested = retry_after(error) if error is not None else None
+        if suggested is not None:
+            return min(self.max_delay, suggested) + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    failure_threshold art arda hatadan sonra reset_timeout boyunca açılır ve çağrıları reddeder;
+    süre dolunca tek bir deneme çağrısına izin verir (yarı açık), başarılıysa kapanır.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == "open":
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    raise CircuitOpenError("Gemini geçici olarak kullanılamıyor (devre kesici açık)")
+                self.state = "half_open"
+                self._trial_running = False
+            if self.state == "half_open":
+                if self._trial_running:
+                    raise CircuitOpenError("Gemini devre kesicisi deneme çağrısını bekliyor")
+                self._trial_running = True
+
+    def record_success(self):
+        with self._lock:
+            if self.state != "closed":
+                logger.info("Gemini devre kesicisi kapandı.")
+            self.state = "closed"
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    logger.warning("Gemini devre kesicisi açıldı (%s art arda hata).", self.failures)
+                self.state = "open"
+                self._opened_at = self._clock()
+
+    def record_neutral(self):
+        # İstemci kaynaklı hata, 429 ya da erken kapatılan akış: servisin durumu hakkında
+        # bilgi vermez, sayaç değişmez. Yarı açıkta kalınır; yalnızca başarılı deneme kapatır
+        with self._lock:
+            self._trial_running = False
+
+
+class GeminiScheduler:
+    def __init__(self, rpm: float = None, tpm: float = None, concurrency: AdaptiveConcurrency = None,
+                 retry: RetryPolicy = None, breaker: CircuitBreaker = None):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.concurrency = concurrency or AdaptiveConcurrency()
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+        self.failed = 0
+        self.waited_s = 0.0
+
+    def _count(self, name: str, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def stream(self, open_stream, estimated_tokens: int = 0, count_tokens=None):
+        """
+        open_stream() ile açılan akışın parçalarını kota, eşzamanlılık, yeniden deneme ve
+        devre kesici kurallarıyla döndürür. count_tokens(chunk) gerçekleşen girdi token
+        sayısını verirse TPM kovası tahminden gerçeğe göre düzeltilir.
+        """
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            waited = self.requests.acquire(1) + self.tokens.acquire(estimated_tokens)
+            self._count("waited_s", waited)
+            self._count("calls")
+
+            yielded = False
+            first_chunk = None
+            actual_tokens = None
+            settled = False
+            with self.concurrency.slot() as started:
+                try:
+                    for chunk in open_stream():
+                        if first_chunk is None:
+                            first_chunk = time.monotonic() - started
+                        yielded = True
+                        if count_tokens is not None:
+                            actual_tokens = count_tokens(chunk) or actual_tokens
+                        yield chunk
+                except Exception as e:
+                    settled = True
+                    latency = first_chunk if first_chunk is not None else time.monotonic() - started
+                    throttled = is_rate_limited(e)
+                    transient = is_transient(e)
+                    self.concurrency.record(started, latency, throttled=throttled)
+                    if throttled:
+                        self._count("throttled")
+                        self.breaker.record_neutral()
+                    elif transient:
+                        self.breaker.record_failure()
+                    else:
+                        self.breaker.record_neutral()
+
+                    if yielded or not transient or attempt + 1 >= self.retry.max_attempts:
+                        self._count("failed")
+                        raise
+                    delay = self.retry.delay(attempt, e)
+                    logger.warning("Gemini isteği başarısız (%s), %.1f sn sonra yeniden denenecek (deneme %s/%s)",
+                                   e, delay, attempt + 2, self.retry.max_attempts)
+                else:
+                    settled = True
+                    # latency_target ilk parçaya kadar geçen süreyle karşılaştırılır; akışın
+                    # toplam süresi yanıtın uzunluğuna bağlıdır
+                    latency = first_chunk if first_chunk is not None else time.monotonic() - started
+                    self.concurrency.record(started, latency)
+                    self.breaker.record_success()
+                    self.tokens.settle(estimated_tokens, actual_tokens)
+                    return
+                finally:
+                    if not settled:
+                        # Tüketici akışı erken kapattı (GeneratorExit) ya da BaseException:
+                        # servis hakkında bilgi yok, yarı açık deneme serbest bırakılır
+                        self.breaker.record_neutral()
+                        self.tokens.settle(estimated_tokens, actual_tokens)
+
+            self._count("retries")
+            attempt += 1
+            time.sleep(delay)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "failed": self.failed,
+            "waited_s": round(self.waited_s, 3),
+            "concurrency_limit": int(self.concurrency.limit),
+            "in_flight": self.concurrency.in_flight,
+            "breaker": self.breaker.state,
+        }
@@ -1,7 +1,10 @@
-import json
-from collections import defaultdict
-from logger import logger  # logger.py'deki logger'ı import et
+from logic.columnar_analytics import AnswerColumns, analyze_columns
+from logger import get_logger
+from utils import profiling
 
+logger = get_logger(__name__)
+
+@profiling.profiled
 def analyze_topics_with_weights(test_records, min_questions=5):
     """
     Kullanıcının geçmiş test verilerine göre:
@@ -15,32 +18,32 @@ def analyze_topics_with_weights(test_records, min_questions=5):
         ...
     ]
     """
-    logger.info(f"analyze_topics_with_weights fonksiyonu çağrıldı, kayıt sayısı: {len(test_records)}")
+    logger.info("analyze_topics_with_weights fonksiyonu çağrıldı, kayıt sayısı: %s", len(test_records))
     
-    topic_stats = defaultdict(lambda: {"correct": 0, "wrong": 0})
-
     try:
-        for _, _, test_json, correct, wrong, _ in test_records:
-            try:
-                test_data = json.loads(test_json)
-            except json.JSONDecodeError as e:
-                logger.error(f"JSON decode error: {e} - Data: {test_json}")
-                continue  # Bozuk json geçilsin
+        columns = AnswerColumns.from_test_jsons(test_json for _, _, test_json, _, _, _ in test_records)
+        return analyze_columns(columns, min_questions)
+
+    except Exception as e:
+        logger.exception("analyze_topics_with_weights fonksiyonunda beklenmeyen hata: %s", e)
+        raise  # İstersen burada hatayı yukarı fırlatabilirsin
 
-            for q in test_data:
-                topic = q.get("topic", "GENEL")
-                if q["user_answer"] == q["correct_answer"]:
-                    topic_stats[topic]["correct"] += 1
-                else:
-                    topic_stats[topic]["wrong"] += 1
 
+@profiling.profiled
+def analyze_topic_stats(topic_stats, min_questions=5):
+    """
+    {"Konu A": {"correct": 3, "wrong": 7}, ...} biçimindeki konu sayaçlarından
+    analyze_topics_with_weights ile aynı analizi üretir. Sayaçlar doğrudan
+    veritabanı toplamlarından geldiğinde geçmiş JSON'ların çözülmesine gerek kalmaz.
+    """
+    try:
         analysis = []
         total_inverse_success = 0
 
         for topic, stats in topic_stats.items():
             total = stats["correct"] + stats["wrong"]
             if total < min_questions:
-                logger.debug(f"'{topic}' konusu yetersiz veri ({total} soru), atlandı.")
+                logger.debug("'%s' konusu yetersiz veri (%s soru), atlandı.", topic, total)
                 continue
 
             success_rate = stats["correct"] / total
@@ -67,9 +70,9 @@ def analyze_topics_with_weights(test_records, min_questions=5):
 
         analysis.sort(key=lambda x: x["success_rate"])
 
-        logger.info(f"analyze_topics_with_weights fonksiyonu başarıyla tamamlandı, {len(analysis)} konu analiz edildi.")
+        logger.info("analyze_topic_stats başarıyla tamamlandı, %s konu analiz edildi.", len(analysis))
         return analysis
-    
+
     except Exception as e:
-        logger.exception(f"analyze_topics_with_weights fonksiyonunda beklenmeyen hata: {e}")
-        raise  # İstersen burada hatayı yukarı fırlatabilirsin
+        logger.exception("analyze_topic_stats fonksiyonunda beklenmeyen hata: %s", e)
+        raise
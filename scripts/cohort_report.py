@@ -0,0 +1,198 @@
+"""
+Tüm kullanıcılar için konu zayıflık raporu (Streamlit gerekmez).
+
+Her kullanıcı için analyze_topics_with_weights çıktısının aynısı (konu, başarı
+oranı, zorluk, ağırlık) ve kohort genelinde konu toplamları hesaplanır.
+Kullanıcılar parçalara bölünür; her parça bir süreç havuzu işçisinde kendi
+DB bağlantısıyla, user_topic_stats üzerinden kolon tabanlı olarak analiz edilir.
+İşçiler "spawn" ile başlatılır: fork ile üst sürecin sqlite bağlantısı ve bağlantı
+yöneticisi önbelleği işçilere kopyalanırdı.
+
+Kullanım (proje kök dizininden):
+    python -m scripts.cohort_report --output reports/cohort.json
+    python -m scripts.cohort_report --output reports/cohort.csv --workers 4
+
+CSV biçiminde kullanıcı satırları verilen dosyaya, kohort konu toplamları
+aynı adın .topics.csv uzantılı kardeşine yazılır.
+"""
+import argparse
+import csv
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from data.connection import DEFAULT_DB_PATH
+from data.db_manager import DBManager
+from logger import logger
+from logic.columnar_analytics import analyze_columns_by_user, user_topic_counts
+from utils import json_codec
+
+USER_FIELDS = ["user", "rank", "topic", "success_rate", "difficulty", "weight"]
+TOPIC_FIELDS = [
+    "topic", "users", "answers", "correct", "wrong", "success_rate",
+    "mean_user_success_rate", "rated_users", "weak_users", "weak_share",
+]
+
+_worker_db = None
+
+
+def _init_worker(db_path):
+    global _worker_db
+    # Her parça için INFO logu yazmak hem gürültü hem de aynı log dosyasına çok süreçli yazma demek
+    logger.setLevel(logging.WARNING)
+    _worker_db = DBManager(db_path)
+
+
+def analyze_chunk(users, min_questions, db=None):
+    """
+    Bir kullanıcı parçasını analiz eder: ({user: analysis}, {topic: kısmi kohort sayaçları}).
+    Kısmi sayaçlar merge_topic_totals ile birleştirilir.
+    """
+    db = db or _worker_db
+    columns = db.get_answer_columns(users)
+    analyses = analyze_columns_by_user(columns, min_questions)
+
+    correct, wrong = user_topic_counts(columns)
+    total = correct + wrong
+    rated = total >= min_questions
+    rates = np.divide(correct, total, out=np.zeros(total.shape), where=total > 0)
+    # Zayıf konu: yeterli verisi olan ve başarı oranı %50'nin altında kalan ("easy" bandı)
+    weak = rated & (rates < 0.5)
+
+    topic_totals = {}
+    for index, topic in enumerate(columns.topics):
+        topic_totals[topic] = {
+            "users": int(np.count_nonzero(total[:, index])),
+            "correct": int(correct[:, index].sum()),
+            "wrong": int(wrong[:, index].sum()),
+            "rated_users": int(np.count_nonzero(rated[:, index])),
+            "weak_users": int(np.count_nonzero(weak[:, index])),
+            "rate_sum": float(rates[rated[:, index], index].sum()),
+        }
+    return analyses, topic_totals
+
+
+def merge_topic_totals(partials):
+    merged = {}
+    for partial in partials:
+        for topic, counts in partial.items():
+            target = merged.setdefault(topic, dict.fromkeys(counts, 0))
+            for key, value in counts.items():
+                target[key] += value
+
+    rows = []
+    for topic, counts in merged.items():
+        answers = counts["correct"] + counts["wrong"]
+        rated = counts["rated_users"]
+        rows.append({
+            "topic": topic,
+            "users": counts["users"],
+            "answers": answers,
+            "correct": counts["correct"],
+            "wrong": counts["wrong"],
+            "success_rate": round(counts["correct"] / answers * 100, 2) if answers else 0,
+            "mean_user_success_rate": round(counts["rate_sum"] / rated * 100, 2) if rated else None,
+            "rated_users": rated,
+            "weak_users": counts["weak_users"],
+            "weak_share": round(counts["weak_users"] / rated, 3) if rated else None,
+        })
+    rows.sort(key=lambda row: row["success_rate"])
+    return rows
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def build_report(db_path, workers=None, chunk_size=200, min_questions=5):
+    db = DBManager(db_path)
+    users = db.get_users()
+    # Havuz açılmadan önce üst sürecin bağlantısı kapatılır
+    db.close()
+    chunks = _chunks(users, chunk_size)
+    workers = min(workers or os.cpu_count() or 1, len(chunks)) or 1
+
+    if workers == 1:
+        results = [analyze_chunk(chunk, min_questions, db) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(db_path,)) as pool:
+            results = list(pool.map(analyze_chunk, chunks, [min_questions] * len(chunks)))
+
+    analyses = {}
+    for chunk_analyses, _ in results:
+        analyses.update(chunk_analyses)
+    return {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "db": db_path,
+        "min_questions": min_questions,
+        "user_count": len(users),
+        "workers": workers,
+        "topics": merge_topic_totals(partial for _, partial in results),
+        "users": analyses,
+    }
+
+
+def write_json(report, path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json_codec.dumps(report, pretty=True))
+
+
+def write_csv(report, path):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=USER_FIELDS)
+        writer.writeheader()
+        for user, analysis in report["users"].items():
+            for rank, item in enumerate(analysis, start=1):
+                writer.writerow({"user": user, "rank": rank, **item})
+
+    topics_path = os.path.splitext(path)[0] + ".topics.csv"
+    with open(topics_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=TOPIC_FIELDS)
+        writer.writeheader()
+        writer.writerows(report["topics"])
+    return topics_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kohort genelinde konu zayıflık raporu")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH,
+                        help="Veritabanı dosyası (varsayılan EDUWISE_DB_PATH ya da data/app_data.db)")
+    parser.add_argument("--output", default="reports/cohort_report.json", help="Rapor dosyası (.json veya .csv)")
+    parser.add_argument("--format", choices=["json", "csv"], help="Varsayılan: --output uzantısından")
+    parser.add_argument("--workers", type=int, help="Süreç sayısı (varsayılan: CPU sayısı, 1 = havuzsuz)")
+    parser.add_argument("--chunk-size", type=int, default=200, help="İşçi başına bir seferde analiz edilen kullanıcı")
+    parser.add_argument("--min-questions", type=int, default=5, help="Bir konunun analize girmesi için gereken soru")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.output.lower().endswith(".csv") else "json")
+    if os.path.dirname(args.output):
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
+
+    start = time.perf_counter()
+    report = build_report(args.db, args.workers, args.chunk_size, args.min_questions)
+    elapsed = time.perf_counter() - start
+
+    if fmt == "csv":
+        topics_path = write_csv(report, args.output)
+        print(f"Rapor yazıldı: {args.output}, {topics_path}")
+    else:
+        write_json(report, args.output)
+        print(f"Rapor yazıldı: {args.output}")
+
+    print(f"{report['user_count']} kullanıcı, {len(report['topics'])} konu, "
+          f"{report['workers']} işçi, {elapsed:.2f} sn")
+    for row in report["topics"][:5]:
+        print(f"  {row['topic']}: %{row['success_rate']} başarı, "
+              f"{row['weak_users']}/{row['rated_users']} kullanıcı zayıf")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
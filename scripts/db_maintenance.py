@@ -0,0 +1,113 @@
+"""
+Veritabanı bakım komutları.
+
+Kullanım (proje kök dizininden):
+    python -m scripts.db_maintenance verify-stats
+    python -m scripts.db_maintenance rebuild-stats
+    python -m scripts.db_maintenance migrate
+    python -m scripts.db_maintenance check-indexes
+    python -m scripts.db_maintenance reencode [--dry-run] [--vacuum]
+"""
+import argparse
+import os
+import sys
+
+from data.connection import DEFAULT_DB_PATH
+from data.db_manager import DBManager
+from data.migrations import MIGRATIONS, current_version
+
+
+def verify_stats(db, rebuild):
+    drift = db.verify_user_topic_stats(rebuild=rebuild)
+    if not drift:
+        print("✅ user_topic_stats geçmişle tutarlı.")
+        return 0
+
+    print(f"⚠️ {len(drift)} satırda farklılık bulundu:")
+    for row in drift:
+        print(
+            f"  {row['user']} / {row['topic']} / {row['difficulty']}: "
+            f"beklenen {row['expected_correct']}D-{row['expected_wrong']}Y, "
+            f"tablo {row['actual_correct']}D-{row['actual_wrong']}Y"
+        )
+    if rebuild:
+        print("🔁 Tablo geçmişten yeniden oluşturuldu.")
+        return 0
+    return 1
+
+
+def show_migrations(db):
+    # DBManager açılışında eksik göçler zaten uygulanır; burada yalnızca durum raporlanır
+    version = current_version(db.conn.cursor())
+    print(f"Şema sürümü: v{version}")
+    for number, description, _ in MIGRATIONS:
+        mark = "✅" if number <= version else "⏳"
+        print(f"  {mark} v{number} - {description}")
+    return 0
+
+
+def check_indexes(db):
+    failed = 0
+    for row in db.explain_hot_queries():
+        ok = row["uses_index"] and (not row["temp_sort"] or row["temp_sort_allowed"])
+        failed += not ok
+        print(f"{'✅' if ok else '❌'} {row['query']}: {' | '.join(row['plan'])}")
+    if failed:
+        print(f"{failed} sorgu beklenen indeksi kullanmıyor ya da izin verilmeyen geçici sıralama yapıyor.")
+        return 1
+    print("Tüm sık sorgular indeks kullanıyor.")
+    return 0
+
+
+def reencode(db, dry_run, vacuum):
+    report = db.reencode_blobs(dry_run=dry_run)
+    total_before = total_after = 0
+    for row in report:
+        total_before += row["bytes_before"]
+        total_after += row["bytes_after"]
+        saved = row["bytes_before"] - row["bytes_after"]
+        ratio = row["bytes_after"] / row["bytes_before"] if row["bytes_before"] else 1.0
+        print(
+            f"{row['table']}.{row['column']}: {row['rows']} satır, {row['rewritten']} yeniden yazıldı, "
+            f"{row['bytes_before']:,} -> {row['bytes_after']:,} bayt ({saved:,} kazanç, oran {ratio:.2f}), "
+            f"okuma {row['read_s_before'] * 1000:.1f} ms -> {row['read_s_after'] * 1000:.1f} ms"
+        )
+    print(f"Toplam: {total_before:,} -> {total_after:,} bayt ({total_before - total_after:,} kazanç)")
+
+    if dry_run:
+        print("Deneme modu: veritabanı değiştirilmedi.")
+    elif vacuum:
+        size_before = os.path.getsize(db.db_path)
+        db.vacuum()
+        print(f"VACUUM: dosya {size_before:,} -> {os.path.getsize(db.db_path):,} bayt")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EduWiseAI veritabanı bakım komutları")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH,
+                        help="Veritabanı dosyası (varsayılan EDUWISE_DB_PATH ya da data/app_data.db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("verify-stats", help="user_topic_stats tablosunu geçmişe göre doğrular")
+    sub.add_parser("rebuild-stats", help="user_topic_stats tablosunu geçmişten yeniden hesaplar")
+    sub.add_parser("migrate", help="Eksik şema göçlerini uygular ve sürümü gösterir")
+    sub.add_parser("check-indexes", help="Sık sorguların EXPLAIN QUERY PLAN çıktısını denetler")
+    reencode_parser = sub.add_parser("reencode", help="plan/test gövdelerini geçerli kodlayıcıyla yeniden yazar")
+    reencode_parser.add_argument("--dry-run", action="store_true", help="Yalnızca kazancı raporlar, yazmaz")
+    reencode_parser.add_argument("--vacuum", action="store_true", help="Sonrasında VACUUM ile dosyayı küçültür")
+    args = parser.parse_args(argv)
+
+    db = DBManager(args.db)
+    if args.command in ("verify-stats", "rebuild-stats"):
+        return verify_stats(db, rebuild=args.command == "rebuild-stats")
+    if args.command == "migrate":
+        return show_migrations(db)
+    if args.command == "check-indexes":
+        return check_indexes(db)
+    if args.command == "reencode":
+        return reencode(db, dry_run=args.dry_run, vacuum=args.vacuum)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
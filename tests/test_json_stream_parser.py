@@ -0,0 +1,44 @@
+import unittest
+
+from logic.gemini_api import JsonArrayStreamParser
+
+
+def feed_in_chunks(parser, text, size=3):
+    items = []
+    for start in range(0, len(text), size):
+        items.extend(parser.feed(text[start:start + size]))
+    return items
+
+
+class JsonArrayStreamParserTest(unittest.TestCase):
+    def test_items_are_emitted_as_they_close(self):
+        parser = JsonArrayStreamParser("questions")
+        text = '{"questions": [{"question": "a"}, {"question": "b"}], "extra": 1}'
+
+        self.assertEqual(feed_in_chunks(parser, text), [{"question": "a"}, {"question": "b"}])
+        self.assertTrue(parser.done)
+
+    def test_key_text_inside_earlier_string_value_is_ignored(self):
+        parser = JsonArrayStreamParser("questions")
+        text = ('{"title": "questions", "note": "questions: [1, 2]", "meta": ["x"], '
+                '"questions": [{"question": "a"}]}')
+
+        self.assertEqual(feed_in_chunks(parser, text), [{"question": "a"}])
+        self.assertTrue(parser.done)
+
+    def test_key_in_nested_object_is_ignored(self):
+        parser = JsonArrayStreamParser("questions")
+        text = '{"meta": {"questions": [0]}, "questions": [1, 2]}'
+
+        self.assertEqual(feed_in_chunks(parser, text), [1, 2])
+
+    def test_non_array_value_is_not_streamed(self):
+        parser = JsonArrayStreamParser("questions")
+        text = '{"questions": "none", "other": [1, 2]}'
+
+        self.assertEqual(feed_in_chunks(parser, text), [])
+        self.assertFalse(parser.done)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from logic.rate_limiter import CircuitBreaker, GeminiScheduler, RetryPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RateLimitedError(Exception):
+    code = 429
+
+
+class CircuitBreakerTrialTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=self.clock)
+        self.scheduler = GeminiScheduler(retry=RetryPolicy(max_attempts=1), breaker=self.breaker)
+        self.breaker.record_failure()
+        self.clock.now = 11
+
+    def test_early_closed_trial_keeps_breaker_half_open(self):
+        stream = self.scheduler.stream(lambda: iter(["a", "b"]))
+        self.assertEqual(next(stream), "a")
+        self.assertEqual(self.breaker.state, "half_open")
+        stream.close()
+
+        self.assertNotEqual(self.breaker.state, "closed")
+        self.assertFalse(self.breaker._trial_running)
+
+    def test_rate_limited_trial_keeps_breaker_half_open(self):
+        def open_stream():
+            raise RateLimitedError("429")
+            yield
+
+        with self.assertRaises(RateLimitedError):
+            list(self.scheduler.stream(open_stream))
+
+        self.assertNotEqual(self.breaker.state, "closed")
+        self.assertFalse(self.breaker._trial_running)
+
+    def test_successful_trial_closes_breaker(self):
+        self.assertEqual(list(self.scheduler.stream(lambda: iter(["a"]))), ["a"])
+        self.assertEqual(self.breaker.state, "closed")
+
+
+if __name__ == "__main__":
+    unittest.main()
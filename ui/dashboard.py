@@ -2,7 +2,9 @@ import streamlit as st
 from utils import chart_utils
 from datetime import datetime
 import random
-from logger import logger  # Logger import edildi
+from logger import get_logger
+
+logger = get_logger(__name__)
 
 # Opsiyonel: günlük motivasyon mesajları listesi
 MOTIVATION_QUOTES = [
@@ -15,7 +17,7 @@ MOTIVATION_QUOTES = [
 
 def get_daily_motivation():
     quote = random.choice(MOTIVATION_QUOTES)
-    logger.debug(f"Motivasyon mesajı seçildi: {quote}")
+    logger.debug("Motivasyon mesajı seçildi: %s", quote)
     return quote
 
 def show_dashboard(
@@ -28,7 +30,7 @@ def show_dashboard(
     wrong: int,
     difficulty_stats: dict
 ):
-    logger.info(f"Dashboard gösteriliyor: Kullanıcı = {user_name}")
+    logger.info("Dashboard gösteriliyor: Kullanıcı = %s", user_name)
     
     try:
         st.title("📊 Öğrenme Dashboard")
@@ -60,8 +62,8 @@ def show_dashboard(
         date_str = datetime.now().strftime('%d %B %Y')
         st.caption(f"🗓️ {date_str} itibariyle güncellenmiştir.")
 
-        logger.info(f"Dashboard başarıyla gösterildi: {user_name} - Tarih: {date_str}")
+        logger.info("Dashboard başarıyla gösterildi: %s - Tarih: %s", user_name, date_str)
     
     except Exception as e:
-        logger.exception(f"Dashboard gösterilirken hata oluştu: {e}")
+        logger.exception("Dashboard gösterilirken hata oluştu: %s", e)
         st.error("Bir hata oluştu, lütfen daha sonra tekrar deneyin.")
@@ -1,82 +1,132 @@
 import streamlit as st
 from data.db_manager import DBManager
-import json
-from ui import plan_viewer
-from logger import logger  # logger'ı ekleyelim
+from utils import json_codec
+from ui import plan_viewer, test_page
+from logic.models import AnsweredQuestion
+from logger import get_logger
+
+logger = get_logger(__name__)
 
 db = DBManager()
 
+PAGE_SIZE = 10
+
+
+def _load_page(name, fetch):
+    """
+    session_state'teki imleç yığınının tepesinden bir sayfa özet okur.
+    Fazladan istenen tek satır, daha eski bir sayfanın olup olmadığını gösterir.
+    """
+    cursors = st.session_state.setdefault(f"history_{name}_cursors", [None])
+    rows = fetch(limit=PAGE_SIZE + 1, before=cursors[-1])
+    if not rows and len(cursors) > 1:
+        # Sayfadaki son kayıt silindiyse bir önceki sayfaya dön
+        cursors.pop()
+        rows = fetch(limit=PAGE_SIZE + 1, before=cursors[-1])
+    return rows[:PAGE_SIZE], len(rows) > PAGE_SIZE
+
+
+def _page_controls(name, rows, has_next):
+    cursors = st.session_state[f"history_{name}_cursors"]
+    col1, col2 = st.columns(2)
+    with col1:
+        if len(cursors) > 1 and st.button("⬅️ Daha yeni", key=f"history_{name}_prev"):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        if has_next and st.button("Daha eski ➡️", key=f"history_{name}_next"):
+            # Sıralama (tarih, id) üzerinden olduğu için son satırın bu ikilisi sonraki sayfanın imlecidir
+            cursors.append((rows[-1][1], rows[-1][0]))
+            st.rerun()
+
+
 def show_history(user):
     st.title("📚 Geçmiş Planlar ve Testler")
 
     try:
         st.subheader("📅 Geçmiş Öğrenme Planları")
-        plans = db.get_all_plans(user)
+        plans, has_more_plans = _load_page(
+            "plans", lambda **page: db.get_plan_summaries(user, **page)
+        )
     except Exception as e:
         st.error(f"❌ Planlar yüklenirken hata oluştu: {e}")
-        logger.exception(f"Planlar yüklenirken hata: {e}")
-        plans = []
+        logger.exception("Planlar yüklenirken hata: %s", e)
+        plans, has_more_plans = [], False
 
     if not plans:
         st.info("Hiç plan bulunamadı.")
     else:
-        for plan_id, plan_json, created_at in plans:
-            st.markdown(f"**🕒 Oluşturulma Tarihi:** `{created_at}`")
+        for plan_id, created_at, day_count, topics in plans:
+            st.markdown(f"**🕒 Oluşturulma Tarihi:** `{created_at}` – 📆 {day_count or '?'} gün")
+            if topics:
+                st.caption(", ".join(topics))
             try:
-                plan_data = json.loads(plan_json)
-                with st.expander("📚 Öğrenme Planı"):
-                    plan_viewer.show_learning_plan_simple(plan_data)
+                # Plan gövdesi yalnızca expander açıldığında okunur ve çözülür
+                with st.expander("📚 Öğrenme Planı", key=f"plan_body_{plan_id}", on_change="rerun") as body:
+                    if body.open:
+                        plan_json = db.get_plan_json(plan_id)
+                        if plan_json is None:
+                            st.warning("Plan bulunamadı.")
+                        else:
+                            plan_viewer.show_learning_plan_simple(json_codec.loads(plan_json))
             except Exception as e:
                 st.error(f"❌ Plan gösterilirken hata oluştu: {e}")
-                logger.exception(f"Plan gösterilirken hata: {e}")
+                logger.exception("Plan gösterilirken hata: %s", e)
 
             if st.button(f"🗑️ Sil (Plan #{plan_id})", key=f"del_plan_{plan_id}"):
                 try:
                     db.delete_plan(plan_id)
                     st.success("Plan silindi!")
-                    logger.info(f"Plan #{plan_id} silindi, kullanıcı: {user}")
+                    logger.info("Plan #%s silindi, kullanıcı: %s", plan_id, user)
                     st.rerun()
                 except Exception as e:
                     st.error(f"❌ Plan silinirken hata oluştu: {e}")
-                    logger.exception(f"Plan silinirken hata: {e}")
+                    logger.exception("Plan silinirken hata: %s", e)
+
+        _page_controls("plans", plans, has_more_plans)
 
     st.markdown("---")
 
     try:
         st.subheader("🧪 Test Geçmişi")
-        tests = db.get_all_test_results_specific(user)
+        tests, has_more_tests = _load_page(
+            "tests", lambda **page: db.get_test_result_summaries(user, **page)
+        )
     except Exception as e:
         st.error(f"❌ Test geçmişi yüklenirken hata oluştu: {e}")
-        logger.exception(f"Test geçmişi yüklenirken hata: {e}")
-        tests = []
+        logger.exception("Test geçmişi yüklenirken hata: %s", e)
+        tests, has_more_tests = [], False
 
     if not tests:
         st.info("Hiç test çözülmemiş.")
     else:
-        for test_id, test_json, correct, wrong, created_at in tests:
-            st.markdown(f"**📅 Tarih:** `{created_at}` – ✅ {correct} | ❌ {wrong}")
+        for test_id, created_at, correct, wrong, question_count, topics in tests:
+            st.markdown(
+                f"**📅 Tarih:** `{created_at}` – ✅ {correct} | ❌ {wrong}"
+                + (f" | 📝 {question_count} soru" if question_count is not None else "")
+            )
+            if topics:
+                st.caption(", ".join(topics))
             try:
-                with st.expander(f"📄 Test Detayları (#{test_id})"):
-                    test_data = json.loads(test_json)
-                    for idx, q in enumerate(test_data):
-                        st.markdown(f"**Soru {idx + 1}:** {q['question']}")
-                        if q.get("user_answer") == q["correct_answer"]:
-                            st.markdown(f"- ✅ Doğru Cevap: {q['correct_answer']}")
+                with st.expander(f"📄 Test Detayları (#{test_id})", key=f"test_body_{test_id}", on_change="rerun") as body:
+                    if body.open:
+                        test_json = db.get_test_result_json(test_id)
+                        if test_json is None:
+                            st.warning("Test bulunamadı.")
                         else:
-                            st.markdown(f"- ❌ Kullanıcının Cevap: {q.get('user_answer', 'Cevap yok')}")
-                            st.markdown(f"- ✅ Doğru Cevap: {q['correct_answer']}")
-                        st.markdown(f"- ℹ️ Açıklama: {q['explanation']}")
-                        st.markdown("---")
+                            test_page.show_solutions(json_codec.loads(test_json, type=list[AnsweredQuestion]))
             except Exception as e:
                 st.error(f"❌ Test detayları yüklenirken hata oluştu: {e}")
-                logger.exception(f"Test detayları yüklenirken hata: {e}")
+                logger.exception("Test detayları yüklenirken hata: %s", e)
 
             if st.button(f"🗑️ Sil (Test #{test_id})", key=f"del_test_{test_id}"):
                 try:
                     db.delete_test_results(test_id)
                     st.success("Test silindi!")
-                    logger.info(f"Test #{test_id} silindi, kullanıcı: {user}")
+                    logger.info("Test #%s silindi, kullanıcı: %s", test_id, user)
                     st.rerun()
                 except Exception as e:
                     st.error(f"❌ Test silinirken hata oluştu: {e}")
-                    logger.exception(f"Test silinirken hata: {e}")
+                    logger.exception("Test silinirken hata: %s", e)
+
+        _page_controls("tests", tests, has_more_tests)
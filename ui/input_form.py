@@ -1,6 +1,8 @@
 import streamlit as st
 from datetime import date
-from logger import logger  # logger'ı ekleyelim
+from logger import get_logger
+
+logger = get_logger(__name__)
 
 def get_user_inputs():
     st.header("📚 Öğrenme Hedefini Belirle")
@@ -20,10 +22,10 @@ def get_user_inputs():
                 "start_date": str(start_date),
                 "duration_days": duration_days
             }
-            logger.info(f"Kullanıcı plan girdi oluşturdu: {user_input}")
+            logger.info("Kullanıcı plan girdi oluşturdu: %s", user_input)
             return user_input
         except Exception as e:
             st.error(f"❌ Girdi alınırken hata oluştu: {e}")
-            logger.exception(f"Girdi alınırken hata: {e}")
+            logger.exception("Girdi alınırken hata: %s", e)
 
     return None
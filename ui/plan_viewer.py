@@ -1,20 +1,22 @@
 import streamlit as st
-import pandas as pd
 from utils import pdf_exporter
 from datetime import datetime
-import json
-from logic.question_generator import generate_question_for_topic
+from utils import json_codec
+from logic.question_generator import iter_questions_for_user
+from ui import test_page
+from logic.models import PlanDay
 from data.db_manager import DBManager
-from logger import logger  # logger.py'den import
+from logger import get_logger
+
+logger = get_logger(__name__)
 
 def show_learning_plan(json_output: dict):
     db = DBManager()
     st.header("🗓️ Öğrenme Planı")
 
     tum_konular = json_output.get("tum_konular", [])
-    calisma_plani = json_output.get("calisma_plani", [])
+    calisma_plani = [PlanDay.coerce(row) for row in json_output.get("calisma_plani", [])]
 
-    df = pd.DataFrame(calisma_plani)
     bugun = datetime.today().date()
 
     with st.expander("📚 Tüm Konular ve Alt Konular"):
@@ -25,49 +27,48 @@ def show_learning_plan(json_output: dict):
 
     st.markdown("### 📋 Günlük Çalışma Planı")
     with st.container():
-        for i, row in df.iterrows():
+        for i, row in enumerate(calisma_plani):
             st.markdown("---")
             col1, col2, col3 = st.columns([3, 3, 1])
 
-            try:
-                plan_tarihi = datetime.strptime(row['tarih'], "%Y-%m-%d").date()
-            except Exception as e:
-                logger.warning(f"Tarih parse hatası: {row.get('tarih')} - {e}")
-                plan_tarihi = None
+            plan_tarihi = row.plan_date
+            if plan_tarihi is None:
+                logger.warning("Tarih parse hatası: %s", row.tarih)
 
             with col1:
-                tarih_gosterimi = f"**{row.get('tarih', '')} - {row.get('konu', '')} / {row.get('alt_konu', '')}**"
+                tarih_gosterimi = f"**{row.tarih} - {row.konu} / {row.alt_konu}**"
                 if plan_tarihi == bugun:
                     tarih_gosterimi = "⭐ " + tarih_gosterimi
                 st.markdown(tarih_gosterimi)
-                st.markdown(f"🎯 Görev: *{row.get('gorev', '')}*")
+                st.markdown(f"🎯 Görev: *{row.gorev}*")
 
             with col2:
-                st.markdown(f"🧩 Etkinlik: `{row.get('etkinlik', '')}` | 🔁 Tekrar: `{row.get('tekrar', '')}` | 📝 Soru Çöz: `{row.get('soru_coz', '')}`")
+                st.markdown(f"🧩 Etkinlik: `{row.etkinlik}` | 🔁 Tekrar: `{row.tekrar}` | 📝 Soru Çöz: `{row.soru_coz}`")
 
             with col3:
-                if row.get('soru_coz'):
+                if row.soru_coz:
                     if st.button(f"Test Üret", key=f"test_btn_{i}"):
                         try:
                             st.info("🤖 AI tarafından test oluşturuluyor...")
-                            questions = generate_question_for_topic(
-                                topic=row.get('gorev', ''),
+                            questions = test_page.show_questions_stream(iter_questions_for_user(
+                                user=st.session_state.user,
+                                topic=row.gorev,
                                 difficulty="medium",
                                 count=40
-                            )
+                            ))
 
                             if questions and isinstance(questions, list):
-                                db.save_test(user=st.session_state.user, test_json=json.dumps(questions))
+                                db.save_test(user=st.session_state.user, test_json=json_codec.dumps(questions))
                                 st.session_state.question_json = questions
-                                st.success(f"✅ '{row.get('gorev', '')}' konusu için test üretildi.")
-                                logger.info(f"Test başarıyla üretildi: {row.get('gorev', '')}")
+                                st.success(f"✅ '{row.gorev}' konusu için test üretildi.")
+                                logger.info("Test başarıyla üretildi: %s", row.gorev)
                             else:
                                 st.error("❌ Soru üretilemedi.")
-                                logger.error(f"Soru üretilemedi: {row.get('gorev', '')}")
+                                logger.error("Soru üretilemedi: %s", row.gorev)
 
                         except Exception as e:
                             st.error(f"❌ Test üretirken hata oluştu: {e}")
-                            logger.exception(f"Test üretirken hata: {e}")
+                            logger.exception("Test üretirken hata: %s", e)
 
             st.markdown(" ")
 
@@ -76,7 +77,7 @@ def show_learning_plan_simple(json_output: dict):
     st.header("🗓️ Öğrenme Planı")
     db = DBManager()
     tum_konular = json_output.get("tum_konular", [])
-    calisma_plani = json_output.get("calisma_plani", [])
+    calisma_plani = [PlanDay.coerce(row) for row in json_output.get("calisma_plani", [])]
 
     with st.expander("📚 Tüm Konular ve Alt Konular"):
         for konu in tum_konular:
@@ -86,38 +87,59 @@ def show_learning_plan_simple(json_output: dict):
 
     st.subheader("📌 Günlük Plan")
     for i, row in enumerate(calisma_plani):
-        st.markdown(f"### 📅 Gün {row.get('gun')}: {row.get('konu')} > {row.get('alt_konu')}")
-        st.markdown(f"- **Etkinlik:** {row.get('etkinlik')}")
-        st.markdown(f"- **Görev:** {row.get('gorev')}")
-        st.markdown(f"- **Tarih:** {row.get('tarih')}")
-        st.markdown(f"- **Tekrar:** {'Evet' if row.get('tekrar') else 'Hayır'}")
-        st.markdown(f"- **Soru Çözümü:** {'Evet' if row.get('soru_coz') else 'Hayır'}")
-
-        if row.get('soru_coz'):
-            unique_key = f"test_btn_{i}_{row.get('gun')}_{row.get('gorev')}"
+        _render_day_summary(row)
+
+        if row.soru_coz:
+            unique_key = f"test_btn_{i}_{row.gun}_{row.gorev}"
             if st.button("🧪 Test Üret", key=unique_key):
                 try:
                     st.info("🤖 AI tarafından test oluşturuluyor...")
-                    questions = generate_question_for_topic(
-                        topic=row.get('gorev', ''),
+                    questions = test_page.show_questions_stream(iter_questions_for_user(
+                        user=st.session_state.user,
+                        topic=row.gorev,
                         difficulty="medium",
                         count=40
-                    )
+                    ))
                     if questions and isinstance(questions, list):
-                        db.save_test(user=st.session_state.user, test_json=json.dumps(questions))
+                        db.save_test(user=st.session_state.user, test_json=json_codec.dumps(questions))
                         st.session_state.question_json = questions
-                        st.success(f"✅ '{row.get('gorev', '')}' konusu için test üretildi.")
-                        logger.info(f"Test başarıyla üretildi: {row.get('gorev', '')}")
+                        st.success(f"✅ '{row.gorev}' konusu için test üretildi.")
+                        logger.info("Test başarıyla üretildi: %s", row.gorev)
                     else:
                         st.error("❌ Soru üretilemedi.")
-                        logger.error(f"Soru üretilemedi: {row.get('gorev', '')}")
+                        logger.error("Soru üretilemedi: %s", row.gorev)
                 except Exception as e:
                     st.error(f"❌ Test üretirken hata oluştu: {e}")
-                    logger.exception(f"Test üretirken hata: {e}")
+                    logger.exception("Test üretirken hata: %s", e)
 
             st.markdown("---")
 
 
+def _render_day_summary(row: PlanDay):
+    st.markdown(f"### 📅 Gün {row.gun}: {row.konu} > {row.alt_konu}")
+    st.markdown(f"- **Etkinlik:** {row.etkinlik}")
+    st.markdown(f"- **Görev:** {row.gorev}")
+    st.markdown(f"- **Tarih:** {row.tarih}")
+    st.markdown(f"- **Tekrar:** {'Evet' if row.tekrar else 'Hayır'}")
+    st.markdown(f"- **Soru Çözümü:** {'Evet' if row.soru_coz else 'Hayır'}")
+
+
+def show_plan_days_stream(day_iter) -> list:
+    """
+    Plan günlerini üretildikçe ekrana basar ve tamamlanan gün listesini döndürür.
+    """
+    st.subheader("📌 Günlük Plan (oluşturuluyor...)")
+    status = st.empty()
+    days = []
+    for row in day_iter:
+        days.append(row)
+        status.caption(f"⏳ {len(days)}. gün hazır")
+        _render_day_summary(row)
+    status.caption(f"✅ {len(days)} günlük plan hazır")
+    logger.info("Plan akışı tamamlandı, gün sayısı: %s", len(days))
+    return days
+
+
 def show_plan(plan_data):
     st.header("📅 Öğrenme Planı")
 
@@ -137,4 +159,4 @@ def show_plan(plan_data):
             logger.info("PDF başarıyla oluşturuldu ve indirme başlatıldı.")
         except Exception as e:
             st.error(f"PDF oluşturulurken hata oluştu: {e}")
-            logger.exception(f"PDF oluşturulurken hata: {e}")
+            logger.exception("PDF oluşturulurken hata: %s", e)
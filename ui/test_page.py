@@ -1,8 +1,41 @@
 import streamlit as st
 from utils import pdf_exporter, chart_utils
 from data.db_manager import DBManager
-import json
-from logger import logger  # logger.py'den import
+from utils import json_codec
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+def show_questions_stream(question_iter) -> list:
+    """
+    Üretilen soruları hazır oldukça önizleme olarak gösterir ve tamamlanan soru listesini döndürür.
+    """
+    status = st.empty()
+    preview = st.container()
+    questions = []
+    for q in question_iter:
+        questions.append(q)
+        status.caption(f"⏳ {len(questions)} soru hazır")
+        with preview:
+            st.markdown(f"**{len(questions)}. {q.question}**")
+            st.caption(" · ".join(q.options))
+    status.caption(f"✅ {len(questions)} soru hazır")
+    logger.info("Soru akışı tamamlandı, soru sayısı: %s", len(questions))
+    return questions
+
+
+def show_solutions(answered_questions):
+    for idx, q in enumerate(answered_questions):
+        st.markdown(f"**Soru {idx + 1}:** {q.question}")
+        if q.is_correct:
+            st.markdown(f"- ✅ Doğru Cevap: {q.correct_answer}")
+        else:
+            st.markdown(f"- ❌ Kullanıcının Cevap: {q.user_answer or 'Cevap yok'}")
+            st.markdown(f"- ✅ Doğru Cevap: {q.correct_answer}")
+
+        st.markdown(f"- ℹ️ Açıklama: {q.explanation}")
+        st.markdown("---")
+
 
 def run_test_page(questions_data):
     st.header("📝 Test Çöz")
@@ -10,13 +43,13 @@ def run_test_page(questions_data):
 
     try:
         questions = questions_data  # ✅ direkt liste olarak ele alıyoruz
-        logger.info(f"Test sayfası için {len(questions)} soru yüklendi.")
+        logger.info("Test sayfası için %s soru yüklendi.", len(questions))
 
         for idx, q in enumerate(questions):
-            st.markdown(f"**{idx + 1}. {q['question']}**")
+            st.markdown(f"**{idx + 1}. {q.question}**")
             user_answers[idx] = st.radio(
                 "Cevabınızı seçin:",
-                options=q["options"],
+                options=q.options,
                 key=f"q_{idx}"
             )
             st.markdown("---")
@@ -24,51 +57,45 @@ def run_test_page(questions_data):
         if st.button("📊 Testi Bitir ve Sonuçları Gör"):
             correct = 0
             wrong = 0
-            
+            answered = []
+
             for idx, q in enumerate(questions):
                 user_ans = user_answers.get(idx)
                 # Kullanıcı cevabı seçmedi ise hata önleme
                 if not user_ans or len(user_ans) == 0:
                     st.warning(f"{idx+1}. soruya cevap vermediniz.")
-                    logger.warning(f"Kullanıcı {idx+1}. soruya cevap vermedi.")
+                    logger.warning("Kullanıcı %s. soruya cevap vermedi.", idx+1)
+                    answered.append(q.answer(None))
                     continue
 
-                questions[idx]["user_answer"] = user_ans[0]  # 💾 kullanıcı cevabını ekle
-                if user_ans[0] == q["correct_answer"]:
+                # 💾 Soru değiştirilmez; cevaplı kopyası kaydedilir
+                answered.append(q.answer(user_ans[0]))
+                if answered[-1].is_correct:
                     correct += 1
                 else:
                     wrong += 1
 
-            logger.info(f"Test tamamlandı. Doğru: {correct}, Yanlış: {wrong}")
+            logger.info("Test tamamlandı. Doğru: %s, Yanlış: %s", correct, wrong)
 
             try:
                 db = DBManager()
                 db.save_test_result(
                     user=st.session_state.user,
-                    test_json=json.dumps(questions),
+                    test_json=json_codec.dumps(answered),
                     correct=correct,
                     wrong=wrong
                 )
                 logger.info("Test sonucu başarıyla veritabanına kaydedildi.")
             except Exception as e:
-                logger.exception(f"Test sonucu veritabanına kaydedilemedi: {e}")
+                logger.exception("Test sonucu veritabanına kaydedilemedi: %s", e)
                 st.error("Test sonucu veritabanına kaydedilirken hata oluştu.")
 
             st.success(f"✅ Doğru: {correct}")
             st.error(f"❌ Yanlış: {wrong}")
 
             st.subheader("📘 Çözümler")
-            for idx, q in enumerate(questions):
-                st.markdown(f"**Soru {idx + 1}:** {q['question']}")
-                if q.get("user_answer") == q["correct_answer"]:
-                    st.markdown(f"- ✅ Doğru Cevap: {q['correct_answer']}")
-                else:
-                    st.markdown(f"- ❌ Kullanıcının Cevap: {q.get('user_answer', 'Cevap yok')}")
-                    st.markdown(f"- ✅ Doğru Cevap: {q['correct_answer']}")
-                
-                st.markdown(f"- ℹ️ Açıklama: {q['explanation']}")
-                st.markdown("---")
+            show_solutions(answered)
 
     except Exception as e:
-        logger.exception(f"Test sayfasında beklenmedik hata oluştu: {e}")
+        logger.exception("Test sayfasında beklenmedik hata oluştu: %s", e)
         st.error("Bir hata oluştu. Lütfen sayfayı yenileyip tekrar deneyin.")
@@ -2,7 +2,9 @@ import logging
 import plotly.graph_objects as go
 import plotly.express as px
 
-from logger import logger  # Logger importu (senin logger.py'den)
+from logger import get_logger
+
+logger = get_logger(__name__)
 
 def plot_daily_progress(dates, target_minutes, actual_minutes):
     logger.info("Günlük çalışma süresi grafiği oluşturuluyor.")
@@ -20,7 +22,7 @@ def plot_daily_progress(dates, target_minutes, actual_minutes):
         logger.info("Günlük çalışma süresi grafiği başarıyla oluşturuldu.")
         return fig
     except Exception as e:
-        logger.exception(f"Günlük çalışma süresi grafiği oluşturulurken hata oluştu: {e}")
+        logger.exception("Günlük çalışma süresi grafiği oluşturulurken hata oluştu: %s", e)
         raise
 
 def plot_topic_distribution(topic_data):
@@ -38,7 +40,7 @@ def plot_topic_distribution(topic_data):
         logger.info("Konu bazlı çalışma dağılımı grafiği başarıyla oluşturuldu.")
         return fig
     except Exception as e:
-        logger.exception(f"Konu bazlı çalışma dağılımı grafiği oluşturulurken hata oluştu: {e}")
+        logger.exception("Konu bazlı çalışma dağılımı grafiği oluşturulurken hata oluştu: %s", e)
         raise
 
 def plot_answer_stats(correct_count, wrong_count):
@@ -56,7 +58,7 @@ def plot_answer_stats(correct_count, wrong_count):
         logger.info("Soru başarı analizi grafiği başarıyla oluşturuldu.")
         return fig
     except Exception as e:
-        logger.exception(f"Soru başarı analizi grafiği oluşturulurken hata oluştu: {e}")
+        logger.exception("Soru başarı analizi grafiği oluşturulurken hata oluştu: %s", e)
         raise
 
 def plot_difficulty_success(stats):
@@ -81,5 +83,5 @@ def plot_difficulty_success(stats):
         logger.info("Zorluk seviyesine göre başarı grafiği başarıyla oluşturuldu.")
         return fig
     except Exception as e:
-        logger.exception(f"Zorluk seviyesine göre başarı grafiği oluşturulurken hata oluştu: {e}")
+        logger.exception("Zorluk seviyesine göre başarı grafiği oluşturulurken hata oluştu: %s", e)
         raise
@@ -0,0 +1,125 @@
+"""
+Uygulama genelinde kullanılan JSON kodlayıcısı.
+
+Kurulu ise orjson, yoksa msgspec, o da yoksa standart json kullanılır;
+EDUWISE_JSON_BACKEND (auto | orjson | msgspec | stdlib) ile seçim zorlanabilir.
+Hangi arka uç seçilirse seçilsin:
+- dumps her zaman str döndürür, girintisiz ve ASCII kaçışsız yazar
+- loads str veya bytes kabul eder, hatada json.JSONDecodeError fırlatır
+- loads(..., type=...) çözülen veriyi doğrudan tipli nesnelere çevirir
+"""
+import json
+import os
+import typing
+from collections import namedtuple
+
+from logger import get_logger
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+logger = get_logger(__name__)
+
+JSONDecodeError = json.JSONDecodeError
+
+Backend = namedtuple("Backend", ["name", "loads", "dumps"])
+
+
+def _default(obj):
+    # Tipli modeller (to_dict sağlayan nesneler) doğrudan yazılabilsin
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"JSON'a çevrilemeyen tip: {type(obj).__name__}")
+    return to_dict()
+
+
+def _stdlib_backend():
+    def dumps(obj, pretty=False):
+        if pretty:
+            return json.dumps(obj, ensure_ascii=False, indent=2, default=_default)
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default)
+
+    return Backend("stdlib", json.loads, dumps)
+
+
+def _orjson_backend():
+    def dumps(obj, pretty=False):
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        return orjson.dumps(obj, default=_default, option=option).decode("utf-8")
+
+    # orjson.JSONDecodeError zaten json.JSONDecodeError alt sınıfıdır
+    return Backend("orjson", orjson.loads, dumps)
+
+
+def _msgspec_backend():
+    encoder = msgspec.json.Encoder(enc_hook=_default)
+    decoder = msgspec.json.Decoder()
+
+    def loads(data):
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise JSONDecodeError(str(e), data if isinstance(data, str) else data.decode("utf-8", "replace"), 0) from e
+
+    def dumps(obj, pretty=False):
+        raw = encoder.encode(obj)
+        return (msgspec.json.format(raw, indent=2) if pretty else raw).decode("utf-8")
+
+    return Backend("msgspec", loads, dumps)
+
+
+def available_backends():
+    """
+    Bu ortamda kullanılabilen arka uçlar, tercih sırasıyla.
+    """
+    backends = {}
+    if orjson is not None:
+        backends["orjson"] = _orjson_backend()
+    if msgspec is not None:
+        backends["msgspec"] = _msgspec_backend()
+    backends["stdlib"] = _stdlib_backend()
+    return backends
+
+
+def _select_backend(name):
+    backends = available_backends()
+    if name == "auto":
+        return next(iter(backends.values()))
+    if name not in backends:
+        logger.warning("EDUWISE_JSON_BACKEND=%s kullanılamıyor, otomatik seçim yapılacak.", name)
+        return next(iter(backends.values()))
+    return backends[name]
+
+
+BACKEND = _select_backend(os.getenv("EDUWISE_JSON_BACKEND", "auto"))
+logger.debug("JSON arka ucu: %s", BACKEND.name)
+
+
+def convert(obj, type):
+    """
+    Çözülmüş JSON verisini type'a çevirir. list[T] ve from_dict sağlayan sınıflar desteklenir.
+    """
+    if typing.get_origin(type) is list:
+        (item_type,) = typing.get_args(type)
+        return [convert(item, item_type) for item in obj]
+    from_dict = getattr(type, "from_dict", None)
+    if from_dict is not None:
+        return from_dict(obj)
+    return type(obj)
+
+
+def loads(data, type=None):
+    if type is None:
+        return BACKEND.loads(data)
+    return convert(BACKEND.loads(data), type)
+
+
+def dumps(obj, pretty=False):
+    return BACKEND.dumps(obj, pretty)
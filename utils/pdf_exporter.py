@@ -7,11 +7,22 @@ from reportlab.lib.enums import TA_CENTER
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 import os
+import time
 from io import BytesIO
 from datetime import datetime
+from logic.models import PlanDay
+from utils import metrics
 
 # logger.py'den import ettiğimizi varsayıyorum
-from logger import logger
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+PDF_BUILD_SECONDS = metrics.histogram("eduwise_pdf_build_seconds", "Plan PDF'inin oluşturulma süresi")
+PDF_BYTES = metrics.histogram(
+    "eduwise_pdf_bytes", "Oluşturulan plan PDF'inin boyutu", buckets=metrics.BYTES_BUCKETS
+)
+
 
 class PDFExporter:
     def __init__(self, title="📘 Öğrenme Planı ve Soru Seti", font_dir="fonts"):
@@ -21,10 +32,10 @@ class PDFExporter:
             self._register_fonts()
             logger.info("Fontlar başarıyla yüklendi.")
         except AssertionError as e:
-            logger.error(f"Font yüklenirken hata oluştu: {e}")
+            logger.error("Font yüklenirken hata oluştu: %s", e)
             raise
         except Exception as e:
-            logger.exception(f"Beklenmeyen bir hata oluştu: {e}")
+            logger.exception("Beklenmeyen bir hata oluştu: %s", e)
             raise
 
     def _register_fonts(self):
@@ -39,6 +50,7 @@ class PDFExporter:
 
     def export_plan_to_pdf(self, plan_data):
         logger.info("PDF oluşturma işlemi başladı.")
+        started = time.perf_counter()
         try:
             buffer = BytesIO()
             doc = SimpleDocTemplate(
@@ -61,21 +73,21 @@ class PDFExporter:
             story.append(Paragraph("📅 Günlük Plan", styles['Heading2']))
             story.append(Spacer(1, 12))
 
-            calisma_plani = plan_data.get("calisma_plani", [])
-            logger.debug(f"Plan verisi {len(calisma_plani)} öğe içeriyor.")
+            calisma_plani = [PlanDay.coerce(item) for item in plan_data.get("calisma_plani", [])]
+            logger.debug("Plan verisi %s öğe içeriyor.", len(calisma_plani))
 
             for index, item in enumerate(calisma_plani):
                 def clean_text(text):
                     return text.replace("’", "'").replace("“", '"').replace("”", '"').replace("–", "-").replace("…", "...")
 
-                gun = item.get("gun", "")
-                konu = clean_text(item.get("konu", ""))
-                alt_konu = clean_text(item.get("alt_konu", ""))
-                etkinlik = clean_text(item.get("etkinlik", ""))
-                gorev = clean_text(item.get("gorev", ""))
-                tarih = item.get("tarih", "")
-                tekrar = "Evet" if item.get("tekrar") else "Hayır"
-                soru_coz = "Evet" if item.get("soru_coz") else "Hayır"
+                gun = item.gun
+                konu = clean_text(item.konu)
+                alt_konu = clean_text(item.alt_konu)
+                etkinlik = clean_text(item.etkinlik)
+                gorev = clean_text(item.gorev)
+                tarih = item.tarih
+                tekrar = "Evet" if item.tekrar else "Hayır"
+                soru_coz = "Evet" if item.soru_coz else "Hayır"
 
                 story.append(Paragraph(f"<b>Gün {gun}: {konu} > {alt_konu}</b>", day_title_style))
                 story.append(Paragraph(f"• Etkinlik: {etkinlik}", content_style))
@@ -89,11 +101,13 @@ class PDFExporter:
 
             doc.build(story)
             buffer.seek(0)
+            PDF_BUILD_SECONDS.observe(time.perf_counter() - started)
+            PDF_BYTES.observe(buffer.getbuffer().nbytes)
             logger.info("PDF başarıyla oluşturuldu.")
             return buffer
 
         except Exception as e:
-            logger.exception(f"PDF oluşturma sırasında hata oluştu: {e}")
+            logger.exception("PDF oluşturma sırasında hata oluştu: %s", e)
             raise
 
 # Örnek kullanım
@@ -130,4 +144,4 @@ if __name__ == "__main__":
             f.write(pdf_buffer.getbuffer())
         logger.info("PDF başarıyla dosyaya kaydedildi: plan.pdf")
     except Exception as e:
-        logger.error(f"PDF oluşturma veya kaydetme işlemi başarısız oldu: {e}")
+        logger.error("PDF oluşturma veya kaydetme işlemi başarısız oldu: %s", e)
@@ -0,0 +1,291 @@
+"""
+İsteğe bağlı profil çıkarma: app.py'deki her sayfa çalıştırması ve logic/ içindeki
+giriş fonksiyonları profile_block / profiled ile sarılır. Kapalıyken maliyeti bir
+ortam değişkeni okumasıdır.
+
+Kipler:
+- cprofile: cProfile çıktısı (.prof; snakeviz ya da pstats ile açılır)
+- sampling: çalıştırmaya katılan tüm iş parçacıklarının (sayfa, soru üretim
+  havuzu, Gemini istek iş parçacıkları) yığınını EDUWISE_PROFILE_INTERVAL
+  saniyede bir örnekler; flamegraph.pl / speedscope için katlanmış yığın (.folded)
+  yazar, her yığının kökü iş parçacığı adıdır
+- both: ikisi birden
+
+cProfile yalnızca çalıştırmayı başlatan iş parçacığını ölçer; havuz ve Gemini
+iş parçacıklarındaki süre orada bekleme olarak görünür.
+
+Profil kararı bir ContextVar'da tutulur; copy_context ile başlatılan iş
+parçacıkları (soru havuzu, Gemini tek-uçuş iş parçacığı) aynı çalıştırmaya katılır
+ve kendi kararlarını vermez.
+
+Ortam değişkenleri:
+- EDUWISE_PROFILE: kip (varsayılan kapalı; "1" cprofile demektir)
+- EDUWISE_PROFILE_RATE: profillenecek çalıştırma oranı (0–1, varsayılan 1)
+- EDUWISE_PROFILE_DIR: çıktı dizini (varsayılan "profiles")
+- EDUWISE_PROFILE_INTERVAL: örnekleme aralığı (sn, varsayılan 0.01)
+- EDUWISE_PROFILE_QUERY=1: ?profile=<kip> sorgu parametresine izin verir; bu
+  çalıştırma orana bakılmadan profillenir
+"""
+import contextvars
+import cProfile
+import functools
+import inspect
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+from logger import get_logger, new_request_id
+
+logger = get_logger(__name__)
+
+MODES = ("cprofile", "sampling", "both")
+DEFAULT_DIR = "profiles"
+DEFAULT_INTERVAL = 0.01
+
+# Aynı anda tek cProfile çalıştırılır (3.12+ sys.monitoring tek profiler kabul eder);
+# o sırada profillenen diğer sayfalar yalnızca örnekleyiciyi kullanır
+_cprofile_lock = threading.Lock()
+# None: karar verilmedi; _SKIPPED: bu çalıştırma profillenmiyor; _ProfileRun: profilleniyor
+_current_run = contextvars.ContextVar("eduwise_profile_run", default=None)
+_SKIPPED = object()
+
+
+def _normalize_mode(value):
+    if not value:
+        return None
+    value = str(value).strip().lower()
+    if value in ("1", "true", "on"):
+        return "cprofile"
+    if value in MODES:
+        return value
+    if value not in ("0", "false", "off"):
+        logger.warning("Bilinmeyen profil kipi: %s", value)
+    return None
+
+
+def requested_mode(query_value=None):
+    """
+    Bu çalıştırmada kullanılacak kip; profil çıkarılmayacaksa None.
+    """
+    if query_value and os.getenv("EDUWISE_PROFILE_QUERY") == "1":
+        mode = _normalize_mode(query_value)
+        if mode:
+            return mode
+    mode = _normalize_mode(os.getenv("EDUWISE_PROFILE"))
+    if mode is None:
+        return None
+    rate = float(os.getenv("EDUWISE_PROFILE_RATE", 1))
+    return mode if rate >= 1 or random.random() < rate else None
+
+
+def _frame_label(code) -> str:
+    path = code.co_filename
+    try:
+        relative = os.path.relpath(path)
+        if not relative.startswith(".."):
+            path = relative
+    except ValueError:
+        pass
+    return f"{code.co_name} ({path}:{code.co_firstlineno})"
+
+
+class _ProfileRun:
+    """
+    Profillenen bir çalıştırmaya o an katılan iş parçacıkları (kimlik -> [ad, derinlik]).
+    """
+
+    def __init__(self):
+        self._threads = {}
+        self._lock = threading.Lock()
+
+    def add_current_thread(self):
+        ident = threading.get_ident()
+        with self._lock:
+            entry = self._threads.setdefault(ident, [threading.current_thread().name, 0])
+            entry[1] += 1
+
+    def remove_current_thread(self):
+        ident = threading.get_ident()
+        with self._lock:
+            entry = self._threads.get(ident)
+            if entry is not None:
+                entry[1] -= 1
+                if entry[1] <= 0:
+                    del self._threads[ident]
+
+    def threads(self) -> dict:
+        with self._lock:
+            return {ident: entry[0] for ident, entry in self._threads.items()}
+
+
+@contextmanager
+def run_thread():
+    """
+    Bağlamdaki profil çalıştırması etkinse bu iş parçacığını blok boyunca örneklemeye katar.
+    """
+    run = _current_run.get()
+    if not isinstance(run, _ProfileRun):
+        yield
+        return
+    run.add_current_thread()
+    try:
+        yield
+    finally:
+        run.remove_current_thread()
+
+
+def call_in_run(fn, *args, **kwargs):
+    """
+    Havuza gönderilen işler için: fn'i çalıştırmaya katılmış olarak çağırır.
+    """
+    with run_thread():
+        return fn(*args, **kwargs)
+
+
+def _thread_label(name: str) -> str:
+    # "ThreadPoolExecutor-0_1", "gemini-flight-d59957f6" gibi adlar tek kökte toplanır
+    return re.sub(r"-[0-9a-f_]+$", "", name)
+
+
+class StackSampler:
+    """
+    Çalıştırmaya katılan iş parçacıklarının yığınlarını arka planda örnekler ve
+    katlanmış yığınları (iş parçacığı;kök;...;yaprak sayı) sayar.
+    """
+
+    def __init__(self, run: _ProfileRun, interval: float = DEFAULT_INTERVAL):
+        self.run = run
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for ident, name in self.run.threads().items():
+                frame = frames.get(ident)
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                if labels:
+                    labels.append(_thread_label(name))
+                    self.stacks[";".join(reversed(labels))] += 1
+
+    def write(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _output_base(label: str) -> str:
+    directory = os.getenv("EDUWISE_PROFILE_DIR", DEFAULT_DIR)
+    os.makedirs(directory, exist_ok=True)
+    slug = re.sub(r"\W+", "_", label).strip("_") or "profil"
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return os.path.join(directory, f"{stamp}_{slug}_{new_request_id()[:8]}")
+
+
+@contextmanager
+def profile_block(label: str, mode=None):
+    """
+    Bloğu verilen kipte profiller ve çıktıları EDUWISE_PROFILE_DIR'e yazar.
+    mode None ise ortam değişkenleri ve oran kullanılır. Karar en dıştaki blokta
+    verilir; içteki bloklar (ör. sayfadan ya da havuz iş parçacığından çağrılan
+    logic fonksiyonları) yalnızca çalıştırmaya katılır. Çıkışta önceki durum geri
+    yüklenir; st.stop() ile biten çalıştırmalar da yazılır.
+    """
+    previous = _current_run.get()
+    if previous is not None:
+        with run_thread():
+            yield
+        return
+
+    mode = mode or requested_mode()
+    run = _ProfileRun() if mode else _SKIPPED
+    _current_run.set(run)
+    try:
+        if run is _SKIPPED:
+            yield
+        else:
+            with _profiling(label, mode, run), run_thread():
+                yield
+    finally:
+        _current_run.set(previous)
+
+
+@contextmanager
+def _profiling(label: str, mode: str, run: _ProfileRun):
+    profiler = None
+    if mode in ("cprofile", "both"):
+        if _cprofile_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+        else:
+            logger.debug("cProfile başka bir çalıştırmada kullanımda, yalnızca örnekleme yapılacak: %s", label)
+            mode = "sampling"
+    sampler = None
+    if mode in ("sampling", "both"):
+        interval = float(os.getenv("EDUWISE_PROFILE_INTERVAL", DEFAULT_INTERVAL))
+        sampler = StackSampler(run, interval).start()
+
+    started = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            _cprofile_lock.release()
+        if sampler is not None:
+            sampler.stop()
+        elapsed = time.perf_counter() - started
+        try:
+            base = _output_base(label)
+            written = []
+            if profiler is not None:
+                profiler.dump_stats(f"{base}.prof")
+                written.append(f"{base}.prof")
+            if sampler is not None:
+                sampler.write(f"{base}.folded")
+                written.append(f"{base}.folded")
+            logger.info("Profil yazıldı - %s, %.3f sn: %s", label, elapsed, ", ".join(written),
+                        extra={"duration": elapsed})
+        except Exception as e:
+            logger.error("Profil yazılamadı (%s): %s", label, e, exc_info=True)
+
+
+def profiled(fn):
+    """
+    Fonksiyonu profile_block ile sarar; üreteç fonksiyonlarda profil tüketimin
+    sonuna kadar sürer. Bir sayfanın içinden çağrıldığında kararı sayfa verir.
+    """
+    label = f"{fn.__module__}.{fn.__qualname__}"
+
+    if inspect.isgeneratorfunction(fn):
+        @functools.wraps(fn)
+        def generator_wrapper(*args, **kwargs):
+            with profile_block(label):
+                yield from fn(*args, **kwargs)
+        return generator_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with profile_block(label):
+            return fn(*args, **kwargs)
+    return wrapper